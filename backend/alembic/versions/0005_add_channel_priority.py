@@ -0,0 +1,23 @@
+"""Add channel priority for FPS budget scheduling
+
+Revision ID: 0005_add_channel_priority
+Revises: 0004_add_events_and_notifications
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_add_channel_priority"
+down_revision = "0004_add_events_and_notifications"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("channels", sa.Column("priority", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    op.drop_column("channels", "priority")
@@ -0,0 +1,23 @@
+"""Add channel decode mode for reduced decoding on low-FPS channels
+
+Revision ID: 0006_add_channel_decode_mode
+Revises: 0005_add_channel_priority
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_add_channel_decode_mode"
+down_revision = "0005_add_channel_priority"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("channels", sa.Column("decode_mode", sa.String(length=16), nullable=False, server_default="auto"))
+
+
+def downgrade() -> None:
+    op.drop_column("channels", "decode_mode")
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, require_role
 from app.core.config import get_settings
+from app.core.plates import plate_key
 from app.core.security import create_access_token, verify_password
 from app.db.models import User, UserRole
 from app.events import alarm_relay_controller, event_manager, webhook_service
@@ -13,6 +14,7 @@ from app.monitoring import base_operational_snapshot, metrics_registry
 from app.pipeline import (
     ChannelConfig,
     ChannelDirection,
+    DecodeMode,
     DecoderPriority,
     PlateListPayload,
     PlateListType,
@@ -20,8 +22,10 @@ from app.pipeline import (
     RuleCondition,
     RuleDefinition,
     build_rules_engine,
+    detection_batcher,
     ingest_manager,
     postprocess_settings,
+    recognition_executor,
     recognition_pipeline,
 )
 
@@ -91,9 +95,31 @@ def pipeline_status(current_user: User = Depends(require_role(UserRole.viewer)))
     return {
         **recognition_pipeline.describe(),
         "postprocess": postprocess_settings.describe(),
+        "batching": detection_batcher.describe(),
     }
 
 
+class StageScaleRequest(BaseModel):
+    workers: int = Field(..., ge=1, description="Количество воркеров стадии")
+
+
+@router.get("/pipeline/stages", summary="Стадии исполнителя: очереди, время обслуживания, загрузка")
+def pipeline_stages(current_user: User = Depends(require_role(UserRole.viewer))) -> dict:
+    return recognition_executor.describe()
+
+
+@router.put("/pipeline/stages/{stage_name}", summary="Изменить число воркеров стадии")
+def scale_pipeline_stage(
+    stage_name: str,
+    payload: StageScaleRequest,
+    current_user: User = Depends(require_role(UserRole.operator, UserRole.admin)),
+) -> dict:
+    try:
+        return recognition_executor.scale(stage_name, payload.workers)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -170,6 +196,10 @@ class ChannelRequest(BaseModel):
     direction: ChannelDirection = Field(ChannelDirection.any, description="Направление движения: up/down/any")
     roi: dict | None = Field(None, description="ROI/маска кадра в виде полигона")
     description: str | None = Field(None, description="Комментарий или место установки")
+    priority: int = Field(1, ge=1, description="Вес канала при распределении FPS-бюджета узла")
+    decode_mode: DecodeMode = Field(
+        DecodeMode.auto, description="Режим декодирования: full/keyframes/nonref/auto"
+    )
 
 
 @router.post(
@@ -217,6 +247,8 @@ def register_channel(
         direction=request.direction,
         roi=request.roi,
         description=request.description,
+        priority=request.priority,
+        decode_mode=request.decode_mode,
     )
     status = ingest_manager.register_channel(channel)
     metrics_registry.set_gauge("ingest_channels", len(ingest_manager.channels))
@@ -231,6 +263,14 @@ def ingest_channels(current_user: User = Depends(require_role(UserRole.viewer)))
     return ingest_manager.snapshot()
 
 
+@router.get(
+    "/ingest/transport",
+    summary="Состояние shared-memory транспорта кадров",
+)
+def ingest_transport(current_user: User = Depends(require_role(UserRole.viewer))) -> dict:
+    return {"enabled": ingest_manager.transport is not None, "stats": ingest_manager.transport_stats()}
+
+
 @router.post(
     "/lists",
     summary="Создать список номеров",
@@ -268,6 +308,20 @@ def get_plate_lists(current_user: User = Depends(require_role(UserRole.viewer)))
     return [item.model_dump() for item in rules_engine.lists.values()]
 
 
+@router.get(
+    "/lists/match",
+    summary="Найти списки, содержащие номер (с учётом похожих символов)",
+)
+def match_plate_lists(
+    plate: str,
+    current_user: User = Depends(require_role(UserRole.viewer)),
+) -> list[dict]:
+    return [
+        {"list_id": payload.id, "name": payload.name, "type": payload.type.value, "items": items}
+        for payload, items in rules_engine.match_lists(plate)
+    ]
+
+
 @router.post("/rules", summary="Зарегистрировать правило IF→THEN")
 def create_rule(
     request: RuleRequest,
@@ -324,14 +378,20 @@ def events_status(current_user: User = Depends(require_role(UserRole.viewer))) -
 def list_events(
     channel_id: str | None = None,
     plate: str | None = None,
+    exact: bool = False,
     limit: int = 50,
     current_user: User = Depends(require_role(UserRole.viewer)),
 ) -> list[dict]:
-    query = list(reversed(event_manager.events))
+    if plate and exact:
+        query = list(reversed(event_manager.find_by_plate(plate)))
+    else:
+        query = list(reversed(event_manager.events))
     if channel_id:
         query = [event for event in query if event.channel_id == channel_id]
-    if plate:
-        query = [event for event in query if event.plate and plate.lower() in event.plate.lower()]
+    if plate and not exact:
+        # Substring search over confusion-class keys: "AI23" finds "A123BC77".
+        needle = plate_key(plate)
+        query = [event for event in query if event.plate_key and needle in event.plate_key]
     return [event.as_dict() for event in query[:limit]]
 
 
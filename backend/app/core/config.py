@@ -57,31 +57,80 @@ class Settings(BaseModel):
 
     ingest_default_target_fps: int = Field(12, alias="INGEST_DEFAULT_TARGET_FPS")
     ingest_reconnect_seconds: int = Field(3, alias="INGEST_RECONNECT_SECONDS")
+    ingest_frame_buffer_size: int = Field(4, alias="INGEST_FRAME_BUFFER_SIZE")
+    ingest_node_fps_budget: float = Field(0.0, alias="INGEST_NODE_FPS_BUDGET")
+    ingest_scheduler_policy: str = Field("fair", alias="INGEST_SCHEDULER_POLICY")
+    ingest_shm_slots: int = Field(0, alias="INGEST_SHM_SLOTS")
+    ingest_shm_slot_bytes: int = Field(1920 * 1080 * 3, alias="INGEST_SHM_SLOT_BYTES")
+    ingest_shm_lease_seconds: float = Field(5.0, alias="INGEST_SHM_LEASE_SECONDS")
+    ingest_shm_inference_workers: int = Field(0, alias="INGEST_SHM_INFERENCE_WORKERS")
+    ingest_decoder_threads: int = Field(0, alias="INGEST_DECODER_THREADS")
     ingest_decoder_priority: list[str] | str = Field(
         default_factory=lambda: ["nvdec", "vaapi", "cpu"], alias="INGEST_DECODER_PRIORITY"
     )
 
+    motion_enabled: bool = Field(True, alias="MOTION_ENABLED")
+    motion_downscale_width: int = Field(160, alias="MOTION_DOWNSCALE_WIDTH")
+    motion_pixel_threshold: float = Field(25.0, alias="MOTION_PIXEL_THRESHOLD")
+    motion_min_area: float = Field(0.01, alias="MOTION_MIN_AREA")
+    motion_learning_rate: float = Field(0.05, alias="MOTION_LEARNING_RATE")
+    motion_hold_seconds: float = Field(1.0, alias="MOTION_HOLD_SECONDS")
+
     detector_model: str = Field("yolov8", alias="DETECTOR_MODEL")
     detector_device: str = Field("cuda", alias="DETECTOR_DEVICE")
     detector_confidence_threshold: float = Field(0.25, alias="DETECTOR_CONFIDENCE_THRESHOLD")
     detector_iou_threshold: float = Field(0.45, alias="DETECTOR_IOU_THRESHOLD")
     detector_max_detections: int = Field(10, alias="DETECTOR_MAX_DETECTIONS")
     detector_require_roi: bool = Field(False, alias="DETECTOR_REQUIRE_ROI")
+    detector_model_path: str | None = Field(None, alias="DETECTOR_MODEL_PATH")
+    detector_input_size: int = Field(640, alias="DETECTOR_INPUT_SIZE")
+    detector_session_pool_size: int = Field(1, alias="DETECTOR_SESSION_POOL_SIZE")
+    detector_intra_op_threads: int = Field(0, alias="DETECTOR_INTRA_OP_THREADS")
+    detector_inter_op_threads: int = Field(1, alias="DETECTOR_INTER_OP_THREADS")
+    detector_skip_max_interval: int = Field(1, alias="DETECTOR_SKIP_MAX_INTERVAL")
+    detector_skip_max_drift: float = Field(0.3, alias="DETECTOR_SKIP_MAX_DRIFT")
+    detector_skip_min_track_confidence: float = Field(0.3, alias="DETECTOR_SKIP_MIN_TRACK_CONFIDENCE")
+    detector_frame_max_side: int = Field(0, alias="DETECTOR_FRAME_MAX_SIDE")
+    detector_batch_size: int = Field(8, alias="DETECTOR_BATCH_SIZE")
+    detector_batch_max_wait_ms: float = Field(10.0, alias="DETECTOR_BATCH_MAX_WAIT_MS")
 
     tracker_type: str = Field("bytetrack", alias="TRACKER_TYPE")
     tracker_max_age: int = Field(30, alias="TRACKER_MAX_AGE")
     tracker_min_hits: int = Field(3, alias="TRACKER_MIN_HITS")
     tracker_match_iou_threshold: float = Field(0.5, alias="TRACKER_MATCH_IOU_THRESHOLD")
+    tracker_capacity: int = Field(64, alias="TRACKER_CAPACITY")
+    tracker_direction_window: int = Field(10, alias="TRACKER_DIRECTION_WINDOW")
+    tracker_direction_min_displacement: float = Field(0.5, alias="TRACKER_DIRECTION_MIN_DISPLACEMENT")
 
     ocr_engine: str = Field("easyocr", alias="OCR_ENGINE")
     ocr_vote_frames: int = Field(3, alias="OCR_VOTE_FRAMES")
     ocr_min_confidence: float = Field(0.6, alias="OCR_MIN_CONFIDENCE")
     ocr_languages: list[str] | str = Field(default_factory=lambda: ["en", "ru"], alias="OCR_LANGUAGES")
+    ocr_min_quality_gain: float = Field(0.1, alias="OCR_MIN_QUALITY_GAIN")
+    ocr_max_calls_per_track: int = Field(10, alias="OCR_MAX_CALLS_PER_TRACK")
+    ocr_input_height: int = Field(48, alias="OCR_INPUT_HEIGHT")
+    ocr_input_width: int = Field(192, alias="OCR_INPUT_WIDTH")
+    ocr_batch_size: int = Field(32, alias="OCR_BATCH_SIZE")
+    ocr_batch_max_wait_ms: float = Field(15.0, alias="OCR_BATCH_MAX_WAIT_MS")
+    ocr_crop_top_k: int = Field(3, alias="OCR_CROP_TOP_K")
+    ocr_crop_max_track_bytes: int = Field(512 * 1024, alias="OCR_CROP_MAX_TRACK_BYTES")
+    ocr_crop_max_total_bytes: int = Field(64 * 1024 * 1024, alias="OCR_CROP_MAX_TOTAL_BYTES")
+    ocr_result_timeout_seconds: float = Field(5.0, alias="OCR_RESULT_TIMEOUT_SECONDS")
+    warmup_iterations: int = Field(2, alias="MODEL_WARMUP_ITERATIONS")
+    warmup_frame_width: int = Field(1280, alias="MODEL_WARMUP_FRAME_WIDTH")
+    warmup_frame_height: int = Field(720, alias="MODEL_WARMUP_FRAME_HEIGHT")
+    pipeline_executor_enabled: bool = Field(True, alias="PIPELINE_EXECUTOR_ENABLED")
+    pipeline_stage_workers: dict[str, int] | str = Field(default_factory=dict, alias="PIPELINE_STAGE_WORKERS")
+    pipeline_stage_queue_size: int = Field(64, alias="PIPELINE_STAGE_QUEUE_SIZE")
+    frame_arena_max_bytes: int = Field(256 * 1024 * 1024, alias="FRAME_ARENA_MAX_BYTES")
+    frame_arena_leak_seconds: float = Field(30.0, alias="FRAME_ARENA_LEAK_SECONDS")
 
     postprocess_vote_by_char: bool = Field(True, alias="POSTPROCESS_VOTE_BY_CHAR")
+    postprocess_vote_align: bool = Field(True, alias="POSTPROCESS_VOTE_ALIGN")
     postprocess_min_confidence: float = Field(0.55, alias="POSTPROCESS_MIN_CONFIDENCE")
     postprocess_min_frames_for_event: int = Field(3, alias="POSTPROCESS_MIN_FRAMES_FOR_EVENT")
     postprocess_anti_duplicate_seconds: int = Field(5, alias="POSTPROCESS_ANTI_DUPLICATE_SECONDS")
+    postprocess_anti_duplicate_max_entries: int = Field(100_000, alias="POSTPROCESS_ANTI_DUPLICATE_MAX_ENTRIES")
     postprocess_country_templates: list[str] | str = Field(
         default_factory=lambda: ["ru", "by", "kz", "ua", "eu"], alias="POSTPROCESS_COUNTRY_TEMPLATES"
     )
@@ -114,6 +163,7 @@ class Settings(BaseModel):
 
     @field_validator(
         "log_format",
+        "ingest_scheduler_policy",
         "detector_model",
         "detector_device",
         "tracker_type",
@@ -131,6 +181,14 @@ class Settings(BaseModel):
             return [item.strip() for item in value.split(",") if item.strip()]
         return value
 
+    @field_validator("pipeline_stage_workers", mode="before")
+    @classmethod
+    def parse_stage_workers(cls, value: str | dict[str, int]) -> dict[str, int]:
+        if isinstance(value, str):
+            pairs = [item.split("=", 1) for item in value.split(",") if "=" in item]
+            return {name.strip(): int(count) for name, count in pairs}
+        return value
+
     @field_validator("postprocess_country_templates", mode="before")
     @classmethod
     def parse_country_templates(cls, value: str | list[str]) -> list[str]:
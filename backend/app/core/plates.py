@@ -0,0 +1,76 @@
+"""Plate text tables shared by postprocessing, plate lists and event search.
+
+Every table is a ``str.translate`` map, so each pass over a plate is a single
+C loop instead of a per-character dict lookup in Python:
+
+- ``BASE_TABLE`` drops separators and folds Cyrillic letters that look like
+  Latin ones to Latin (``У`` is kept: the country templates use it).
+- ``LOOKALIKE_DIGITS`` lists the look-alike pairs (``0/O``, ``1/I``, ``8/B``,
+  ``2/Z``); the postprocessor resolves them per position, to a letter or a
+  digit as the matched country template expects.
+- ``KEY_TABLE`` collapses every look-alike group to one representative, so
+  :func:`plate_key` is the same for all confusable spellings of a plate and can
+  be used as a hash key for plate lists, anti-duplicate and history lookups.
+
+ASCII reads (the usual OCR output) take a ``bytes.translate`` fast path with
+256-byte tables; ``str.translate`` with a dict looks every character up
+through the mapping protocol and is several times slower.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+# Letter -> digit it is confused with.
+LOOKALIKE_DIGITS: Dict[str, str] = {"O": "0", "I": "1", "B": "8", "Z": "2"}
+
+CYRILLIC_TO_LATIN: Dict[str, str] = {
+    "А": "A",
+    "В": "B",
+    "Е": "E",
+    "К": "K",
+    "М": "M",
+    "Н": "H",
+    "О": "O",
+    "Р": "P",
+    "С": "C",
+    "Т": "T",
+    "Х": "X",
+}
+
+SEPARATORS = " -._\t"
+
+BASE_TABLE = str.maketrans({**CYRILLIC_TO_LATIN, **{ch: None for ch in SEPARATORS}})
+KEY_TABLE = str.maketrans(
+    {
+        **{ch: None for ch in SEPARATORS},
+        **{cyrillic: LOOKALIKE_DIGITS.get(latin, latin) for cyrillic, latin in CYRILLIC_TO_LATIN.items()},
+        **LOOKALIKE_DIGITS,
+        "У": "Y",
+    }
+)
+
+_SEPARATOR_BYTES = SEPARATORS.encode("ascii")
+_ASCII_KEY = bytes.maketrans(
+    "".join(LOOKALIKE_DIGITS).encode("ascii"), "".join(LOOKALIKE_DIGITS.values()).encode("ascii")
+)
+
+
+def base_plate(text: str) -> str:
+    """Upper-case ``text``, strip separators and fold Cyrillic look-alikes to Latin."""
+
+    text = text.upper()
+    if text.isascii():
+        return text.encode("ascii").translate(None, _SEPARATOR_BYTES).decode("ascii")
+    return text.translate(BASE_TABLE)
+
+
+def plate_key(text: Optional[str]) -> str:
+    """Confusion-class key: equal for ``A123BC77``, ``a 1z3 bc-77`` and ``А123ВС77``."""
+
+    if not text:
+        return ""
+    text = text.upper()
+    if text.isascii():
+        return text.encode("ascii").translate(_ASCII_KEY, _SEPARATOR_BYTES).decode("ascii")
+    return text.translate(KEY_TABLE)
@@ -42,8 +42,10 @@ class Channel(Base):
     protocol = Column(String(16), nullable=False, default="rtsp")
     is_active = Column(Boolean, nullable=False, default=True)
     target_fps = Column(Integer, nullable=False, default=12)
+    priority = Column(Integer, nullable=False, default=1)
     reconnect_seconds = Column(Integer, nullable=False, default=3)
     decoder_priority = Column(String(64), nullable=False, default="nvdec,vaapi,cpu")
+    decode_mode = Column(String(16), nullable=False, default="auto")
     direction = Column(Enum(ChannelDirection, name="channel_direction"), nullable=False, default=ChannelDirection.any)
     roi = Column(JSON, nullable=True)
     description = Column(String(255), nullable=True)
@@ -10,6 +10,7 @@ from dataclasses import asdict, dataclass, field
 from typing import Any
 
 from app.core.config import get_settings
+from app.core.plates import plate_key
 
 
 @dataclass
@@ -37,6 +38,7 @@ class RecognitionEvent:
     image_url: str | None
     meta: dict[str, Any]
     created_at: float
+    plate_key: str | None = None
 
     def as_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -46,6 +48,8 @@ class RecognitionEvent:
 class EventManager:
     storage: EventStorageConfig
     events: list[RecognitionEvent] = field(default_factory=list)
+    # Confusion-class key -> events, so history lookups do not try spelling variants.
+    plate_index: dict[str, list[RecognitionEvent]] = field(default_factory=dict)
 
     def record_event(
         self,
@@ -72,10 +76,18 @@ class EventManager:
             image_url=image_url,
             meta=meta or {},
             created_at=time.time(),
+            plate_key=plate_key(plate) or None,
         )
         self.events.append(event)
+        if event.plate_key:
+            self.plate_index.setdefault(event.plate_key, []).append(event)
         return event
 
+    def find_by_plate(self, plate: str) -> list[RecognitionEvent]:
+        """Events whose plate equals ``plate`` up to look-alike characters, oldest first."""
+
+        return list(self.plate_index.get(plate_key(plate), ()))
+
     def describe(self) -> dict[str, Any]:
         return {
             "storage": self.storage.as_dict(),
@@ -1,7 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 
 from app.core.config import get_settings
 from app.core.logging import configure_logging
+from app.pipeline import detection_batcher, ingest_feeder, ingest_manager, model_loader, recognition_pipeline
 
 from .api import router as api_router
 
@@ -19,9 +20,31 @@ app = FastAPI(title="Number Recognition Service", version="0.1.0")
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.on_event("startup")
+def start_ingest() -> None:
+    # Models load and warm up in the background; /ready reports 503 until they are done.
+    model_loader.start()
+    ingest_manager.start()
+    if settings.pipeline_executor_enabled:
+        ingest_feeder.start()
+
+
+@app.on_event("shutdown")
+def stop_ingest() -> None:
+    ingest_feeder.stop()
+    ingest_manager.stop()
+    detection_batcher.stop()
+    recognition_pipeline.ocr_batcher.stop()
+
+
 @app.get("/ready")
-def ready() -> dict[str, str]:
-    return {"status": "ready"}
+def ready(response: Response) -> dict:
+    if model_loader.ready:
+        state = "ready"
+    else:
+        state = "failed" if model_loader.failed else "loading"
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": state, "models": model_loader.describe()}
 
 
 @app.get("/live")
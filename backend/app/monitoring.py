@@ -1,3 +1,4 @@
+import threading
 from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any
@@ -11,13 +12,28 @@ class HistogramBucket:
     total: float = 0.0
 
 
+_Key = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class MetricsDelta:
+    """Counter and histogram increments plus current gauges, moved between registries of different processes."""
+
+    counters: dict[_Key, float]
+    gauges: dict[_Key, float]
+    histograms: dict[_Key, HistogramBucket]
+
+
 class MetricsRegistry:
+    """Counters, gauges and histograms shared by every pipeline thread; updates are serialized by a lock."""
+
     def __init__(self, namespace: str, enabled: bool = True):
         self.namespace = namespace
         self.enabled = enabled
         self.counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = defaultdict(float)
         self.gauges: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
         self.histograms: dict[tuple[str, tuple[tuple[str, str], ...]], HistogramBucket] = defaultdict(HistogramBucket)
+        self._lock = threading.Lock()
 
     @staticmethod
     def _label_key(labels: dict[str, str] | None) -> tuple[tuple[str, str], ...]:
@@ -27,33 +43,69 @@ class MetricsRegistry:
         if not self.enabled:
             return
         key = (name, self._label_key(labels))
-        self.counters[key] += value
+        with self._lock:
+            self.counters[key] += value
 
     def set_gauge(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
         if not self.enabled:
             return
         key = (name, self._label_key(labels))
-        self.gauges[key] = value
+        with self._lock:
+            self.gauges[key] = value
 
     def observe(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
         if not self.enabled:
             return
         key = (name, self._label_key(labels))
-        bucket = self.histograms[key]
-        bucket.count += 1
-        bucket.total += value
+        with self._lock:
+            bucket = self.histograms[key]
+            bucket.count += 1
+            bucket.total += value
+
+    def _snapshot(self) -> tuple[dict, dict, dict]:
+        # Copies taken under the lock, so readers never iterate a dict another thread is growing.
+        with self._lock:
+            histograms = {key: HistogramBucket(bucket.count, bucket.total) for key, bucket in self.histograms.items()}
+            return dict(self.counters), dict(self.gauges), histograms
+
+    def take_delta(self) -> MetricsDelta | None:
+        """Everything recorded since the last call (``None`` if nothing was); this registry starts over."""
+
+        with self._lock:
+            if not (self.counters or self.gauges or self.histograms):
+                return None
+            delta = MetricsDelta(dict(self.counters), dict(self.gauges), dict(self.histograms))
+            self.counters = defaultdict(float)
+            self.gauges = {}
+            self.histograms = defaultdict(HistogramBucket)
+        return delta
+
+    def merge(self, delta: MetricsDelta) -> None:
+        """Add a :meth:`take_delta` result from another process's registry."""
+
+        if not self.enabled:
+            return
+        with self._lock:
+            for key, value in delta.counters.items():
+                self.counters[key] += value
+            self.gauges.update(delta.gauges)
+            for key, bucket in delta.histograms.items():
+                target = self.histograms[key]
+                target.count += bucket.count
+                target.total += bucket.total
 
     def describe(self) -> dict[str, Any]:
         if not self.enabled:
             return {"enabled": False}
+        counters, gauges, histograms = self._snapshot()
         return {
             "enabled": True,
             "namespace": self.namespace,
-            "counters": {f"{k[0]}:{k[1]}": v for k, v in self.counters.items()},
-            "gauges": {f"{k[0]}:{k[1]}": v for k, v in self.gauges.items()},
+            "counters": {f"{k[0]}:{k[1]}": v for k, v in counters.items()},
+            "gauges": {f"{k[0]}:{k[1]}": v for k, v in gauges.items()},
             "histograms": {
                 f"{k[0]}:{k[1]}": {"count": bucket.count, "avg": bucket.total / bucket.count if bucket.count else 0.0}
-                for k, bucket in self.histograms.items()
+                for k, bucket in histograms.items()
             },
         }
 
@@ -61,13 +113,14 @@ class MetricsRegistry:
         if not self.enabled:
             return "# metrics disabled\n"
         lines: list[str] = []
-        for (name, labels), value in self.counters.items():
+        counters, gauges, histograms = self._snapshot()
+        for (name, labels), value in counters.items():
             label_str = self._format_labels(labels)
             lines.append(f"{self.namespace}_{name}_total{label_str} {value}")
-        for (name, labels), value in self.gauges.items():
+        for (name, labels), value in gauges.items():
             label_str = self._format_labels(labels)
             lines.append(f"{self.namespace}_{name}{label_str} {value}")
-        for (name, labels), bucket in self.histograms.items():
+        for (name, labels), bucket in histograms.items():
             label_str = self._format_labels(labels)
             lines.append(f"{self.namespace}_{name}_count{label_str} {bucket.count}")
             avg = bucket.total / bucket.count if bucket.count else 0.0
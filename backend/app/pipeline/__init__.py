@@ -1,5 +1,17 @@
 """Pipeline components for the number recognition service."""
 
+from .arena import ArenaBuffer, FrameArena, frame_arena
+from .capture import CapturedFrame, CaptureWorker, DecodeMode, DecodeStats, FrameRingBuffer
+from .detector_skip import DetectionSkipper
+from .canonical import PlateCanonicalizer
+from .country_matcher import CountryMatcher
+from .crop_store import TrackCropStore
+from .dedup import DuplicateIndex
+from .motion import MotionTrigger
+from .multires import DetectionView, FrameDownscaler
+from .roi import CompiledRoi, RoiRegistry, roi_registry
+from .scheduler import FpsScheduler, SchedulerPolicy
+from .shm import InferenceEntryPoints, SharedFrameBridge, SharedFramePool, SlotHandle, StaleSlotError, WorkerMessage
 from .ingest_manager import ChannelConfig, ChannelDirection, DecoderPriority, IngestManager, IngestStatus, ingest_manager
 from .postprocess import (
     CountryTemplate,
@@ -11,19 +23,31 @@ from .postprocess import (
 )
 from .recognition import (
     Detection,
+    DetectionArray,
+    Detector,
     DetectorModel,
     DetectorSettings,
     Device,
+    FrameInput,
     FrameRecognition,
+    OcrBackend,
     OcrCandidate,
     OcrEngine,
     OcrSettings,
     RecognitionPipeline,
     Track,
+    TrackArray,
     TrackerSettings,
     TrackerType,
     recognition_pipeline,
 )
+from .batching import MicroBatcher, detection_batcher
+from .executor import QueuePolicy, StageMode, StageSpec, StagedExecutor, ingest_feeder, recognition_executor
+from .model_loader import ModelLoader, ModelState, model_loader
+from .inference_worker import recognize_shared_frame
+from .ocr_batching import OcrBatcher
+from .ocr_scheduler import OcrScheduler
+from .tracker import Tracker
 from app.rules import (
     PlateListPayload,
     PlateListType,
@@ -41,6 +65,33 @@ __all__ = [
     "ChannelDirection",
     "DecoderPriority",
     "ingest_manager",
+    "CapturedFrame",
+    "CaptureWorker",
+    "DecodeMode",
+    "DecodeStats",
+    "FrameRingBuffer",
+    "FpsScheduler",
+    "SchedulerPolicy",
+    "MotionTrigger",
+    "CompiledRoi",
+    "RoiRegistry",
+    "DetectionSkipper",
+    "TrackCropStore",
+    "CountryMatcher",
+    "PlateCanonicalizer",
+    "DuplicateIndex",
+    "ArenaBuffer",
+    "FrameArena",
+    "frame_arena",
+    "DetectionView",
+    "FrameDownscaler",
+    "roi_registry",
+    "InferenceEntryPoints",
+    "SharedFrameBridge",
+    "SharedFramePool",
+    "SlotHandle",
+    "StaleSlotError",
+    "WorkerMessage",
     "CountryTemplate",
     "PostprocessSettings",
     "PostprocessResult",
@@ -48,18 +99,38 @@ __all__ = [
     "postprocess_settings",
     "postprocessor",
     "Detection",
+    "DetectionArray",
+    "Detector",
     "DetectorModel",
     "DetectorSettings",
     "Device",
+    "FrameInput",
     "FrameRecognition",
+    "OcrBackend",
     "OcrCandidate",
     "OcrEngine",
     "OcrSettings",
     "RecognitionPipeline",
     "Track",
+    "TrackArray",
     "TrackerSettings",
     "TrackerType",
     "recognition_pipeline",
+    "Tracker",
+    "OcrScheduler",
+    "OcrBatcher",
+    "ModelLoader",
+    "ModelState",
+    "model_loader",
+    "recognize_shared_frame",
+    "QueuePolicy",
+    "StageMode",
+    "StageSpec",
+    "StagedExecutor",
+    "ingest_feeder",
+    "recognition_executor",
+    "MicroBatcher",
+    "detection_batcher",
     "PlateListPayload",
     "PlateListType",
     "RuleAction",
@@ -0,0 +1,200 @@
+"""Pooled frame buffers shared across pipeline stages.
+
+Resized frames, letterbox canvases and OCR batch tensors have a handful of
+distinct shapes per deployment, yet were allocated anew for every frame. The
+:class:`FrameArena` keeps released buffers in free lists keyed by
+``(shape, dtype)`` and hands them out again. Ownership is explicit: a stage
+``acquire``s a buffer, ``retain``s it when handing it to another stage, and
+every holder ``release``s it; the buffer returns to the pool when its reference
+count drops to zero. Buffers held longer than ``leak_seconds`` are reported as
+leaks, and free buffers beyond ``max_bytes`` are dropped oldest first.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.monitoring import MetricsRegistry, metrics_registry
+
+ArenaKey = Tuple[Tuple[int, ...], str]
+
+
+class ArenaBuffer:
+    """Reference-counted handle of a pooled array."""
+
+    __slots__ = ("array", "key", "refcount", "owner", "acquired_at", "serial", "reported", "_arena")
+
+    def __init__(self, arena: "FrameArena", array: np.ndarray, key: ArenaKey, serial: int) -> None:
+        self._arena = arena
+        self.array = array
+        self.key = key
+        self.serial = serial
+        self.refcount = 0
+        self.owner = ""
+        self.acquired_at = 0.0
+        self.reported = False
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+    def retain(self) -> "ArenaBuffer":
+        """Add a holder, e.g. before passing the buffer to another stage."""
+
+        self._arena._retain(self)
+        return self
+
+    def release(self) -> None:
+        self._arena.release(self)
+
+
+class FrameArena:
+    """Free lists of NumPy buffers keyed by shape and dtype, with leak accounting."""
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        leak_seconds: float = 30.0,
+        leak_check_interval: int = 256,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.leak_seconds = leak_seconds
+        self.leak_check_interval = max(1, leak_check_interval)
+        self.metrics = metrics
+        self._free: "OrderedDict[ArenaKey, Deque[ArenaBuffer]]" = OrderedDict()
+        self._outstanding: Dict[int, ArenaBuffer] = {}
+        self._serial = itertools.count(1)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.resident_bytes = 0
+        self.free_bytes = 0
+        self.trimmed = 0
+        self.leaked = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def acquire(self, shape: Tuple[int, ...], dtype: np.dtype | type = np.uint8, *, owner: str = "") -> ArenaBuffer:
+        """Return a buffer of ``shape``/``dtype`` with one holder; contents are undefined."""
+
+        key: ArenaKey = (tuple(int(dim) for dim in shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                buffer = free.pop()
+                self._free.move_to_end(key)
+                self.free_bytes -= buffer.nbytes
+                self.hits += 1
+            else:
+                buffer = ArenaBuffer(self, np.empty(key[0], dtype=key[1]), key, next(self._serial))
+                self.resident_bytes += buffer.nbytes
+                self.misses += 1
+            buffer.refcount = 1
+            buffer.owner = owner
+            buffer.acquired_at = time.monotonic()
+            buffer.reported = False
+            self._outstanding[buffer.serial] = buffer
+            check = (self.hits + self.misses) % self.leak_check_interval == 0
+        if check:
+            self.check_leaks()
+        self._report()
+        return buffer
+
+    def _retain(self, buffer: ArenaBuffer) -> None:
+        with self._lock:
+            if buffer.refcount <= 0:
+                raise ValueError(f"Arena buffer {buffer.serial} retained after release")
+            buffer.refcount += 1
+
+    def release(self, buffer: ArenaBuffer) -> None:
+        with self._lock:
+            if buffer.refcount <= 0:
+                raise ValueError(f"Arena buffer {buffer.serial} released more times than acquired")
+            buffer.refcount -= 1
+            if buffer.refcount:
+                return
+            self._outstanding.pop(buffer.serial, None)
+            self._free.setdefault(buffer.key, deque()).append(buffer)
+            self._free.move_to_end(buffer.key)
+            self.free_bytes += buffer.nbytes
+            self._trim()
+        self._report()
+
+    def _trim(self) -> None:
+        # Drop free buffers of the least recently used shapes until the pool fits ``max_bytes``.
+        while self.resident_bytes > self.max_bytes and self._free:
+            key, free = next(iter(self._free.items()))
+            if not free:
+                del self._free[key]
+                continue
+            buffer = free.popleft()
+            self.free_bytes -= buffer.nbytes
+            self.resident_bytes -= buffer.nbytes
+            self.trimmed += 1
+
+    def check_leaks(self) -> List[dict]:
+        """Buffers still held ``leak_seconds`` after acquisition; counted once each."""
+
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                buffer
+                for buffer in self._outstanding.values()
+                if now - buffer.acquired_at > self.leak_seconds and not buffer.reported
+            ]
+            leaks = [
+                {"serial": buffer.serial, "owner": buffer.owner, "refcount": buffer.refcount,
+                 "shape": list(buffer.key[0]), "age_s": round(now - buffer.acquired_at, 1)}
+                for buffer in stale
+            ]
+            for buffer in stale:
+                # A leaked buffer keeps its memory but is reported only once.
+                buffer.reported = True
+            self.leaked += len(stale)
+        if stale and self.metrics:
+            self.metrics.inc("arena_leaks", float(len(stale)))
+        return leaks
+
+    def _report(self) -> None:
+        if self.metrics:
+            self.metrics.set_gauge("arena_hit_rate", self.hit_rate)
+            self.metrics.set_gauge("arena_resident_bytes", float(self.resident_bytes))
+
+    def describe(self) -> dict:
+        with self._lock:
+            owners: Dict[str, int] = {}
+            for buffer in self._outstanding.values():
+                owners[buffer.owner] = owners.get(buffer.owner, 0) + 1
+            return {
+                "max_bytes": self.max_bytes,
+                "resident_bytes": self.resident_bytes,
+                "free_bytes": self.free_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hit_rate, 4),
+                "trimmed": self.trimmed,
+                "leaked": self.leaked,
+                "outstanding": owners,
+                "shapes": len(self._free),
+            }
+
+
+_settings = get_settings()
+
+frame_arena = FrameArena(
+    max_bytes=_settings.frame_arena_max_bytes,
+    leak_seconds=_settings.frame_arena_leak_seconds,
+    metrics=metrics_registry,
+)
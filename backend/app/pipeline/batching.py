@@ -0,0 +1,162 @@
+"""Cross-channel micro-batching in front of the detector.
+
+Frames submitted from any channel are collected into a single detector batch,
+bounded by ``max_batch_size`` and a ``max_wait_ms`` deadline counted from the
+oldest queued frame. Only the detector step runs here; the per-frame
+:class:`StagedFrame` results are scattered back to futures and tracked, cropped
+and recognized by the following executor stages.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional
+
+from app.core.config import get_settings
+from app.monitoring import MetricsRegistry, metrics_registry
+from app.pipeline.recognition import FrameInput, RecognitionPipeline, StagedFrame, recognition_pipeline
+
+
+@dataclass
+class _PendingFrame:
+    frame: FrameInput
+    future: Future
+    enqueued_at: float
+
+
+class MicroBatcher:
+    """Collects frames from many channels into bounded detector batches."""
+
+    def __init__(
+        self,
+        pipeline: RecognitionPipeline,
+        *,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.pipeline = pipeline
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.metrics = metrics
+        self._pending: Deque[_PendingFrame] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.batch_sizes: Counter = Counter()
+        self.batches = 0
+        self.frames = 0
+        self.queue_delay_total = 0.0
+        self.queue_delay_max = 0.0
+
+    def submit(
+        self,
+        frame_id: str,
+        image: Any,
+        *,
+        channel_id: Optional[str] = None,
+        roi_applied: bool = False,
+    ) -> "Future[StagedFrame]":
+        future: Future = Future()
+        pending = _PendingFrame(
+            frame=FrameInput(frame_id=frame_id, image=image, channel_id=channel_id, roi_applied=roi_applied),
+            future=future,
+            enqueued_at=time.monotonic(),
+        )
+        with self._cond:
+            if self._thread is None:
+                self._start()
+            self._pending.append(pending)
+            self._cond.notify()
+        return future
+
+    def _start(self) -> None:
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="detector-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        # Items queued after the last batch would otherwise leave their callers waiting forever.
+        with self._cond:
+            pending, self._pending = list(self._pending), deque()
+        for item in pending:
+            item.future.set_exception(RuntimeError("batcher stopped"))
+
+    def _collect(self) -> List[_PendingFrame]:
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return []
+            deadline = self._pending[0].enqueued_at + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopped:
+                    break
+                self._cond.wait(remaining)
+            size = min(len(self._pending), self.max_batch_size)
+            return [self._pending.popleft() for _ in range(size)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            started = time.monotonic()
+            self._record(batch, started)
+            try:
+                results = self.pipeline.detect_batch([item.frame for item in batch])
+            except Exception as exc:  # noqa: BLE001 - failures are delivered to every waiting caller
+                for item in batch:
+                    item.future.set_exception(exc)
+                continue
+            for item, result in zip(batch, results):
+                item.future.set_result(result)
+
+    def _record(self, batch: List[_PendingFrame], started: float) -> None:
+        size = len(batch)
+        self.batches += 1
+        self.frames += size
+        self.batch_sizes[size] += 1
+        for item in batch:
+            delay = started - item.enqueued_at
+            self.queue_delay_total += delay
+            self.queue_delay_max = max(self.queue_delay_max, delay)
+            if self.metrics:
+                self.metrics.observe("detector_batch_queue_ms", delay * 1000)
+        if self.metrics:
+            self.metrics.observe("detector_batch_size", size)
+
+    def describe(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "frames": self.frames,
+            "avg_batch_size": round(self.frames / self.batches, 2) if self.batches else 0.0,
+            "batch_size_distribution": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            "avg_queue_delay_ms": round(self.queue_delay_total / self.frames * 1000, 3) if self.frames else 0.0,
+            "max_queue_delay_ms": round(self.queue_delay_max * 1000, 3),
+            "pending": len(self._pending),
+        }
+
+
+_settings = get_settings()
+
+# The batching thread is started lazily on the first submitted frame.
+detection_batcher = MicroBatcher(
+    recognition_pipeline,
+    max_batch_size=_settings.detector_batch_size,
+    max_wait_ms=_settings.detector_batch_max_wait_ms,
+    metrics=metrics_registry,
+)
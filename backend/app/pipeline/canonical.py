@@ -0,0 +1,155 @@
+"""Position-aware plate canonicalization.
+
+OCR confuses ``0/O``, ``1/I``, ``8/B`` and ``2/Z``; swapping them blindly in
+both directions (the old ``normalize``) turns ``A123BC77`` into ``AI23BC77``.
+:class:`PlateCanonicalizer` instead lets the country template decide: a read
+is reduced to a confusion signature where look-alike characters are
+``AMBIGUOUS``, and for every signature it keeps the templates that accept it
+together with a plan for its ambiguous positions (a letter where the template
+expects a letter, a digit where it expects a digit, unchanged where it allows
+both). Templates sharing a plan share the coerced plate, so they are grouped
+and each group is matched with one compiled alternation (as
+:class:`~app.pipeline.country_matcher.CountryMatcher` does); the plan is
+applied once per group, not once per template. Templates that pin look-alike
+positions go first: among those whose regex matches the coerced plate, the one
+needing the fewest changes wins, then template priority, so ``HE0000TT`` stays a ``ua`` plate even though ``kz``
+(``HEO000TT``) ranks higher. Templates that allow both at every look-alike
+position (``eu``) only take the read as spelled when no pinning template
+matches; a read no template accepts keeps its base spelling. Signatures and
+the base spelling come from translate tables (:mod:`app.core.plates`).
+
+Lookups that must not depend on the spelling use :func:`app.core.plates.plate_key`.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.core.plates import LOOKALIKE_DIGITS, base_plate
+from app.pipeline.country_matcher import (
+    AMBIGUOUS,
+    DIGIT,
+    LETTER,
+    CLASS_TABLE,
+    CountryMatcher,
+    _Bucket,
+    canonical_signature,
+    compile_bucket,
+    slot_layout,
+)
+
+# (position, look-alike -> expected character) for the ambiguous positions a template constrains
+_Plan = List[Tuple[int, Dict[str, str]]]
+
+_TO_DIGIT: Dict[str, str] = dict(LOOKALIKE_DIGITS)
+_TO_LETTER: Dict[str, str] = {digit: letter for letter, digit in LOOKALIKE_DIGITS.items()}
+
+_CONFUSION_TABLE = {**CLASS_TABLE, **{ord(ch): AMBIGUOUS for pair in LOOKALIKE_DIGITS.items() for ch in pair}}
+_ASCII_CONFUSION = bytes(ord(_CONFUSION_TABLE[code]) for code in range(256))
+_MISSING = object()
+
+
+def confusion_signature(plate: str) -> str:
+    """Class signature with look-alike characters marked ``AMBIGUOUS``: ``AI23BC77`` -> ``LAADALDD``."""
+
+    if plate.isascii():
+        return plate.encode("ascii").translate(_ASCII_CONFUSION).decode("ascii")
+    return plate.translate(_CONFUSION_TABLE)
+
+
+def _plan(signature: str, layout: List[frozenset]) -> _Plan:
+    # Only look-alike positions can change, and the signature of the bucket says where they are.
+    plan: _Plan = []
+    for pos, (ch, classes) in enumerate(zip(signature, layout)):
+        if ch != AMBIGUOUS:
+            continue
+        if LETTER in classes and DIGIT not in classes:
+            plan.append((pos, _TO_LETTER))
+        elif DIGIT in classes and LETTER not in classes:
+            plan.append((pos, _TO_DIGIT))
+    return plan
+
+
+class PlateCanonicalizer:
+    """Canonical spelling and country of an OCR read, using the matcher's templates."""
+
+    def __init__(self, matcher: CountryMatcher, *, max_buckets: int = 4096, max_plates: int = 4096) -> None:
+        self.matcher = matcher
+        self.max_buckets = max(1, max_buckets)
+        self.max_plates = max(0, max_plates)
+        self._buckets: Dict[str, List[Tuple[_Plan, _Bucket]]] = {}
+        self._plates: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, signature: str) -> List[Tuple[_Plan, _Bucket]]:
+        signature = canonical_signature(signature)
+        # Templates with the same plan coerce a read to the same plate; priority order is kept within a group.
+        groups: Dict[tuple, Tuple[_Plan, list]] = {}
+        for template in self.matcher.templates:
+            if template.slots is None:
+                # Opaque template: try the read as is.
+                plan: _Plan = []
+            else:
+                layout = slot_layout(template.slots, signature)
+                if layout is None:
+                    continue
+                plan = _plan(signature, layout)
+            key = tuple((pos, mapping is _TO_LETTER) for pos, mapping in plan)
+            groups.setdefault(key, (plan, []))[1].append(template)
+        return [(plan, compile_bucket(templates)) for plan, templates in groups.values()]
+
+    def _bucket(self, signature: str) -> List[Tuple[_Plan, _Bucket]]:
+        bucket = self._buckets.get(signature)
+        if bucket is None:
+            bucket = self._build(signature)
+            with self._lock:
+                while len(self._buckets) >= self.max_buckets:
+                    self._buckets.pop(next(iter(self._buckets)))
+                self._buckets[signature] = bucket
+        return bucket
+
+    def canonicalize(self, text: str) -> Tuple[str, Optional[str]]:
+        """Return ``(plate, country code)``; the code is ``None`` when no template matches."""
+
+        cached = self._plates.get(text, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        base = base_plate(text)
+        result = (base, None)
+        best: Optional[Tuple[int, int]] = None
+        unpinned: Optional[_Bucket] = None
+        for plan, alternation in self._bucket(confusion_signature(base)):
+            if not plan:
+                unpinned = alternation
+                continue
+            chars = list(base)
+            changes = 0
+            for pos, mapping in plan:
+                expected = mapping.get(chars[pos])
+                if expected is not None:
+                    chars[pos] = expected
+                    changes += 1
+            if best is not None and changes > best[0]:
+                continue
+            plate = "".join(chars)
+            template = alternation.match(plate)
+            if template is not None and (best is None or (changes, template.priority) < best):
+                result, best = (plate, template.code), (changes, template.priority)
+        if best is None and unpinned is not None:
+            # Templates that allow letters and digits at every look-alike position take the read as is.
+            template = unpinned.match(base)
+            if template is not None:
+                result = (base, template.code)
+        if self.max_plates:
+            with self._lock:
+                while len(self._plates) >= self.max_plates:
+                    self._plates.pop(next(iter(self._plates)))
+                self._plates[text] = result
+        return result
+
+    def describe(self) -> dict:
+        return {
+            "buckets": len(self._buckets),
+            "cached_plates": len(self._plates),
+        }
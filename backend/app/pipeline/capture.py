@@ -0,0 +1,328 @@
+"""Capture workers and bounded frame buffers for ingest channels.
+
+Each registered channel gets one :class:`CaptureWorker` thread that decodes the
+source and pushes frames into a fixed-capacity :class:`FrameRingBuffer`. When the
+consumer falls behind the oldest frame is dropped, so memory stays bounded and
+the detector always works on the freshest picture.
+
+Low-FPS channels do not need every frame of a 25 fps stream decoded. A channel
+``decode_mode`` makes the decoder skip work it would throw away anyway:
+``keyframes`` decodes only I-frames, ``nonref`` skips non-reference frames and
+``auto`` picks the cheapest mode whose measured output rate still covers
+``target_fps``. A reduced mode that falls below the target is downgraded step by
+step to ``full`` decoding.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Deque, Iterator, Optional
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from app.pipeline.ingest_manager import ChannelConfig
+    from app.pipeline.shm import SharedFramePool
+
+
+@dataclass
+class CapturedFrame:
+    """Buffered frame; ``image`` is an array or a ``SlotHandle`` when shared memory is enabled."""
+
+    channel_id: str
+    frame_id: str
+    image: Any
+    captured_at: float
+
+
+class DecodeMode(str, Enum):
+    full = "full"
+    keyframes = "keyframes"
+    nonref = "nonref"
+    auto = "auto"
+
+
+# libavcodec ``skip_frame`` values per mode and the next, more complete mode to fall back to.
+_SKIP_FRAME = {DecodeMode.full: "DEFAULT", DecodeMode.nonref: "NONREF", DecodeMode.keyframes: "NONKEY"}
+_FALLBACK = {DecodeMode.keyframes: DecodeMode.nonref, DecodeMode.nonref: DecodeMode.full}
+
+
+@dataclass
+class DecodeStats:
+    """Per-channel decoder accounting; CPU time is spent inside the source, measured on ``cpu_clock``.
+
+    A single-threaded decoder runs in the capture thread, so its thread CPU time is exact. With
+    decoder threads the delta of process CPU time is used instead; it also counts other threads
+    that ran meanwhile, so it is an upper bound.
+    """
+
+    requested: DecodeMode = DecodeMode.auto
+    active: DecodeMode = DecodeMode.full
+    decoded: int = 0
+    delivered: int = 0
+    cpu_seconds: float = 0.0
+    output_fps: float = 0.0
+    keyframe_fps: float = 0.0
+    fallbacks: int = 0
+    threads: int = 0
+    cpu_clock: str = "thread"
+
+    def as_dict(self) -> dict:
+        return {
+            "mode": self.requested.value,
+            "active_mode": self.active.value,
+            "decoded_frames": self.decoded,
+            "delivered_frames": self.delivered,
+            "decode_cpu_ms_per_delivered_frame": (
+                round(self.cpu_seconds / self.delivered * 1000, 3) if self.delivered else 0.0
+            ),
+            "decoder_output_fps": round(self.output_fps, 2),
+            "keyframe_fps": round(self.keyframe_fps, 2),
+            "fallbacks": self.fallbacks,
+            "decoder_threads": self.threads,
+            "cpu_clock": self.cpu_clock,
+        }
+
+
+def next_decode_mode(stats: DecodeStats, target_fps: float, headroom: float = 0.9) -> DecodeMode:
+    """Mode to use for the next measurement window, from the rates measured in the last one."""
+
+    active = stats.active
+    if target_fps <= 0:
+        return DecodeMode.full
+    if active != DecodeMode.full and stats.output_fps < target_fps * headroom:
+        return _FALLBACK[active]
+    if stats.requested == DecodeMode.auto and active == DecodeMode.full and not stats.fallbacks:
+        # Only upgrade from a full-decode measurement, and never again after a fallback, to avoid flapping.
+        if stats.keyframe_fps >= target_fps:
+            return DecodeMode.keyframes
+        if stats.output_fps >= 2 * target_fps:
+            return DecodeMode.nonref
+    return active
+
+
+FrameSource = Callable[["ChannelConfig", DecodeStats], Iterator[Any]]
+FrameGate = Callable[[str, Any, float], bool]
+
+
+class FrameRingBuffer:
+    """Thread-safe ring buffer that drops the oldest frame under backpressure."""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self._frames: Deque[CapturedFrame] = deque()
+        self._cond = threading.Condition()
+        self.pushed = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self.avg_lag = 0.0
+
+    def push(self, frame: CapturedFrame) -> Optional[CapturedFrame]:
+        """Append a frame and return the evicted one, if any."""
+
+        evicted = None
+        with self._cond:
+            if len(self._frames) >= self.capacity:
+                evicted = self._frames.popleft()
+                self.dropped += 1
+            self._frames.append(frame)
+            self.pushed += 1
+            self._cond.notify()
+        return evicted
+
+    def pop(self, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
+        with self._cond:
+            if not self._frames and not self._cond.wait_for(lambda: bool(self._frames), timeout):
+                return None
+            frame = self._frames.popleft()
+        lag = time.monotonic() - frame.captured_at
+        self.last_lag = lag
+        self.avg_lag = lag if not self.avg_lag else 0.9 * self.avg_lag + 0.1 * lag
+        return frame
+
+    def clear(self) -> list[CapturedFrame]:
+        with self._cond:
+            frames = list(self._frames)
+            self._frames.clear()
+        return frames
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self._frames),
+            "capacity": self.capacity,
+            "pushed": self.pushed,
+            "dropped": self.dropped,
+            "lag_ms": round(self.last_lag * 1000, 2),
+            "avg_lag_ms": round(self.avg_lag * 1000, 2),
+        }
+
+
+def _apply_decode_mode(codec: Any, mode: DecodeMode) -> DecodeMode:
+    try:
+        codec.skip_frame = _SKIP_FRAME[mode]
+    except (AttributeError, ValueError, TypeError):  # pragma: no cover - depends on the PyAV build
+        codec.skip_frame = _SKIP_FRAME[DecodeMode.full]
+        return DecodeMode.full
+    return mode
+
+
+def open_av_source(
+    config: "ChannelConfig",
+    stats: DecodeStats,
+    window_seconds: float = 5.0,
+    *,
+    decoder_threads: int = 0,
+) -> Iterator[Any]:
+    """Decode a channel source with PyAV and yield BGR frames as NumPy arrays.
+
+    ``decoder_threads`` is the libavcodec thread count (``0`` lets FFmpeg pick,
+    with frame and slice threading). With ``1`` the decoder runs in the capture
+    thread and :class:`CaptureWorker` measures its CPU time exactly.
+    """
+
+    try:
+        import av
+    except ImportError as exc:  # pragma: no cover - depends on deployment
+        raise RuntimeError("PyAV is required for capture workers") from exc
+
+    options = {"rtsp_transport": "tcp"} if config.protocol in ("rtsp", "onvif") else {}
+    container = av.open(config.source, options=options, timeout=10.0)
+    try:
+        stream = container.streams.video[0]
+        codec = stream.codec_context
+        codec.thread_type = "AUTO"
+        codec.thread_count = max(0, decoder_threads)
+        stats.threads = codec.thread_count
+        stats.cpu_clock = "thread" if decoder_threads == 1 else "process"
+        requested = DecodeMode(config.decode_mode)
+        stats.requested = requested
+        stats.active = _apply_decode_mode(codec, DecodeMode.full if requested == DecodeMode.auto else requested)
+        window_start, frames, keyframes = time.monotonic(), 0, 0
+        for frame in container.decode(stream):
+            frames += 1
+            keyframes += bool(frame.key_frame)
+            yield frame.to_ndarray(format="bgr24")
+            elapsed = time.monotonic() - window_start
+            if elapsed < window_seconds:
+                continue
+            stats.output_fps = frames / elapsed
+            if stats.active == DecodeMode.full:
+                stats.keyframe_fps = keyframes / elapsed
+            mode = next_decode_mode(stats, config.target_fps)
+            if mode != stats.active:
+                if _FALLBACK.get(stats.active) == mode:
+                    stats.fallbacks += 1
+                stats.active = _apply_decode_mode(codec, mode)
+            window_start, frames, keyframes = time.monotonic(), 0, 0
+    finally:
+        container.close()
+
+
+def _close_source(frames: Optional[Iterator[Any]]) -> None:
+    if frames is None or not hasattr(frames, "close"):
+        return
+    try:
+        frames.close()
+    except ValueError:
+        # A generator cannot be closed while another thread runs it; the source read timeout bounds that wait.
+        pass
+
+
+class CaptureWorker(threading.Thread):
+    """Pulls frames from a channel source into its ring buffer with auto-reconnect."""
+
+    def __init__(
+        self,
+        config: "ChannelConfig",
+        buffer: FrameRingBuffer,
+        *,
+        source: FrameSource,
+        reconnect_seconds: int,
+        on_connected: Callable[[str], None],
+        on_error: Callable[[str, str], None],
+        gate: Optional[FrameGate] = None,
+        transport: Optional["SharedFramePool"] = None,
+    ) -> None:
+        super().__init__(name=f"capture-{config.channel_id}", daemon=True)
+        self.config = config
+        self.buffer = buffer
+        self.source = source
+        self.reconnect_seconds = reconnect_seconds
+        self.on_connected = on_connected
+        self.on_error = on_error
+        self.gate = gate
+        self.transport = transport
+        self.sequence = 0
+        self.decode = DecodeStats(requested=DecodeMode(config.decode_mode))
+        self._stop_event = threading.Event()
+        self._frames: Optional[Iterator[Any]] = None
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        # Closing the source wakes a worker blocked between reads of sources that support it.
+        _close_source(self._frames)
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def run(self) -> None:
+        channel_id = self.config.channel_id
+        while not self.stopped:
+            frames = None
+            try:
+                connected = False
+                frames = self._frames = self.source(self.config, self.decode)
+                while not self.stopped:
+                    image = self._next_image(frames)
+                    if image is None:
+                        break
+                    if not connected:
+                        self.on_connected(channel_id)
+                        connected = True
+                    now = time.monotonic()
+                    if self.gate and not self.gate(channel_id, image, now):
+                        continue
+                    self._publish(image, now)
+                if not self.stopped:
+                    self.on_error(channel_id, "stream ended")
+            except Exception as exc:  # noqa: BLE001 - any source failure triggers reconnect
+                if not self.stopped:
+                    self.on_error(channel_id, str(exc))
+            finally:
+                self._frames = None
+                _close_source(frames)
+            self._stop_event.wait(self.reconnect_seconds)
+
+    def _next_image(self, frames: Iterator[Any]) -> Any:
+        # The source decodes inside next(); decoder threads are only visible in the process CPU time.
+        clock = time.thread_time if self.decode.cpu_clock == "thread" else time.process_time
+        started = clock()
+        image = next(frames, None)
+        self.decode.cpu_seconds += clock() - started
+        if image is not None:
+            self.decode.decoded += 1
+        return image
+
+    def _publish(self, image: Any, captured_at: float) -> None:
+        self.sequence += 1
+        frame_id = f"{self.config.channel_id}:{self.sequence}"
+        if self.transport is not None:
+            image = self.transport.write(
+                image, channel_id=self.config.channel_id, frame_id=frame_id, captured_at=captured_at
+            )
+            if image is None:
+                return
+        evicted = self.buffer.push(
+            CapturedFrame(channel_id=self.config.channel_id, frame_id=frame_id, image=image, captured_at=captured_at)
+        )
+        self.decode.delivered += 1
+        if evicted is not None and self.transport is not None:
+            self.transport.release(evicted.image)
@@ -0,0 +1,297 @@
+"""Compiled matcher for country plate templates.
+
+Instead of trying every enabled template regex on every plate, the matcher
+reduces a plate to its character-class signature (``L`` letter, ``D`` digit,
+``S`` anything else per position, so the signature also encodes the length)
+and keeps one bucket per signature seen. A bucket holds only the templates
+that can match some plate with that signature, decided once from the parsed
+template, and a single alternation of them with one named group per template.
+Most plates therefore run at most one regex, and template priority (the order
+of the enabled templates) is preserved by the alternation order. The answer
+for the most recent plates is memoized, since every read of a track
+re-submits the same voted plate.
+
+Templates the analyser does not understand (anything beyond literals,
+character classes and repeats) are kept as candidates in every bucket, so the
+result always equals trying the templates in order.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
+LETTER, DIGIT, OTHER = "L", "D", "S"
+# Signature class of a look-alike character that may be read as either a letter or a digit.
+AMBIGUOUS = "A"
+_ANY_CLASS: FrozenSet[str] = frozenset((LETTER, DIGIT, OTHER))
+
+# (min repeats, max repeats, character classes allowed at each repeat)
+Slot = Tuple[int, int, FrozenSet[str]]
+
+
+def char_class(ch: str) -> str:
+    if ch.isdigit():
+        return DIGIT
+    if ch.isalpha():
+        return LETTER
+    return OTHER
+
+
+# Plain translate table for Latin and Cyrillic (a dict subclass with ``__missing__``
+# is about twice as slow in ``str.translate``); other code points pass through
+# unchanged and are classified when their bucket is built.
+CLASS_TABLE = {code: char_class(chr(code)) for code in range(0x500)}
+_SIGNATURE_CLASSES = frozenset((LETTER, DIGIT, OTHER, AMBIGUOUS))
+_MISSING = object()
+
+
+def plate_signature(plate: str) -> str:
+    """Per-position character classes of ``plate``, e.g. ``A123BC77`` -> ``LDDDLLDD``.
+
+    Characters outside Latin and Cyrillic are left as is; :func:`canonical_signature`
+    maps them to their class.
+    """
+
+    return plate.translate(CLASS_TABLE)
+
+
+def canonical_signature(signature: str) -> str:
+    return "".join(ch if ch in _SIGNATURE_CLASSES else char_class(ch) for ch in signature)
+
+
+def _item_classes(op, av) -> Optional[FrozenSet[str]]:
+    if op == sre_constants.LITERAL:
+        return frozenset((char_class(chr(av)),))
+    if op in (sre_constants.ANY, sre_constants.NOT_LITERAL):
+        return _ANY_CLASS
+    if op != sre_constants.IN:
+        return None
+    classes = set()
+    for item_op, item_av in av:
+        if item_op == sre_constants.LITERAL:
+            classes.add(char_class(chr(item_av)))
+        elif item_op == sre_constants.RANGE and item_av[1] - item_av[0] < 4096:
+            classes.update(char_class(chr(code)) for code in range(item_av[0], item_av[1] + 1))
+        elif item_op == sre_constants.CATEGORY and item_av == sre_constants.CATEGORY_DIGIT:
+            classes.add(DIGIT)
+        elif item_op == sre_constants.CATEGORY and item_av == sre_constants.CATEGORY_NOT_DIGIT:
+            classes.update((LETTER, OTHER))
+        else:
+            # Negated sets, wide ranges and other categories: allow every class.
+            return _ANY_CLASS
+    return frozenset(classes)
+
+
+def template_slots(pattern: str) -> Optional[List[Slot]]:
+    """Class layout of an anchored template, or ``None`` if the pattern is too complex to analyse."""
+
+    try:
+        items = list(sre_parse.parse(pattern))
+    except re.error:
+        return None
+    if items and items[0] == (sre_constants.AT, sre_constants.AT_BEGINNING):
+        items = items[1:]
+    anchored_end = bool(items) and items[-1] == (sre_constants.AT, sre_constants.AT_END)
+    if anchored_end:
+        items = items[:-1]
+    slots: List[Slot] = []
+    for op, av in items:
+        low = high = 1
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub = av
+            if len(sub) != 1:
+                return None
+            op, av = sub[0]
+        classes = _item_classes(op, av)
+        if classes is None:
+            return None
+        slots.append((low, high, classes))
+    if not anchored_end:
+        # ``re.match`` semantics: an unanchored template accepts any suffix.
+        slots.append((0, sre_constants.MAXREPEAT, _ANY_CLASS))
+    return slots
+
+
+def _accepted(classes: FrozenSet[str]) -> FrozenSet[str]:
+    return classes | {AMBIGUOUS} if LETTER in classes or DIGIT in classes else classes
+
+
+def _slot_moves(slots: List[Slot], signature: str) -> Optional[List[List[Tuple[int, int]]]]:
+    # Per slot, the (start, end) spans of the signature it can consume after the previous slots.
+    size = len(signature)
+    reach = {0}
+    moves = []
+    for low, high, classes in slots:
+        accepted = _accepted(classes)
+        spans = []
+        for start in reach:
+            limit = min(high, size - start)
+            count = 0
+            while True:
+                if count >= low:
+                    spans.append((start, start + count))
+                if count == limit or signature[start + count] not in accepted:
+                    break
+                count += 1
+        if not spans:
+            return None
+        moves.append(spans)
+        reach = {end for _, end in spans}
+    return moves if size in reach else None
+
+
+def slots_accept(slots: List[Slot], signature: str) -> bool:
+    """Whether some plate with ``signature`` fits the class layout ``slots``.
+
+    ``AMBIGUOUS`` positions fit any slot that allows letters or digits.
+    """
+
+    return _slot_moves(slots, signature) is not None
+
+
+def slot_layout(slots: List[Slot], signature: str) -> Optional[List[FrozenSet[str]]]:
+    """Classes the template allows at each position of a plate with ``signature``.
+
+    When repeats can be split several ways the classes of every split are merged.
+    """
+
+    moves = _slot_moves(slots, signature)
+    if moves is None:
+        return None
+    layout: List[set] = [set() for _ in signature]
+    alive = {len(signature)}
+    for (_, _, classes), spans in zip(reversed(slots), reversed(moves)):
+        kept = [(start, end) for start, end in spans if end in alive]
+        for start, end in kept:
+            for pos in range(start, end):
+                layout[pos] |= classes
+        alive = {start for start, _ in kept}
+    return [frozenset(classes) for classes in layout]
+
+
+@dataclass
+class CompiledTemplate:
+    code: str
+    pattern: str
+    regex: Pattern[str]
+    slots: Optional[List[Slot]]
+    # Position in the enabled template list; lower wins.
+    priority: int = 0
+
+
+@dataclass
+class _Bucket:
+    templates: List[CompiledTemplate] = field(default_factory=list)
+    # Alternation of every candidate, one named group per template; ``None`` for 0-1 candidates.
+    regex: Optional[Pattern[str]] = None
+    groups: Dict[str, CompiledTemplate] = field(default_factory=dict)
+
+    def match(self, plate: str) -> Optional[CompiledTemplate]:
+        if self.regex is not None:
+            found = self.regex.match(plate)
+            if found is None:
+                return None
+            template = self.groups.get(found.lastgroup) if found.lastgroup else None
+            if template is not None:
+                return template
+        for template in self.templates:
+            if template.regex.match(plate):
+                return template
+        return None
+
+
+def compile_bucket(candidates: List[CompiledTemplate]) -> _Bucket:
+    """One alternation over ``candidates`` (in priority order) with a named group per template."""
+
+    bucket = _Bucket(templates=candidates)
+    if len(candidates) > 1:
+        groups = {f"_t{idx}": template for idx, template in enumerate(candidates)}
+        try:
+            bucket.regex = re.compile(
+                "|".join(f"(?P<{name}>{template.pattern})" for name, template in groups.items()),
+                re.IGNORECASE,
+            )
+            bucket.groups = groups
+        except re.error:
+            # Templates with their own named groups or backreferences are tried one by one.
+            bucket.regex = None
+    return bucket
+
+
+class CountryMatcher:
+    """First matching country template for a plate, with templates bucketed by signature."""
+
+    def __init__(
+        self,
+        templates: Iterable[Tuple[str, str]],
+        *,
+        max_buckets: int = 4096,
+        max_plates: int = 4096,
+    ) -> None:
+        self.templates = [
+            CompiledTemplate(code.upper(), pattern, re.compile(pattern, re.IGNORECASE), template_slots(pattern), priority)
+            for priority, (code, pattern) in enumerate(templates)
+        ]
+        self.max_buckets = max(1, max_buckets)
+        self.max_plates = max(0, max_plates)
+        self._buckets: Dict[str, _Bucket] = {}
+        # Every read of a track re-submits the same voted plate: remember recent answers.
+        self._plates: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, signature: str) -> _Bucket:
+        return compile_bucket(
+            [
+                template
+                for template in self.templates
+                if template.slots is None or slots_accept(template.slots, canonical_signature(signature))
+            ]
+        )
+
+    def _bucket(self, signature: str) -> _Bucket:
+        bucket = self._buckets.get(signature)
+        if bucket is None:
+            bucket = self._build(signature)
+            with self._lock:
+                while len(self._buckets) >= self.max_buckets:
+                    self._buckets.pop(next(iter(self._buckets)))
+                self._buckets[signature] = bucket
+        return bucket
+
+    def candidates(self, plate: str) -> List[str]:
+        """Codes of the templates a plate is checked against, in priority order."""
+
+        return [template.code for template in self._bucket(plate_signature(plate)).templates]
+
+    def match(self, plate: str) -> Optional[str]:
+        code = self._plates.get(plate, _MISSING)
+        if code is not _MISSING:
+            return code
+        template = self._bucket(plate_signature(plate)).match(plate)
+        code = template.code if template is not None else None
+        if self.max_plates:
+            with self._lock:
+                while len(self._plates) >= self.max_plates:
+                    self._plates.pop(next(iter(self._plates)))
+                self._plates[plate] = code
+        return code
+
+    def describe(self) -> dict:
+        buckets = list(self._buckets.values())
+        return {
+            "templates": [template.code for template in self.templates],
+            "opaque_templates": [template.code for template in self.templates if template.slots is None],
+            "buckets": len(buckets),
+            "cached_plates": len(self._plates),
+            "max_candidates": max((len(bucket.templates) for bucket in buckets), default=0),
+        }
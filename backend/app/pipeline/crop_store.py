@@ -0,0 +1,140 @@
+"""Bounded store of the best plate crops per track.
+
+Only a few crops of a track are ever needed: the event image and the inputs of
+OCR voting. :class:`TrackCropStore` keeps the top ``top_k`` crops of every live
+track ranked by :func:`crop_quality`, copies a crop out of the frame only when
+it makes that cut, and enforces a byte cap per track and per node. A track's
+crops are dropped as soon as the tracker closes or evicts it.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.monitoring import MetricsRegistry
+
+
+@dataclass(order=True)
+class StoredCrop:
+    quality: float
+    serial: int
+    crop: np.ndarray = field(compare=False)
+
+    @property
+    def nbytes(self) -> int:
+        return self.crop.nbytes
+
+
+@dataclass
+class _TrackCrops:
+    heap: List[StoredCrop] = field(default_factory=list)  # min-heap: the worst kept crop is heap[0]
+    nbytes: int = 0
+
+
+class TrackCropStore:
+    """Top-K crops per track under per-track and per-node byte caps."""
+
+    def __init__(
+        self,
+        *,
+        top_k: int = 3,
+        max_track_bytes: int = 512 * 1024,
+        max_total_bytes: int = 64 * 1024 * 1024,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.top_k = max(1, top_k)
+        self.max_track_bytes = max_track_bytes
+        self.max_total_bytes = max_total_bytes
+        self.metrics = metrics
+        self._tracks: Dict[str, _TrackCrops] = {}
+        self._serial = itertools.count()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.stored = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def offer(self, track_id: str, crop: np.ndarray, quality: float) -> bool:
+        """Keep a copy of ``crop`` if it ranks among the track's best; returns whether it was kept."""
+
+        if crop.nbytes > self.max_track_bytes:
+            self.rejected += 1
+            return False
+        with self._lock:
+            entry = self._tracks.setdefault(track_id, _TrackCrops())
+            full = len(entry.heap) >= self.top_k or entry.nbytes + crop.nbytes > self.max_track_bytes
+            if full and entry.heap and quality <= entry.heap[0].quality:
+                self.rejected += 1
+                return False
+            # Copy only now: the crop is a view into a frame buffer that will be reused.
+            item = StoredCrop(quality=quality, serial=next(self._serial), crop=np.array(crop, copy=True))
+            heapq.heappush(entry.heap, item)
+            self._account(entry, item.nbytes)
+            self.stored += 1
+            while len(entry.heap) > self.top_k or entry.nbytes > self.max_track_bytes:
+                self._evict_worst(entry)
+            while self.total_bytes > self.max_total_bytes:
+                self._evict_worst(max(self._tracks.values(), key=lambda other: other.nbytes))
+            kept = item in entry.heap
+        self._report()
+        return kept
+
+    def _account(self, entry: _TrackCrops, delta: int) -> None:
+        entry.nbytes += delta
+        self.total_bytes += delta
+
+    def _evict_worst(self, entry: _TrackCrops) -> None:
+        worst = heapq.heappop(entry.heap)
+        self._account(entry, -worst.nbytes)
+        self.evicted += 1
+
+    def best(self, track_id: str) -> Optional[StoredCrop]:
+        entry = self._tracks.get(track_id)
+        if entry is None or not entry.heap:
+            return None
+        return max(entry.heap)
+
+    def crops(self, track_id: str) -> List[StoredCrop]:
+        """Kept crops of a track, best first."""
+
+        entry = self._tracks.get(track_id)
+        return sorted(entry.heap, reverse=True) if entry else []
+
+    def summary(self, track_id: str) -> Optional[Tuple[float, List[int]]]:
+        """Quality and shape of the best kept crop, for event metadata."""
+
+        best = self.best(track_id)
+        return (round(best.quality, 4), list(best.crop.shape)) if best else None
+
+    def release(self, track_ids: Iterable[str]) -> None:
+        """Drop every crop of closed or evicted tracks."""
+
+        with self._lock:
+            for track_id in track_ids:
+                entry = self._tracks.pop(track_id, None)
+                if entry is not None:
+                    self.total_bytes -= entry.nbytes
+        self._report()
+
+    def _report(self) -> None:
+        if self.metrics:
+            self.metrics.set_gauge("crop_store_bytes", float(self.total_bytes))
+            self.metrics.set_gauge("crop_store_tracks", float(len(self._tracks)))
+
+    def describe(self) -> dict:
+        return {
+            "top_k": self.top_k,
+            "max_track_bytes": self.max_track_bytes,
+            "max_total_bytes": self.max_total_bytes,
+            "tracks": len(self._tracks),
+            "total_bytes": self.total_bytes,
+            "stored": self.stored,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,92 @@
+"""Anti-duplicate index of recently reported plates.
+
+Entries are keyed by ``(channel_id, plate)``, so the same plate seen by two
+cameras is reported by both. All entries share one TTL, so an ``OrderedDict``
+in insertion order is also in expiry order: expired entries are popped from
+the front as new plates arrive, which keeps insert, lookup and expiry O(1)
+amortized. ``max_entries`` is a hard cap; beyond it the oldest entries are
+evicted even if they have not expired yet.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.monitoring import MetricsRegistry
+
+DuplicateKey = Tuple[Optional[str], str]
+
+
+class DuplicateIndex:
+    """TTL set of ``(channel, plate)`` keys with ordered expiry and a size cap."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        *,
+        max_entries: int = 100_000,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.ttl = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.metrics = metrics
+        self._entries: "OrderedDict[DuplicateKey, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def check(self, channel_id: Optional[str], plate: str, now: float) -> bool:
+        """Return ``True`` if the plate was reported on the channel within the TTL, else record it."""
+
+        key = (channel_id, plate)
+        with self._lock:
+            expired = self._expire(now)
+            last_seen = self._entries.get(key)
+            if last_seen is not None and now - last_seen <= self.ttl:
+                duplicate = True
+            else:
+                # The first report opens the window; duplicates inside it do not extend it.
+                self._entries[key] = now
+                self._entries.move_to_end(key)
+                duplicate = False
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self.evicted += evicted
+        self._report(expired, evicted)
+        return duplicate
+
+    def _expire(self, now: float) -> int:
+        expired = 0
+        while self._entries:
+            key, seen_at = next(iter(self._entries.items()))
+            if now - seen_at <= self.ttl:
+                break
+            del self._entries[key]
+            expired += 1
+        self.expired += expired
+        return expired
+
+    def _report(self, expired: int, evicted: int) -> None:
+        if not self.metrics:
+            return
+        self.metrics.set_gauge("anti_duplicate_entries", float(len(self._entries)))
+        if expired:
+            self.metrics.inc("anti_duplicate_evictions", float(expired), labels={"reason": "expired"})
+        if evicted:
+            self.metrics.inc("anti_duplicate_evictions", float(evicted), labels={"reason": "capacity"})
+
+    def describe(self) -> dict:
+        return {
+            "ttl_seconds": self.ttl,
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
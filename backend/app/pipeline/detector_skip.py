@@ -0,0 +1,125 @@
+"""Adaptive detector skipping between tracker-predicted frames.
+
+Once a channel has stable tracks, running the detector on every frame mostly
+re-confirms boxes the Kalman filter already predicts. :class:`DetectionSkipper`
+decides per channel whether a frame goes through the detector or only through
+:meth:`Tracker.coast`. The detector interval grows by one frame while the
+motion model stays accurate and halves when it drifts, when new tracks appear
+(scene activity), or when a coasted track's confidence decays below the floor.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+from app.monitoring import MetricsRegistry
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from app.pipeline.tracker import Tracker
+
+
+@dataclass
+class ChannelSkipState:
+    interval: int = 1
+    since_detection: int = 0
+    detected: int = 0
+    predicted: int = 0
+    forced: int = 0
+    last_drift: Optional[float] = None
+
+    @property
+    def call_rate(self) -> float:
+        total = self.detected + self.predicted
+        return self.detected / total if total else 1.0
+
+    def as_dict(self) -> dict:
+        return {
+            "interval": self.interval,
+            "detected": self.detected,
+            "predicted": self.predicted,
+            "forced": self.forced,
+            "call_rate": round(self.call_rate, 4),
+            "last_drift": round(self.last_drift, 4) if self.last_drift is not None else None,
+        }
+
+
+class DetectionSkipper:
+    """Per-channel choice between a detector run and a tracker-only prediction step."""
+
+    def __init__(
+        self,
+        *,
+        max_interval: int = 1,
+        max_drift: float = 0.3,
+        min_track_confidence: float = 0.3,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.max_interval = max(1, max_interval)
+        self.max_drift = max_drift
+        self.min_track_confidence = min_track_confidence
+        self.metrics = metrics
+        self._channels: Dict[str, ChannelSkipState] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_interval > 1
+
+    def _state(self, channel_id: str) -> ChannelSkipState:
+        state = self._channels.get(channel_id)
+        if state is None:
+            with self._lock:
+                state = self._channels.setdefault(channel_id, ChannelSkipState())
+        return state
+
+    def should_detect(self, channel_id: str, tracker: "Tracker") -> bool:
+        if not self.enabled:
+            return True
+        state = self._state(channel_id)
+        if state.since_detection + 1 >= state.interval:
+            return True
+        if tracker.min_visible_score() < self.min_track_confidence:
+            state.forced += 1
+            return True
+        return False
+
+    def record(self, channel_id: str, tracker: "Tracker", *, detected: bool) -> None:
+        """Account one frame and, after a detector run, adapt the channel interval."""
+
+        if not self.enabled:
+            return
+        state = self._state(channel_id)
+        if detected:
+            state.detected += 1
+            state.since_detection = 0
+            drift = tracker.last_drift
+            state.last_drift = drift
+            if tracker.last_spawned or (drift is not None and drift > self.max_drift):
+                state.interval = max(1, state.interval // 2)
+            elif drift is None or drift <= self.max_drift / 2:
+                state.interval = min(self.max_interval, state.interval + 1)
+        else:
+            state.predicted += 1
+            state.since_detection += 1
+        if self.metrics:
+            labels = {"channel": channel_id}
+            self.metrics.inc("detector_frames", labels={**labels, "mode": "detected" if detected else "predicted"})
+            self.metrics.set_gauge("detector_call_rate", state.call_rate, labels=labels)
+            self.metrics.set_gauge("detector_interval", state.interval, labels=labels)
+            if detected and state.last_drift is not None:
+                self.metrics.observe("tracking_drift", state.last_drift, labels=labels)
+
+    def remove(self, channel_id: str) -> None:
+        with self._lock:
+            self._channels.pop(channel_id, None)
+
+    def describe(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_interval": self.max_interval,
+            "max_drift": self.max_drift,
+            "min_track_confidence": self.min_track_confidence,
+            "channels": {channel_id: state.as_dict() for channel_id, state in self._channels.items()},
+        }
@@ -0,0 +1,469 @@
+"""Staged pipeline executor with bounded queues and per-stage concurrency.
+
+Each stage owns a bounded input queue and a pool of workers (threads, or
+threads dispatching into a process pool). When a stage's queue is full, its
+policy decides what happens:
+
+- ``block``: the upstream worker waits (backpressure);
+- ``drop_oldest``: the oldest queued item is discarded;
+- ``drop_newest``: the incoming item is discarded.
+
+A handler returns the item for the next stage, ``None`` to stop the item, or a
+list to fan out. Every stage reports service time, queue wait and utilization
+(busy time over wall time times workers), so the bottleneck stage can be found
+and scaled with :meth:`StagedExecutor.scale` without touching the pipeline.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+from app.events import EventManager, event_manager
+from app.monitoring import MetricsRegistry, metrics_registry
+from app.pipeline.batching import MicroBatcher, detection_batcher
+from app.pipeline.capture import CapturedFrame
+from app.pipeline.ingest_manager import IngestManager, ingest_manager
+from app.pipeline.postprocess import PostprocessResult, Postprocessor, postprocessor
+from app.pipeline.recognition import FrameRecognition, RecognitionPipeline, StagedFrame, recognition_pipeline
+
+
+class QueuePolicy(str, Enum):
+    block = "block"
+    drop_oldest = "drop_oldest"
+    drop_newest = "drop_newest"
+
+
+class StageMode(str, Enum):
+    thread = "thread"
+    process = "process"
+
+
+@dataclass
+class StageSpec:
+    name: str
+    handler: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 64
+    policy: QueuePolicy = QueuePolicy.block
+    # Process stages need a picklable (module-level) handler.
+    mode: StageMode = StageMode.thread
+    # Upper bound for :meth:`Stage.scale`, e.g. ``1`` for a stage that must see items in order.
+    max_workers: Optional[int] = None
+
+
+class BoundedQueue:
+    """FIFO with a hard size limit and a full-queue policy; items carry their enqueue time."""
+
+    def __init__(self, maxsize: int, policy: QueuePolicy) -> None:
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self._items: Deque[Tuple[Any, float]] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any) -> bool:
+        """Enqueue ``item``; returns ``False`` when it was dropped (or the queue is closed)."""
+
+        with self._cond:
+            if self.policy == QueuePolicy.block:
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._cond.wait()
+            elif len(self._items) >= self.maxsize:
+                self.dropped += 1
+                if self.policy == QueuePolicy.drop_newest:
+                    return False
+                self._items.popleft()
+            if self._closed:
+                return False
+            self._items.append((item, time.monotonic()))
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: float) -> Optional[Tuple[Any, float]]:
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            entry = self._items.popleft()
+            self._cond.notify_all()
+            return entry
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._cond.notify_all()
+
+    def reopen(self) -> None:
+        with self._cond:
+            self._closed = False
+
+
+class Stage:
+    """Runtime of one :class:`StageSpec`: queue, workers and timing statistics."""
+
+    def __init__(self, spec: StageSpec, *, metrics: Optional[MetricsRegistry] = None) -> None:
+        self.spec = spec
+        self.metrics = metrics
+        self.queue = BoundedQueue(spec.queue_size, spec.policy)
+        self.downstream: Optional[Stage] = None
+        self._workers: List[Tuple[threading.Thread, threading.Event]] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.running = False
+        self.started_at: Optional[float] = None
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def workers(self) -> int:
+        return len(self._workers)
+
+    def start(self) -> None:
+        self.queue.reopen()
+        self.started_at = time.monotonic()
+        with self._lock:
+            self.running = True
+        self.scale(self.spec.workers)
+
+    def stop(self) -> None:
+        self.queue.close()
+        with self._lock:
+            self.running = False
+            workers, self._workers = self._workers, []
+            for _, stop_event in workers:
+                stop_event.set()
+            pool, self._pool = self._pool, None
+        for thread, _ in workers:
+            thread.join(timeout=5)
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def scale(self, workers: int) -> None:
+        workers = max(1, workers)
+        if self.spec.max_workers is not None:
+            workers = min(workers, self.spec.max_workers)
+        with self._lock:
+            self.spec.workers = workers
+            if not self.running:
+                # Only the target changes; :meth:`start` brings up the threads.
+                return
+            if self.spec.mode == StageMode.process and (self._pool is None or workers != len(self._workers)):
+                old_pool, self._pool = self._pool, ProcessPoolExecutor(max_workers=workers)
+                if old_pool:
+                    old_pool.shutdown(wait=False)
+            while len(self._workers) < workers:
+                stop_event = threading.Event()
+                thread = threading.Thread(
+                    target=self._run,
+                    args=(stop_event,),
+                    name=f"stage-{self.name}-{len(self._workers)}",
+                    daemon=True,
+                )
+                self._workers.append((thread, stop_event))
+                thread.start()
+            while len(self._workers) > workers:
+                _, stop_event = self._workers.pop()
+                stop_event.set()
+
+    def put(self, item: Any) -> bool:
+        dropped = self.queue.dropped
+        accepted = self.queue.put(item)
+        if self.metrics and self.queue.dropped != dropped:
+            self.metrics.inc("stage_dropped", labels={"stage": self.name})
+        return accepted
+
+    def _run(self, stop_event: threading.Event) -> None:
+        while not stop_event.is_set():
+            entry = self.queue.get(timeout=0.2)
+            if entry is None:
+                continue
+            item, enqueued_at = entry
+            started = time.monotonic()
+            try:
+                if self._pool is not None:
+                    output = self._pool.submit(self.spec.handler, item).result()
+                else:
+                    output = self.spec.handler(item)
+            except Exception as exc:  # noqa: BLE001 - one bad item must not kill the worker
+                output = None
+                self.errors += 1
+                self.last_error = str(exc)
+            finished = time.monotonic()
+            self._record(started - enqueued_at, finished - started)
+            self._forward(output)
+
+    def _forward(self, output: Any) -> None:
+        if output is None or self.downstream is None:
+            return
+        for item in output if isinstance(output, list) else [output]:
+            self.downstream.put(item)
+
+    def _record(self, wait: float, service: float) -> None:
+        with self._lock:
+            self.processed += 1
+            self.wait_seconds += wait
+            self.busy_seconds += service
+        if self.metrics:
+            labels = {"stage": self.name}
+            self.metrics.observe("stage_queue_wait_ms", wait * 1000, labels=labels)
+            self.metrics.observe("stage_service_ms", service * 1000, labels=labels)
+
+    def utilization(self) -> float:
+        if self.started_at is None or not self.workers:
+            return 0.0
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return min(self.busy_seconds / (elapsed * self.workers), 1.0)
+
+    def describe(self) -> dict:
+        utilization = self.utilization()
+        if self.metrics:
+            labels = {"stage": self.name}
+            self.metrics.set_gauge("stage_utilization", utilization, labels=labels)
+            self.metrics.set_gauge("stage_queue_depth", len(self.queue), labels=labels)
+        return {
+            "name": self.name,
+            "mode": self.spec.mode.value,
+            "workers": self.workers,
+            "target_workers": self.spec.workers,
+            "max_workers": self.spec.max_workers,
+            "policy": self.spec.policy.value,
+            "queue_size": self.queue.maxsize,
+            "queue_depth": len(self.queue),
+            "processed": self.processed,
+            "dropped": self.queue.dropped,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "avg_service_ms": round(self.busy_seconds / self.processed * 1000, 3) if self.processed else 0.0,
+            "avg_queue_wait_ms": round(self.wait_seconds / self.processed * 1000, 3) if self.processed else 0.0,
+            "utilization": round(utilization, 4),
+        }
+
+
+class StagedExecutor:
+    """Chains stages in order; the output of stage ``i`` is queued into stage ``i + 1``."""
+
+    def __init__(self, specs: Sequence[StageSpec], *, metrics: Optional[MetricsRegistry] = None) -> None:
+        if not specs:
+            raise ValueError("StagedExecutor needs at least one stage")
+        self.stages: List[Stage] = [Stage(spec, metrics=metrics) for spec in specs]
+        self._by_name: Dict[str, Stage] = {stage.name: stage for stage in self.stages}
+        if len(self._by_name) != len(self.stages):
+            raise ValueError("Stage names must be unique")
+        for upstream, downstream in zip(self.stages, self.stages[1:]):
+            upstream.downstream = downstream
+        self.running = False
+
+    def start(self) -> None:
+        if self.running:
+            return
+        # Start from the sink so downstream queues are draining before upstream produces.
+        for stage in reversed(self.stages):
+            stage.start()
+        self.running = True
+
+    def stop(self) -> None:
+        for stage in self.stages:
+            stage.stop()
+        self.running = False
+
+    def submit(self, item: Any, *, stage: Optional[str] = None) -> bool:
+        """Queue ``item`` into the first stage, or into ``stage`` for items that already passed the earlier ones."""
+
+        return (self.stage(stage) if stage else self.stages[0]).put(item)
+
+    def stage(self, name: str) -> Stage:
+        if name not in self._by_name:
+            raise KeyError(f"Stage {name} not found")
+        return self._by_name[name]
+
+    def scale(self, name: str, workers: int) -> dict:
+        stage = self.stage(name)
+        stage.scale(workers)
+        return stage.describe()
+
+    def describe(self) -> dict:
+        stages = [stage.describe() for stage in self.stages]
+        busiest = max(stages, key=lambda item: item["utilization"])
+        return {
+            "running": self.running,
+            "stages": stages,
+            "bottleneck": busiest["name"] if busiest["utilization"] > 0 else None,
+        }
+
+
+class IngestFeeder:
+    """Moves frames from the ingest ring buffers into the executor, one frame per channel per pass.
+
+    With shared-memory inference processes the feeder forwards their results to
+    the postprocessor stage instead.
+    """
+
+    def __init__(self, manager: IngestManager, executor: StagedExecutor, idle_sleep: float = 0.005) -> None:
+        self.manager = manager
+        self.executor = executor
+        self.idle_sleep = idle_sleep
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.executor.start()
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ingest-feeder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.executor.stop()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            # Inference processes already ran detection, tracking and OCR on their frames.
+            results = self.manager.drain_results()
+            for result in results:
+                self.executor.submit(result, stage="postprocessor")
+            frames = [] if self.manager.bridge else self.manager.drain_frames()
+            for frame in frames:
+                self.executor.submit(frame)
+            if not frames and not results:
+                self._stop_event.wait(self.idle_sleep)
+
+
+def build_recognition_executor(
+    *,
+    batcher: MicroBatcher,
+    pipeline: RecognitionPipeline,
+    post: Postprocessor,
+    workers: Dict[str, int],
+    queue_size: int,
+    metrics: Optional[MetricsRegistry] = None,
+    events: Optional[EventManager] = None,
+    track_settled: Optional[Callable[[Optional[str], str], None]] = None,
+) -> StagedExecutor:
+    """Default wiring: detector -> tracker (with cropper) -> ocr_engine -> postprocessor -> event_manager.
+
+    ``track_settled`` is called with ``(channel_id, track_id)`` when a track's vote settles, for OCR
+    schedulers that cannot ask ``post`` themselves (shared-memory inference processes).
+    """
+
+    events = events or event_manager
+    min_confidence = pipeline.ocr_scheduler.settings.min_confidence
+
+    def detect(frame: CapturedFrame) -> Future[StagedFrame]:
+        # Not waiting lets the micro-batcher fill cross-channel batches, and the futures stay in submission order.
+        return batcher.submit(frame.frame_id, frame.image, channel_id=frame.channel_id)
+
+    def track(future: Future[StagedFrame]) -> StagedFrame:
+        return pipeline.track(future.result())
+
+    def recognize(staged: StagedFrame) -> FrameRecognition:
+        # Concurrent OCR workers let the OCR batcher combine crops of several frames.
+        return pipeline.recognize([staged])[0]
+
+    def event(channel_id: Optional[str], track_id: Optional[str], outcome: PostprocessResult, context: Any) -> dict:
+        return {
+            "channel_id": channel_id,
+            "track_id": track_id,
+            "plate": outcome.plate,
+            "confidence": outcome.confidence,
+            "country": outcome.country,
+            **(context or {"bbox": None, "direction": None, "meta": None}),
+        }
+
+    def postprocess(result: FrameRecognition) -> List[dict]:
+        plates = []
+        tracks = dict(
+            zip(
+                result.tracks.track_ids,
+                zip(result.tracks.boxes.tolist(), result.tracks.directions, result.tracks.hits.tolist()),
+            )
+        )
+        for candidate in result.ocr:
+            bbox, direction, hits = tracks.get(candidate.track_id, (None, None, 1))
+            best_crop = pipeline.crop_store.summary(candidate.track_id) if candidate.track_id else None
+            context = {
+                "bbox": bbox,
+                "direction": direction.value if direction else None,
+                "meta": {"best_crop": {"quality": best_crop[0], "shape": best_crop[1]}} if best_crop else None,
+            }
+            was_settled = track_settled is None or not candidate.track_id or post.track_settled(
+                candidate.track_id, min_confidence
+            )
+            outcome = post.process_candidates(
+                [candidate],
+                frames_with_plate=hits,
+                track_id=candidate.track_id,
+                channel_id=result.channel_id,
+                context=context,
+            )
+            if not was_settled and post.track_settled(candidate.track_id, min_confidence):
+                track_settled(result.channel_id, candidate.track_id)
+            if not outcome.plate or outcome.is_duplicate:
+                continue
+            plates.append(event(result.channel_id, candidate.track_id, outcome, context))
+        # A track whose vote never settled yields its final vote when the tracker closes it.
+        for track_id, hits in result.closed_tracks.items():
+            outcome, context = post.close_track(track_id, frames_with_plate=hits, channel_id=result.channel_id)
+            if not outcome.plate or outcome.is_duplicate:
+                continue
+            plates.append(event(result.channel_id, track_id, outcome, context))
+        return plates
+
+    def record(plate: dict) -> None:
+        events.record_event(image_url=None, **plate)
+
+    # The OCR scheduler stops reading a track once the vote the event comes from has settled.
+    pipeline.ocr_scheduler.settled = post.track_settled
+
+    specs = [
+        # Trackers need the frames of a channel in capture order, so neither stage is scaled out: the single
+        # detector worker forwards batcher futures in submission order and the tracker waits on them in turn.
+        StageSpec("detector", detect, workers=1, queue_size=queue_size, policy=QueuePolicy.drop_oldest, max_workers=1),
+        StageSpec("tracker", track, workers=1, queue_size=queue_size, max_workers=1),
+        StageSpec("ocr_engine", recognize, workers=workers.get("ocr_engine", 4), queue_size=queue_size),
+        StageSpec("postprocessor", postprocess, workers=workers.get("postprocessor", 1), queue_size=queue_size),
+        StageSpec("event_manager", record, workers=workers.get("event_manager", 1), queue_size=queue_size),
+    ]
+    return StagedExecutor(specs, metrics=metrics)
+
+
+_settings = get_settings()
+
+recognition_executor = build_recognition_executor(
+    batcher=detection_batcher,
+    pipeline=recognition_pipeline,
+    post=postprocessor,
+    workers=_settings.pipeline_stage_workers,
+    queue_size=_settings.pipeline_stage_queue_size,
+    metrics=metrics_registry,
+    track_settled=ingest_manager.track_settled,
+)
+
+ingest_feeder = IngestFeeder(ingest_manager, recognition_executor)
+
+# Votes of a removed channel's tracks are dropped; its trackers are released by the recognition pipeline.
+ingest_manager.channel_removed_hooks.append(postprocessor.release_channel)
@@ -0,0 +1,104 @@
+"""Vectorized box geometry shared by the detector and the tracker.
+
+Boxes are ``(N, 4)`` contiguous ``float32`` arrays in ``x1, y1, x2, y2`` pixel
+coordinates. All kernels work on whole arrays; none of them loop over boxes in
+Python except the greedy NMS, which loops over *kept* boxes only.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+
+Rect = Tuple[float, float, float, float]
+
+
+def as_boxes(boxes: np.ndarray | Sequence[Sequence[float]] | Iterable) -> np.ndarray:
+    """Return ``boxes`` as a contiguous ``(N, 4)`` ``float32`` array (no copy when already one)."""
+
+    array = np.ascontiguousarray(boxes, dtype=np.float32)
+    return array.reshape(-1, 4)
+
+
+def box_area(boxes: np.ndarray) -> np.ndarray:
+    return np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+
+
+def pairwise_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """IoU matrix of shape ``(len(a), len(b))``."""
+
+    if not len(a) or not len(b):
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    union = box_area(a)[:, None] + box_area(b)[None, :] - inter
+    return (inter / np.maximum(union, 1e-9)).astype(np.float32, copy=False)
+
+
+def paired_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise IoU of ``a[i]`` and ``b[i]`` for two equally long box arrays."""
+
+    x1 = np.maximum(a[:, 0], b[:, 0])
+    y1 = np.maximum(a[:, 1], b[:, 1])
+    x2 = np.minimum(a[:, 2], b[:, 2])
+    y2 = np.minimum(a[:, 3], b[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    union = box_area(a) + box_area(b) - inter
+    return (inter / np.maximum(union, 1e-9)).astype(np.float32, copy=False)
+
+
+def nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float,
+    top_k: int,
+    pre_top_k: int = 1024,
+) -> np.ndarray:
+    """Class-agnostic greedy NMS; returns indices of kept boxes ordered by score.
+
+    Only the ``pre_top_k`` best-scoring candidates are considered, which bounds
+    the IoU matrix to ``pre_top_k ** 2`` cells.
+    """
+
+    if not len(boxes) or top_k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    order = np.argsort(-scores, kind="stable")[:pre_top_k]
+    overlaps = pairwise_iou(boxes[order], boxes[order]) > iou_threshold
+    suppressed = np.zeros(len(order), dtype=bool)
+    keep = []
+    for idx in range(len(order)):
+        if suppressed[idx]:
+            continue
+        keep.append(idx)
+        if len(keep) >= top_k:
+            break
+        suppressed |= overlaps[idx]
+    return order[np.asarray(keep, dtype=np.intp)]
+
+
+def clip_boxes(boxes: np.ndarray, rect: Rect) -> np.ndarray:
+    """Clip boxes to ``rect`` (``x1, y1, x2, y2``) in place and return them."""
+
+    x1, y1, x2, y2 = rect
+    np.clip(boxes[:, 0::2], x1, x2, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], y1, y2, out=boxes[:, 1::2])
+    return boxes
+
+
+def crop_view(image: np.ndarray, box: Sequence[float]) -> np.ndarray | None:
+    """Zero-copy crop of ``image`` to ``box`` clipped to the frame; ``None`` if empty."""
+
+    height, width = image.shape[:2]
+    x1, y1 = max(int(box[0]), 0), max(int(box[1]), 0)
+    x2, y2 = min(int(np.ceil(box[2])), width), min(int(np.ceil(box[3])), height)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return image[y1:y2, x1:x2]
+
+
+def centers(boxes: np.ndarray) -> np.ndarray:
+    return np.stack([(boxes[:, 0] + boxes[:, 2]) * 0.5, (boxes[:, 1] + boxes[:, 3]) * 0.5], axis=1)
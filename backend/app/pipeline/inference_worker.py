@@ -0,0 +1,85 @@
+"""Entry points of the shared-memory inference processes.
+
+With ``INGEST_SHM_SLOTS > 0`` and ``INGEST_SHM_INFERENCE_WORKERS > 0`` the
+ingest manager spawns inference processes (:mod:`app.pipeline.shm`). Each one
+imports the application, loads the models and runs detection, tracking and
+OCR on the frames of its channels with its own :data:`recognition_pipeline`;
+the :class:`FrameRecognition` results go back to the main process, which only
+runs the postprocessor and event stages.
+
+The process's own :data:`ingest_manager` never captures anything: the main
+process sends it the configuration of each channel the process handles, so the
+ROI crop and the direction filter see the same channels as in-process
+recognition. Votes stay in the main process, which reports the tracks that
+settled so the OCR scheduler stops reading them; the process's metrics go
+back as deltas and are merged into the main registry.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Set
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.monitoring import MetricsDelta, metrics_registry
+from app.pipeline.ingest_manager import ChannelConfig, ingest_manager
+from app.pipeline.model_loader import model_loader
+from app.pipeline.recognition import FrameInput, FrameRecognition, recognition_pipeline
+from app.pipeline.shm import InferenceEntryPoints, SlotHandle
+
+# Tracks of this process whose vote settled in the main process; dropped when the tracker closes them.
+settled_tracks: Set[str] = set()
+
+
+def is_settled(track_id: str, min_confidence: float) -> bool:
+    # The main process checks OCR_MIN_CONFIDENCE before reporting a track.
+    return track_id in settled_tracks
+
+
+def forget_tracks(track_ids: List[str]) -> None:
+    settled_tracks.difference_update(track_ids)
+
+
+def setup_process() -> None:
+    settings = get_settings()
+    configure_logging(level=settings.log_level, json_format=settings.log_format == "json")
+    recognition_pipeline.ocr_scheduler.settled = is_settled
+    recognition_pipeline.track_close_hooks.append(forget_tracks)
+    model_loader.start()
+    model_loader.wait()
+
+
+def recognize_shared_frame(handle: SlotHandle, image: np.ndarray) -> FrameRecognition:
+    # The view is released when this returns; crops kept by the crop store are copies.
+    frame = FrameInput(frame_id=handle.frame_id, image=image, channel_id=handle.channel_id)
+    return recognition_pipeline.process_batch([frame])[0]
+
+
+def configure_channel(config: ChannelConfig) -> None:
+    # The manager is never started here, so this only registers the channel's ROI and direction.
+    ingest_manager.register_channel(config)
+
+
+def release_channel(channel_id: str) -> None:
+    # The channel_removed_hooks drop the channel's trackers and close its tracks.
+    ingest_manager.remove_channel(channel_id)
+
+
+def mark_settled(track_id: str) -> None:
+    settled_tracks.add(track_id)
+
+
+def report_metrics() -> Optional[MetricsDelta]:
+    return metrics_registry.take_delta()
+
+
+ingest_manager.inference = InferenceEntryPoints(
+    handler=recognize_shared_frame,
+    setup=setup_process,
+    channel_configured=configure_channel,
+    channel_removed=release_channel,
+    track_settled=mark_settled,
+    report=report_metrics,
+)
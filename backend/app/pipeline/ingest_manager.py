@@ -1,9 +1,28 @@
 from __future__ import annotations
 
+import functools
+import multiprocessing
+import threading
+import time
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.monitoring import MetricsDelta, metrics_registry
+from app.pipeline.capture import CapturedFrame, CaptureWorker, DecodeMode, FrameRingBuffer, FrameSource, open_av_source
+from app.pipeline.motion import MotionTrigger
+from app.pipeline.roi import RoiRegistry, roi_registry
+from app.pipeline.scheduler import FpsScheduler, SchedulerPolicy
+from app.pipeline.shm import (
+    InferenceEntryPoints,
+    SharedFrameBridge,
+    SharedFramePool,
+    SlotHandle,
+    StaleSlotError,
+    WorkerMessage,
+)
 
 
 class DecoderPriority(str, Enum):
@@ -32,6 +51,8 @@ class ChannelConfig:
     direction: ChannelDirection = ChannelDirection.any
     roi: Optional[dict] = None
     description: Optional[str] = None
+    priority: int = 1
+    decode_mode: DecodeMode = DecodeMode.auto
 
 
 @dataclass
@@ -40,6 +61,7 @@ class IngestStatus:
     name: str
     state: str
     target_fps: int
+    priority: int
     reconnect_seconds: int
     decoder_priority: List[str]
     last_connected_at: Optional[datetime] = None
@@ -54,16 +76,61 @@ class IngestStatus:
 
 
 class IngestManager:
-    """Tracks ingest channel configurations and runtime state.
+    """Tracks ingest channel configurations, runtime state and capture workers.
+
+    Every registered channel owns a bounded :class:`FrameRingBuffer` fed by a
+    :class:`CaptureWorker`. Workers are only spawned once :meth:`start` has been
+    called, so importing the module never opens camera connections.
 
-    The actual capture/decoder threads are intentionally left to later steps; this manager
-    centralizes configuration, reconnection policy and monitoring endpoints.
+    With the shared-memory transport and ``inference_workers > 0``, :meth:`start`
+    also spawns the inference processes (``inference`` entry points) behind a
+    :class:`SharedFrameBridge`; their results are read with
+    :meth:`drain_results`. Otherwise consumers use :meth:`drain_frames`. Each
+    process gets the configuration of its channels (ROI, direction), registers
+    it in its own manager and hears about tracks that settled here
+    (:meth:`track_settled`); the metrics it reports are merged into
+    :data:`metrics_registry`.
     """
 
-    def __init__(self, default_target_fps: int = 12, default_reconnect_seconds: int = 3):
+    def __init__(
+        self,
+        default_target_fps: int = 12,
+        default_reconnect_seconds: int = 3,
+        buffer_size: int = 4,
+        source: Optional[FrameSource] = None,
+        scheduler: Optional[FpsScheduler] = None,
+        motion_trigger: Optional[MotionTrigger] = None,
+        shm_slots: int = 0,
+        shm_slot_bytes: int = 1920 * 1080 * 3,
+        shm_lease_seconds: float = 5.0,
+        inference_workers: int = 0,
+        rois: Optional[RoiRegistry] = None,
+        worker_join_seconds: float = 5.0,
+    ):
         self._channels: Dict[str, IngestStatus] = {}
+        self._configs: Dict[str, ChannelConfig] = {}
+        self._buffers: Dict[str, FrameRingBuffer] = {}
+        self._workers: Dict[str, CaptureWorker] = {}
+        self._lock = threading.Lock()
+        self._running = False
         self.default_target_fps = default_target_fps
         self.default_reconnect_seconds = default_reconnect_seconds
+        self.buffer_size = buffer_size
+        self.source = source or open_av_source
+        self.scheduler = scheduler or FpsScheduler()
+        self.motion_trigger = motion_trigger or MotionTrigger(enabled=False)
+        self.rois = rois or RoiRegistry()
+        self.shm_slots = shm_slots
+        self.shm_slot_bytes = shm_slot_bytes
+        self.shm_lease_seconds = shm_lease_seconds
+        self.inference_workers = inference_workers
+        # Set by app.pipeline.inference_worker; spawned processes need top-level callables.
+        self.inference: Optional[InferenceEntryPoints] = None
+        self.transport: Optional[SharedFramePool] = None
+        self.bridge: Optional[SharedFrameBridge] = None
+        self.worker_join_seconds = worker_join_seconds
+        # Called with the id of a removed channel, e.g. to drop its tracker and per-track recognition state.
+        self.channel_removed_hooks: List[Callable[[str], None]] = []
 
     def register_channel(self, config: ChannelConfig) -> IngestStatus:
         status = IngestStatus(
@@ -71,17 +138,221 @@ class IngestManager:
             name=config.name,
             state="configured",
             target_fps=config.target_fps or self.default_target_fps,
+            priority=config.priority,
             reconnect_seconds=config.reconnect_seconds or self.default_reconnect_seconds,
             decoder_priority=[p.value for p in config.decoder_priority],
         )
-        self._channels[config.channel_id] = status
+        with self._lock:
+            stopped = self._stop_worker(config.channel_id)
+            self._channels[config.channel_id] = status
+            self._configs[config.channel_id] = config
+            replaced = self._buffers.get(config.channel_id)
+            self._buffers[config.channel_id] = FrameRingBuffer(self.buffer_size)
+            self.scheduler.register(config.channel_id, status.target_fps, config.priority)
+            self.motion_trigger.register(config.channel_id, config.roi)
+            self.rois.register(config.channel_id, config.roi)
+            if self.bridge:
+                # Queued ahead of the new worker's frames.
+                self.bridge.configure_channel(config.channel_id, config)
+            if self._running:
+                self._start_worker(config.channel_id)
+        self._join_workers([stopped])
+        # After the join, so a frame the old worker pushed while stopping is released too.
+        self._discard_buffer(replaced)
         return status
 
+    def direction(self, channel_id: str) -> ChannelDirection:
+        """Configured direction of travel for ``channel_id`` (``any`` for unknown channels)."""
+
+        config = self._configs.get(channel_id)
+        return config.direction if config else ChannelDirection.any
+
     def remove_channel(self, channel_id: str) -> None:
-        self._channels.pop(channel_id, None)
+        with self._lock:
+            stopped = self._stop_worker(channel_id)
+            self._channels.pop(channel_id, None)
+            self._configs.pop(channel_id, None)
+            self.scheduler.remove(channel_id)
+            self.motion_trigger.remove(channel_id)
+            self.rois.remove(channel_id)
+            removed = self._buffers.pop(channel_id, None)
+        self._join_workers([stopped])
+        self._discard_buffer(removed)
+        bridge = self.bridge
+        if bridge:
+            bridge.remove_channel(channel_id)
+        for hook in self.channel_removed_hooks:
+            hook(channel_id)
+
+    def start(self) -> None:
+        with self._lock:
+            self._running = True
+            if self.shm_slots > 0 and self.transport is None:
+                # Spawned, not forked: the API process already runs capture and server threads.
+                context = multiprocessing.get_context("spawn")
+                self.transport = SharedFramePool(self.shm_slots, self.shm_slot_bytes, lock=context.Lock())
+                if self.inference_workers > 0 and self.inference is not None:
+                    self.bridge = SharedFrameBridge(
+                        self.transport,
+                        self._drain_buffers,
+                        lease_seconds=self.shm_lease_seconds,
+                        context=context,
+                        join_seconds=self.worker_join_seconds,
+                    )
+                    self.bridge.spawn_workers(self.inference, self.inference_workers)
+                    for channel_id, config in self._configs.items():
+                        self.bridge.configure_channel(channel_id, config)
+                    self.bridge.start()
+            for channel_id in self._configs:
+                if channel_id not in self._workers:
+                    self._start_worker(channel_id)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._running = False
+            stopped = [self._stop_worker(channel_id) for channel_id in list(self._workers)]
+        # Capture workers and inference processes must be gone before the shared-memory pool is closed.
+        self._join_workers(stopped)
+        with self._lock:
+            if self.bridge:
+                self.bridge.stop()
+                self.bridge = None
+            if self.transport:
+                for buffer in self._buffers.values():
+                    buffer.clear()
+                self.transport.close()
+                self.transport = None
+
+    def _start_worker(self, channel_id: str) -> None:
+        status = self._channels[channel_id]
+        worker = CaptureWorker(
+            self._configs[channel_id],
+            self._buffers[channel_id],
+            source=self.source,
+            reconnect_seconds=status.reconnect_seconds,
+            on_connected=self.mark_connected,
+            on_error=self.mark_error,
+            gate=self._admit,
+            transport=self.transport,
+        )
+        self._workers[channel_id] = worker
+        status.state = "connecting"
+        worker.start()
+
+    def _stop_worker(self, channel_id: str) -> Optional[CaptureWorker]:
+        """Signal the channel's worker to stop; the caller joins it after releasing the lock."""
+
+        worker = self._workers.pop(channel_id, None)
+        if worker:
+            worker.stop()
+        status = self._channels.get(channel_id)
+        if status:
+            status.state = "configured"
+        return worker
+
+    def _discard_buffer(self, buffer: Optional[FrameRingBuffer]) -> None:
+        """Empty a buffer that is being replaced or dropped, returning its frames' slots to the pool."""
+
+        if buffer is None:
+            return
+        frames = buffer.clear()
+        if self.transport:
+            for frame in frames:
+                self.transport.release(frame.image)
+
+    def _join_workers(self, workers: List[Optional[CaptureWorker]]) -> None:
+        deadline = time.monotonic() + self.worker_join_seconds
+        for worker in workers:
+            if worker is None or worker is threading.current_thread():
+                continue
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                # Stuck in a source read; the daemon thread exits once the read returns or times out.
+                metrics_registry.inc("ingest_worker_join_timeouts", labels={"channel": worker.config.channel_id})
+
+    def _admit(self, channel_id: str, image: object, now: float) -> bool:
+        if not self.scheduler.decimate(channel_id, now):
+            return False
+        # Static frames are gated before they can consume the node budget.
+        if not self.motion_trigger.check(channel_id, image, now):
+            return False
+        return self.scheduler.acquire(channel_id, now)
+
+    def next_frame(self, channel_id: str, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
+        """Dequeue the oldest buffered frame of a channel, if any."""
+
+        buffer = self._buffers.get(channel_id)
+        if buffer is None:
+            return None
+        return buffer.pop(timeout)
+
+    def _drain_buffers(self) -> List[CapturedFrame]:
+        frames = []
+        for buffer in list(self._buffers.values()):
+            frame = buffer.pop(timeout=0)
+            if frame is not None:
+                frames.append(frame)
+        return frames
+
+    def drain_frames(self) -> List[CapturedFrame]:
+        """One frame per channel for in-process recognition.
+
+        Frames in the shared-memory pool are copied out and their slots released,
+        since the frame outlives the call by several executor stages.
+        """
+
+        frames = []
+        for frame in self._drain_buffers():
+            transport = self.transport
+            if isinstance(frame.image, SlotHandle) and transport is not None:
+                try:
+                    image = transport.view(frame.image).copy()
+                except StaleSlotError:
+                    continue
+                finally:
+                    transport.release(frame.image)
+                frame = CapturedFrame(frame.channel_id, frame.frame_id, image, frame.captured_at)
+            frames.append(frame)
+        return frames
+
+    def drain_results(self, limit: int = 64) -> list:
+        """Results sent back by the inference processes (empty without them); their metrics are merged here."""
+
+        bridge = self.bridge
+        if not bridge:
+            return []
+        results = []
+        for item in bridge.drain_results(limit):
+            if isinstance(item, MetricsDelta):
+                metrics_registry.merge(item)
+            else:
+                results.append(item)
+        return results
+
+    def track_settled(self, channel_id: Optional[str], track_id: str) -> None:
+        """Tell the inference process of ``channel_id`` to stop reading ``track_id`` (no-op without one)."""
+
+        bridge = self.bridge
+        if bridge and channel_id:
+            bridge.send(channel_id, WorkerMessage("track_settled", (track_id,)))
+
+    def transport_stats(self) -> Optional[dict]:
+        if self.transport is None:
+            return None
+        return self.bridge.stats() if self.bridge else {"workers": 0, "pool": self.transport.stats()}
 
     def snapshot(self) -> List[dict]:
-        return [status.as_dict() for status in self._channels.values()]
+        payload = []
+        for channel_id, status in list(self._channels.items()):
+            item = status.as_dict()
+            buffer = self._buffers.get(channel_id)
+            item["buffer"] = buffer.stats() if buffer else None
+            item["scheduler"] = self.scheduler.channel_stats(channel_id)
+            item["motion"] = self.motion_trigger.channel_stats(channel_id)
+            worker = self._workers.get(channel_id)
+            item["decode"] = worker.decode.as_dict() if worker else None
+            payload.append(item)
+        return payload
 
     def mark_connected(self, channel_id: str) -> None:
         status = self._channels.get(channel_id)
@@ -103,6 +374,36 @@ class IngestManager:
     def channels(self) -> Dict[str, IngestStatus]:
         return self._channels
 
+    @property
+    def buffers(self) -> Dict[str, FrameRingBuffer]:
+        return self._buffers
+
+
+_settings = get_settings()
 
-# Singleton manager for API exposure; actual workers will be attached in later steps.
-ingest_manager = IngestManager()
+# Singleton manager for API exposure; workers are started from the application startup hook.
+ingest_manager = IngestManager(
+    default_target_fps=_settings.ingest_default_target_fps,
+    default_reconnect_seconds=_settings.ingest_reconnect_seconds,
+    buffer_size=_settings.ingest_frame_buffer_size,
+    source=functools.partial(open_av_source, decoder_threads=_settings.ingest_decoder_threads),
+    scheduler=FpsScheduler(
+        node_budget_fps=_settings.ingest_node_fps_budget,
+        policy=SchedulerPolicy(_settings.ingest_scheduler_policy),
+    ),
+    motion_trigger=MotionTrigger(
+        enabled=_settings.motion_enabled,
+        downscale_width=_settings.motion_downscale_width,
+        pixel_threshold=_settings.motion_pixel_threshold,
+        min_area=_settings.motion_min_area,
+        learning_rate=_settings.motion_learning_rate,
+        hold_seconds=_settings.motion_hold_seconds,
+        metrics=metrics_registry,
+    ),
+    shm_slots=_settings.ingest_shm_slots,
+    shm_slot_bytes=_settings.ingest_shm_slot_bytes,
+    shm_lease_seconds=_settings.ingest_shm_lease_seconds,
+    inference_workers=_settings.ingest_shm_inference_workers,
+    # Shared with the recognition pipeline, which crops and filters by the compiled ROI.
+    rois=roi_registry,
+)
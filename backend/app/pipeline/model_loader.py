@@ -0,0 +1,153 @@
+"""Background model loading and warm-up.
+
+Importing :mod:`app.pipeline.recognition` only builds lightweight backend
+objects; no weights are read. :class:`ModelLoader` loads every registered model
+in a background thread after API startup, then runs warm-up inferences on
+synthetic frames so the first real frame does not pay for graph optimization,
+kernel selection or allocator growth. ``/ready`` reports the per-model state.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.monitoring import MetricsRegistry, metrics_registry
+from app.pipeline.recognition import RecognitionPipeline, recognition_pipeline
+
+
+class ModelState(str, Enum):
+    pending = "pending"
+    loading = "loading"
+    warming = "warming"
+    ready = "ready"
+    failed = "failed"
+
+
+@dataclass
+class ModelHandle:
+    name: str
+    load: Callable[[], None]
+    warmup: Callable[[], None]
+    state: ModelState = ModelState.pending
+    error: Optional[str] = None
+    load_ms: float = 0.0
+    warmup_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state.value,
+            "error": self.error,
+            "load_ms": round(self.load_ms, 1),
+            "warmup_ms": round(self.warmup_ms, 1),
+        }
+
+
+class ModelLoader:
+    """Loads and warms registered models one after another in a daemon thread."""
+
+    def __init__(self, *, metrics: Optional[MetricsRegistry] = None) -> None:
+        self.metrics = metrics
+        self._models: Dict[str, ModelHandle] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, load: Callable[[], None], warmup: Callable[[], None]) -> None:
+        with self._lock:
+            self._models[name] = ModelHandle(name=name, load=load, warmup=warmup)
+
+    def start(self) -> None:
+        """Start loading in the background; returns immediately."""
+
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="model-loader", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        return all(handle.state == ModelState.ready for handle in self._models.values())
+
+    @property
+    def failed(self) -> bool:
+        return any(handle.state == ModelState.failed for handle in self._models.values())
+
+    def _run(self) -> None:
+        for handle in list(self._models.values()):
+            try:
+                handle.state = ModelState.loading
+                started = time.perf_counter()
+                handle.load()
+                handle.load_ms = (time.perf_counter() - started) * 1000
+                handle.state = ModelState.warming
+                started = time.perf_counter()
+                handle.warmup()
+                handle.warmup_ms = (time.perf_counter() - started) * 1000
+                handle.state = ModelState.ready
+            except Exception as exc:  # noqa: BLE001 - the failure is reported through /ready
+                handle.state = ModelState.failed
+                handle.error = str(exc)
+            if self.metrics:
+                labels = {"model": handle.name}
+                self.metrics.set_gauge("model_ready", 1.0 if handle.state == ModelState.ready else 0.0, labels=labels)
+                self.metrics.set_gauge("model_load_ms", handle.load_ms, labels=labels)
+                self.metrics.set_gauge("model_warmup_ms", handle.warmup_ms, labels=labels)
+
+    def describe(self) -> dict:
+        return {name: handle.as_dict() for name, handle in self._models.items()}
+
+
+def register_pipeline_models(
+    loader: ModelLoader,
+    pipeline: RecognitionPipeline,
+    *,
+    iterations: int = 2,
+    batch_size: int = 1,
+    frame_width: int = 1280,
+    frame_height: int = 720,
+) -> None:
+    """Register the detector and OCR backends of ``pipeline`` with warm-up at full batch shapes."""
+
+    rng = np.random.default_rng(0)
+    batch_size = max(1, batch_size)
+    ocr = pipeline.ocr_settings
+
+    def warm_detector() -> None:
+        frames = [rng.integers(0, 256, (frame_height, frame_width, 3), dtype=np.uint8) for _ in range(batch_size)]
+        for _ in range(iterations):
+            pipeline.detector.detect_batch(frames)
+
+    def warm_ocr() -> None:
+        if not pipeline.ocr.enabled:
+            return
+        crops = rng.integers(0, 256, (ocr.batch_size, ocr.input_height, ocr.input_width, 3), dtype=np.uint8)
+        for _ in range(iterations):
+            pipeline.ocr.recognize_batch(crops)
+
+    loader.register("detector", lambda: pipeline.detector.load(), warm_detector)
+    loader.register("ocr", lambda: pipeline.ocr.load(), warm_ocr)
+
+
+_settings = get_settings()
+
+model_loader = ModelLoader(metrics=metrics_registry)
+register_pipeline_models(
+    model_loader,
+    recognition_pipeline,
+    iterations=_settings.warmup_iterations,
+    batch_size=_settings.detector_batch_size,
+    frame_width=_settings.warmup_frame_width,
+    frame_height=_settings.warmup_frame_height,
+)
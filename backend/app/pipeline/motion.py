@@ -0,0 +1,136 @@
+"""Motion-trigger gate that keeps static frames away from the detector.
+
+Frames are reduced to a small grayscale thumbnail by striding, clipped to the
+channel ROI and compared against a running-average background. Only frames
+where enough ROI pixels changed are passed on to inference.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.monitoring import MetricsRegistry
+from app.pipeline.roi import rasterize_polygon, roi_points
+
+_BGR_WEIGHTS = np.array([0.114, 0.587, 0.299], dtype=np.float32)
+
+
+@dataclass
+class MotionState:
+    roi: Optional[np.ndarray] = None
+    background: Optional[np.ndarray] = None
+    mask: Optional[np.ndarray] = None
+    mask_area: int = 0
+    stride: int = 1
+    shape: Tuple[int, ...] = field(default_factory=tuple)
+    last_motion_at: float = 0.0
+    passed: int = 0
+    gated: int = 0
+    last_score: float = 0.0
+
+    def as_dict(self) -> dict:
+        total = self.passed + self.gated
+        return {
+            "passed": self.passed,
+            "gated": self.gated,
+            "pass_ratio": round(self.passed / total, 4) if total else 0.0,
+            "last_score": round(self.last_score, 4),
+        }
+
+
+class MotionTrigger:
+    """Per-channel frame-difference gate against a running-average background."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        downscale_width: int = 160,
+        pixel_threshold: float = 25.0,
+        min_area: float = 0.01,
+        learning_rate: float = 0.05,
+        hold_seconds: float = 1.0,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.enabled = enabled
+        self.downscale_width = downscale_width
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self.learning_rate = learning_rate
+        self.hold_seconds = hold_seconds
+        self.metrics = metrics
+        self._states: Dict[str, MotionState] = {}
+        self._lock = threading.Lock()
+
+    def register(self, channel_id: str, roi: Optional[dict] = None) -> None:
+        with self._lock:
+            self._states[channel_id] = MotionState(roi=roi_points(roi))
+
+    def remove(self, channel_id: str) -> None:
+        with self._lock:
+            self._states.pop(channel_id, None)
+
+    def _thumbnail(self, state: MotionState, image: np.ndarray) -> np.ndarray:
+        if state.shape != image.shape:
+            state.shape = image.shape
+            state.stride = max(1, image.shape[1] // self.downscale_width)
+            state.background = None
+            state.mask = None
+        small = image[:: state.stride, :: state.stride]
+        if small.ndim == 3:
+            return small[..., :3] @ _BGR_WEIGHTS
+        return small.astype(np.float32)
+
+    def _roi_mask(self, state: MotionState, gray: np.ndarray) -> Optional[np.ndarray]:
+        if state.roi is None:
+            return None
+        if state.mask is None:
+            state.mask = rasterize_polygon(state.roi, gray.shape[0], gray.shape[1], state.shape[:2])
+            state.mask_area = int(state.mask.sum())
+        return state.mask
+
+    def check(self, channel_id: str, image: Any, now: Optional[float] = None) -> bool:
+        """Return ``True`` if the frame shows motion and should reach the detector."""
+
+        state = self._states.get(channel_id)
+        if not self.enabled or state is None or not isinstance(image, np.ndarray):
+            return True
+        now = time.monotonic() if now is None else now
+        gray = self._thumbnail(state, image)
+        if state.background is None:
+            state.background = gray.copy()
+            return self._record(channel_id, state, True, 1.0)
+
+        changed = np.abs(gray - state.background) > self.pixel_threshold
+        mask = self._roi_mask(state, gray)
+        if mask is not None:
+            score = float(np.count_nonzero(changed & mask)) / max(state.mask_area, 1)
+        else:
+            score = float(np.count_nonzero(changed)) / changed.size
+        state.background += self.learning_rate * (gray - state.background)
+
+        if score >= self.min_area:
+            state.last_motion_at = now
+        moving = now - state.last_motion_at <= self.hold_seconds
+        return self._record(channel_id, state, moving, score)
+
+    def _record(self, channel_id: str, state: MotionState, moving: bool, score: float) -> bool:
+        state.last_score = score
+        if moving:
+            state.passed += 1
+        else:
+            state.gated += 1
+        if self.metrics:
+            labels = {"channel": channel_id}
+            self.metrics.inc("motion_frames", labels={**labels, "result": "passed" if moving else "gated"})
+            self.metrics.set_gauge("motion_pass_ratio", state.passed / (state.passed + state.gated), labels=labels)
+        return moving
+
+    def channel_stats(self, channel_id: str) -> Optional[dict]:
+        state = self._states.get(channel_id)
+        return state.as_dict() if state else None
@@ -0,0 +1,122 @@
+"""Separate resolutions for detection and OCR.
+
+Frames larger than ``max_side`` are downscaled once into a small contiguous
+copy for the detector, while :class:`DetectionView` keeps a reference to the
+original buffer. Detector boxes are mapped back to original pixels, so tracks
+and plate crops live in full-resolution coordinates and crops are cut from the
+original frame as views. Detector cost follows the pixel count of its input;
+OCR keeps every original pixel. With a :class:`FrameArena` the downscaled copy
+lives in a pooled buffer that the caller releases once the detector returns.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.monitoring import MetricsRegistry
+from app.pipeline.arena import ArenaBuffer, FrameArena
+from app.pipeline.geometry import crop_view
+
+
+@dataclass(slots=True)
+class DetectionView:
+    """Detector input plus the original frame it was derived from.
+
+    ``scale`` is the number of original pixels per detector pixel (``1.0`` when
+    the detector sees the original frame).
+    """
+
+    image: np.ndarray
+    original: np.ndarray
+    scale: float = 1.0
+    buffer: Optional[ArenaBuffer] = None
+
+    def to_original(self, boxes: np.ndarray) -> np.ndarray:
+        """Map detector-space ``(N, 4)`` boxes to original pixels, in place."""
+
+        if self.scale != 1.0 and len(boxes):
+            boxes *= np.float32(self.scale)
+        return boxes
+
+    def crop(self, box: Sequence[float]) -> Optional[np.ndarray]:
+        """Zero-copy crop of the original frame; ``box`` is in original pixels."""
+
+        return crop_view(self.original, box)
+
+    def release(self) -> None:
+        """Return the pooled detector copy; ``image`` must not be used afterwards."""
+
+        if self.buffer is not None:
+            self.buffer.release()
+            self.buffer = None
+
+
+class FrameDownscaler:
+    """Nearest-neighbour downscaling with gather indices cached per frame shape."""
+
+    def __init__(
+        self,
+        max_side: int = 0,
+        *,
+        arena: Optional[FrameArena] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.max_side = max(0, max_side)
+        self.arena = arena
+        self.metrics = metrics
+        self._indices: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray, float]] = {}
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.downscaled = 0
+        self.source_pixels = 0
+        self.detector_pixels = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_side > 0
+
+    def _plan(self, height: int, width: int) -> Tuple[np.ndarray, np.ndarray, float]:
+        plan = self._indices.get((height, width))
+        if plan is None:
+            scale = max(height, width) / self.max_side
+            new_h, new_w = max(1, int(round(height / scale))), max(1, int(round(width / scale)))
+            rows = np.minimum((np.arange(new_h) * scale).astype(np.intp), height - 1)
+            cols = np.minimum((np.arange(new_w) * scale).astype(np.intp), width - 1)
+            with self._lock:
+                plan = self._indices.setdefault((height, width), (rows, cols, scale))
+        return plan
+
+    def prepare(self, image: np.ndarray) -> DetectionView:
+        height, width = image.shape[:2]
+        self.frames += 1
+        self.source_pixels += height * width
+        if not self.enabled or max(height, width) <= self.max_side:
+            self.detector_pixels += height * width
+            return DetectionView(image=image, original=image)
+        rows, cols, scale = self._plan(height, width)
+        self.downscaled += 1
+        self.detector_pixels += len(rows) * len(cols)
+        if self.metrics:
+            self.metrics.inc("detector_frames_downscaled")
+        if self.arena is None:
+            return DetectionView(image=image.take(rows, axis=0).take(cols, axis=1), original=image, scale=scale)
+        channels = image.shape[2:]
+        strip = self.arena.acquire((len(rows), width, *channels), image.dtype, owner="downscale")
+        buffer = self.arena.acquire((len(rows), len(cols), *channels), image.dtype, owner="detector_input")
+        np.take(image, rows, axis=0, out=strip.array, mode="clip")
+        np.take(strip.array, cols, axis=1, out=buffer.array, mode="clip")
+        strip.release()
+        return DetectionView(image=buffer.array, original=image, scale=scale, buffer=buffer)
+
+    def describe(self) -> dict:
+        return {
+            "max_side": self.max_side,
+            "frames": self.frames,
+            "downscaled": self.downscaled,
+            "pixel_ratio": round(self.detector_pixels / self.source_pixels, 4) if self.source_pixels else 1.0,
+            "cached_shapes": [list(shape) for shape in self._indices],
+        }
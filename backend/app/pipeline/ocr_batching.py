@@ -0,0 +1,219 @@
+"""Batched OCR execution over plate crops from many tracks.
+
+Crops submitted by any channel are resized (keeping the aspect ratio) and
+zero-padded into one fixed-shape ``(N, H, W, 3)`` tensor, so the OCR model runs
+a single inference per batch. The target batch size follows the observed crop
+arrival rate: a batch is dispatched as soon as the number of crops expected
+within ``max_wait_ms`` has arrived, or when the oldest crop hits the deadline.
+Batch tensors are taken from a :class:`FrameArena` when one is configured.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Deque, List, Optional, Sequence
+
+import numpy as np
+
+from app.monitoring import MetricsRegistry
+from app.pipeline.arena import FrameArena
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from app.pipeline.recognition import OcrCandidate
+
+RecognizeFn = Callable[[np.ndarray], List["OcrCandidate"]]
+
+
+def pad_crops(
+    crops: Sequence[np.ndarray], height: int, width: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Nearest-neighbour resize each crop into ``height x width``, padding bottom/right with zeros.
+
+    ``out`` is an optional ``(>= N, height, width, 3)`` uint8 buffer to fill instead of allocating.
+    """
+
+    if out is None:
+        batch = np.zeros((len(crops), height, width, 3), dtype=np.uint8)
+    else:
+        batch = out[: len(crops)]
+        batch.fill(0)
+    for idx, crop in enumerate(crops):
+        crop_h, crop_w = crop.shape[:2]
+        scale = min(height / crop_h, width / crop_w)
+        new_h, new_w = max(1, int(crop_h * scale)), max(1, int(crop_w * scale))
+        rows = np.minimum((np.arange(new_h) / scale).astype(np.intp), crop_h - 1)
+        cols = np.minimum((np.arange(new_w) / scale).astype(np.intp), crop_w - 1)
+        if crop.ndim == 2:
+            batch[idx, :new_h, :new_w] = crop[rows[:, None], cols[None, :], None]
+        else:
+            batch[idx, :new_h, :new_w] = crop[rows[:, None], cols[None, :], :3]
+    return batch
+
+
+@dataclass
+class _PendingCrop:
+    track_id: str
+    crop: np.ndarray
+    future: Future
+    enqueued_at: float
+
+
+class OcrBatcher:
+    """Collects plate crops from all tracks into adaptive fixed-shape OCR batches."""
+
+    def __init__(
+        self,
+        recognize: RecognizeFn,
+        *,
+        input_height: int = 48,
+        input_width: int = 192,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 15.0,
+        rate_smoothing: float = 0.2,
+        arena: Optional[FrameArena] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.recognize = recognize
+        self.arena = arena
+        self.input_height = input_height
+        self.input_width = input_width
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.rate_smoothing = rate_smoothing
+        self.metrics = metrics
+        self._pending: Deque[_PendingCrop] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._last_arrival: Optional[float] = None
+        self._interval = self.max_wait
+        self.batch_sizes: Counter = Counter()
+        self.batches = 0
+        self.crops = 0
+        self.queue_delay_total = 0.0
+        self.inference_total = 0.0
+
+    @property
+    def target_batch_size(self) -> int:
+        """Crops expected to arrive within ``max_wait`` at the current arrival rate."""
+
+        expected = self.max_wait / max(self._interval, 1e-6)
+        return int(min(self.max_batch_size, max(1.0, expected)))
+
+    def submit(self, track_id: str, crop: np.ndarray) -> "Future[OcrCandidate]":
+        future: Future = Future()
+        now = time.monotonic()
+        with self._cond:
+            if self._thread is None:
+                self._start()
+            if self._last_arrival is not None:
+                gap = now - self._last_arrival
+                self._interval += self.rate_smoothing * (gap - self._interval)
+            self._last_arrival = now
+            self._pending.append(_PendingCrop(track_id=track_id, crop=crop, future=future, enqueued_at=now))
+            self._cond.notify()
+        return future
+
+    def _start(self) -> None:
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="ocr-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        # Items queued after the last batch would otherwise leave their callers waiting forever.
+        with self._cond:
+            pending, self._pending = list(self._pending), deque()
+        for item in pending:
+            item.future.set_exception(RuntimeError("batcher stopped"))
+
+    def _collect(self) -> List[_PendingCrop]:
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return []
+            deadline = self._pending[0].enqueued_at + self.max_wait
+            while len(self._pending) < self.target_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopped:
+                    break
+                self._cond.wait(remaining)
+            size = min(len(self._pending), self.max_batch_size)
+            return [self._pending.popleft() for _ in range(size)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            started = time.monotonic()
+            # One pooled tensor of the maximum batch shape; smaller batches use a leading slice of it.
+            buffer = None
+            if self.arena is not None:
+                shape = (self.max_batch_size, self.input_height, self.input_width, 3)
+                buffer = self.arena.acquire(shape, np.uint8, owner="ocr_batch")
+            try:
+                tensor = pad_crops(
+                    [item.crop for item in batch],
+                    self.input_height,
+                    self.input_width,
+                    out=buffer.array if buffer is not None else None,
+                )
+                candidates = self.recognize(tensor)
+            except Exception as exc:  # noqa: BLE001 - failures are delivered to every waiting caller
+                for item in batch:
+                    item.future.set_exception(exc)
+                continue
+            finally:
+                if buffer is not None:
+                    buffer.release()
+            self._record(batch, started, time.monotonic() - started)
+            for item, candidate in zip(batch, candidates):
+                candidate.track_id = item.track_id
+                item.future.set_result(candidate)
+            if len(candidates) != len(batch):
+                # A short (or long) result would leave crops unanswered and their callers blocked.
+                error = RuntimeError(f"OCR backend returned {len(candidates)} results for {len(batch)} crops")
+                for item in batch[len(candidates):]:
+                    item.future.set_exception(error)
+                if self.metrics:
+                    self.metrics.inc("ocr_batch_mismatch")
+
+    def _record(self, batch: List[_PendingCrop], started: float, inference: float) -> None:
+        size = len(batch)
+        self.batches += 1
+        self.crops += size
+        self.batch_sizes[size] += 1
+        self.inference_total += inference
+        for item in batch:
+            self.queue_delay_total += started - item.enqueued_at
+            if self.metrics:
+                self.metrics.observe("ocr_batch_queue_ms", (started - item.enqueued_at) * 1000)
+        if self.metrics:
+            self.metrics.observe("ocr_batch_size", size)
+            self.metrics.observe("ocr_inference_ms", inference * 1000)
+
+    def describe(self) -> dict:
+        return {
+            "input_shape": [self.input_height, self.input_width, 3],
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "target_batch_size": self.target_batch_size,
+            "batches": self.batches,
+            "crops": self.crops,
+            "avg_batch_size": round(self.crops / self.batches, 2) if self.batches else 0.0,
+            "batch_size_distribution": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            "avg_queue_delay_ms": round(self.queue_delay_total / self.crops * 1000, 3) if self.crops else 0.0,
+            "avg_inference_ms": round(self.inference_total / self.batches * 1000, 3) if self.batches else 0.0,
+            "pending": len(self._pending),
+        }
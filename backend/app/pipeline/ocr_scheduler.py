@@ -0,0 +1,128 @@
+"""Track-aware OCR scheduling.
+
+OCR is the most expensive stage per plate, and consecutive crops of the same
+track are mostly redundant. :class:`OcrScheduler` keeps per-track state and only
+lets a crop through when it is better than everything OCR has already seen for
+that track. Once the track's plate vote has settled (``settled`` is wired to
+:meth:`app.pipeline.postprocess.Postprocessor.track_settled`, so the scheduler
+and the event use the same vote) the track is converged and gets no more OCR
+calls.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+from app.monitoring import MetricsRegistry
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from app.pipeline.recognition import OcrSettings
+
+
+def crop_quality(crop: np.ndarray, expected_aspect: float = 4.5, min_height: float = 24.0) -> float:
+    """Score a plate crop in ``0..1`` by sharpness, size and how frontal it looks.
+
+    - sharpness: variance of a 4-neighbour Laplacian on the grayscale crop;
+    - size: plate height relative to ``min_height`` pixels (saturates at 2x);
+    - angle: deviation of the crop aspect ratio from a frontal plate's aspect.
+    """
+
+    height, width = crop.shape[:2]
+    if height < 3 or width < 3:
+        return 0.0
+    gray = crop.mean(axis=2, dtype=np.float32) if crop.ndim == 3 else crop.astype(np.float32)
+    laplacian = (
+        gray[1:-1, :-2] + gray[1:-1, 2:] + gray[:-2, 1:-1] + gray[2:, 1:-1] - 4.0 * gray[1:-1, 1:-1]
+    )
+    variance = float(laplacian.var())
+    sharpness = variance / (variance + 100.0)
+    size = min(height / (2.0 * min_height), 1.0)
+    aspect = width / height
+    angle = min(aspect, expected_aspect) / max(aspect, expected_aspect)
+    return sharpness * size * angle
+
+
+@dataclass
+class TrackOcrState:
+    best_quality: float = 0.0
+    calls: int = 0
+    saved: int = 0
+    converged: bool = False
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "saved": self.saved,
+            "converged": self.converged,
+            "best_quality": round(self.best_quality, 4),
+        }
+
+
+class OcrScheduler:
+    """Decides per track whether a crop is worth an OCR call."""
+
+    def __init__(self, settings: "OcrSettings", *, metrics: Optional[MetricsRegistry] = None) -> None:
+        self.settings = settings
+        self.min_gain = settings.min_quality_gain
+        self.max_calls_per_track = settings.max_calls_per_track
+        self.metrics = metrics
+        # (track id, min confidence) -> whether the track's plate vote has settled; ``None`` never converges.
+        self.settled: Optional[Callable[[str, float], bool]] = None
+        self._tracks: Dict[str, TrackOcrState] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.saved = 0
+        self.closed_tracks = 0
+        self.closed_calls = 0
+
+    def should_run(self, track_id: str, quality: float) -> bool:
+        # Ask before taking the lock: the vote has its own lock.
+        settled = self.settled is not None and self.settled(track_id, self.settings.min_confidence)
+        with self._lock:
+            state = self._tracks.setdefault(track_id, TrackOcrState())
+            state.converged = state.converged or settled
+            run = (
+                not state.converged
+                and state.calls < self.max_calls_per_track
+                and (state.calls == 0 or quality > state.best_quality * (1.0 + self.min_gain))
+            )
+            if run:
+                state.calls += 1
+                state.best_quality = quality
+                self.calls += 1
+            else:
+                state.saved += 1
+                self.saved += 1
+        if self.metrics:
+            self.metrics.inc("ocr_calls" if run else "ocr_calls_saved")
+        return run
+
+    def close(self, track_ids: Iterable[str]) -> None:
+        with self._lock:
+            for track_id in track_ids:
+                state = self._tracks.pop(track_id, None)
+                if state is None:
+                    continue
+                self.closed_tracks += 1
+                self.closed_calls += state.calls
+                if self.metrics:
+                    self.metrics.observe("ocr_calls_per_track", state.calls)
+
+    def track_stats(self, track_id: str) -> Optional[dict]:
+        state = self._tracks.get(track_id)
+        return state.as_dict() if state else None
+
+    def describe(self) -> dict:
+        return {
+            "vote_frames": self.settings.vote_frames,
+            "min_confidence": self.settings.min_confidence,
+            "max_calls_per_track": self.max_calls_per_track,
+            "active_tracks": len(self._tracks),
+            "calls": self.calls,
+            "saved": self.saved,
+            "avg_calls_per_closed_track": round(self.closed_calls / self.closed_tracks, 2) if self.closed_tracks else 0.0,
+        }
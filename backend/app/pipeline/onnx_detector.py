@@ -0,0 +1,180 @@
+"""ONNX Runtime detector backend for YOLOv8/YOLOv11 exports.
+
+The model file is read once and shared by a small pool of inference sessions.
+Each session gets a fixed intra-op thread count so that ``pool_size`` concurrent
+inferences never ask for more threads than the node has cores; callers beyond
+the pool size wait for a free session instead of oversubscribing the CPU.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.monitoring import MetricsRegistry
+from app.pipeline.arena import FrameArena
+from app.pipeline.geometry import clip_boxes, nms
+from app.pipeline.recognition import DetectionArray, Detector, DetectorSettings, Device
+
+
+def letterbox(
+    image: np.ndarray, size: int, out: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """Nearest-neighbour resize into a ``size x size`` canvas keeping the aspect ratio.
+
+    ``out`` is an optional ``(size, size, 3)`` uint8 canvas to fill instead of allocating.
+    """
+
+    height, width = image.shape[:2]
+    scale = min(size / height, size / width)
+    new_h, new_w = max(1, int(round(height * scale))), max(1, int(round(width * scale)))
+    rows = np.minimum((np.arange(new_h) / scale).astype(np.intp), height - 1)
+    cols = np.minimum((np.arange(new_w) / scale).astype(np.intp), width - 1)
+    if out is None:
+        canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    else:
+        canvas = out
+        canvas.fill(114)
+    pad_y, pad_x = (size - new_h) // 2, (size - new_w) // 2
+    canvas[pad_y : pad_y + new_h, pad_x : pad_x + new_w] = image[rows[:, None], cols[None, :], :3]
+    return canvas, scale, (float(pad_x), float(pad_y))
+
+
+class OnnxDetector(Detector):
+    """YOLO detector running on ONNX Runtime with a bounded session pool."""
+
+    def __init__(
+        self,
+        settings: DetectorSettings,
+        *,
+        arena: Optional[FrameArena] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        if not settings.model_path:
+            raise ValueError("DetectorSettings.model_path is required for the ONNX backend")
+        self.settings = settings
+        self.arena = arena
+        self.metrics = metrics
+        self.pool_size = max(1, settings.session_pool_size)
+        self.intra_op_threads = settings.intra_op_threads or max(1, (os.cpu_count() or 1) // self.pool_size)
+        self.inter_op_threads = max(1, settings.inter_op_threads)
+        self._sessions: "queue.Queue[Any]" = queue.Queue()
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self._input_name = ""
+        self._fixed_batch: Optional[int] = None
+        self.inferences = 0
+        self.last_latency_ms = 0.0
+        self.total_latency_ms = 0.0
+
+    def _providers(self) -> List[str]:
+        if self.settings.device == Device.cuda:
+            return ["CUDAExecutionProvider", "CPUExecutionProvider"]
+        return ["CPUExecutionProvider"]
+
+    def load(self) -> None:
+        with self._load_lock:
+            if self._loaded:
+                return
+            import onnxruntime as ort
+
+            with open(self.settings.model_path, "rb") as handle:
+                model_bytes = handle.read()
+            for _ in range(self.pool_size):
+                options = ort.SessionOptions()
+                options.intra_op_num_threads = self.intra_op_threads
+                options.inter_op_num_threads = self.inter_op_threads
+                options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                self._sessions.put(ort.InferenceSession(model_bytes, sess_options=options, providers=self._providers()))
+            session = self._sessions.queue[0]
+            model_input = session.get_inputs()[0]
+            self._input_name = model_input.name
+            batch_dim = model_input.shape[0]
+            self._fixed_batch = batch_dim if isinstance(batch_dim, int) else None
+            self._loaded = True
+
+    @contextmanager
+    def _session(self) -> Iterator[Any]:
+        session = self._sessions.get()
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
+    def detect_batch(self, images: Sequence[np.ndarray]) -> List[DetectionArray]:
+        if not images:
+            return []
+        self.load()
+        size = self.settings.input_size
+        # Letterbox every frame straight into one batch canvas instead of stacking per-frame canvases.
+        if self.arena is not None:
+            buffer = self.arena.acquire((len(images), size, size, 3), np.uint8, owner="letterbox")
+            canvases = buffer.array
+        else:
+            buffer, canvases = None, np.empty((len(images), size, size, 3), dtype=np.uint8)
+        try:
+            prepared = [letterbox(image, size, out=canvas) for image, canvas in zip(images, canvases)]
+            # BGR uint8 HWC -> RGB float32 NCHW in one pass over the batch.
+            tensor = np.ascontiguousarray(canvases[..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+        finally:
+            if buffer is not None:
+                buffer.release()
+
+        chunk = self._fixed_batch or len(images)
+        outputs = []
+        with self._session() as session:
+            for offset in range(0, len(images), chunk):
+                started = time.perf_counter()
+                outputs.append(session.run(None, {self._input_name: tensor[offset : offset + chunk]})[0])
+                self._record_latency((time.perf_counter() - started) * 1000)
+
+        raw = np.concatenate(outputs, axis=0)
+        return [
+            self._decode(raw[idx], scale, pad, image.shape[:2])
+            for idx, ((_, scale, pad), image) in enumerate(zip(prepared, images))
+        ]
+
+    def _decode(
+        self, output: np.ndarray, scale: float, pad: Tuple[float, float], frame_shape: Tuple[int, int]
+    ) -> DetectionArray:
+        # YOLOv8/YOLOv11 heads emit (4 + classes, anchors): cx, cy, w, h followed by class scores.
+        predictions = output.T
+        scores = predictions[:, 4:].max(axis=1)
+        mask = scores >= self.settings.confidence_threshold
+        if not mask.any():
+            return DetectionArray.empty()
+        scores = np.ascontiguousarray(scores[mask], dtype=np.float32)
+        cx, cy, w, h = predictions[mask, :4].T
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1).astype(np.float32)
+        boxes[:, 0::2] -= pad[0]
+        boxes[:, 1::2] -= pad[1]
+        boxes /= scale
+        clip_boxes(boxes, (0.0, 0.0, float(frame_shape[1]), float(frame_shape[0])))
+        keep = nms(boxes, scores, self.settings.iou_threshold, self.settings.max_detections)
+        return DetectionArray(boxes[keep], scores[keep])
+
+    def _record_latency(self, latency_ms: float) -> None:
+        self.inferences += 1
+        self.last_latency_ms = latency_ms
+        self.total_latency_ms += latency_ms
+        if self.metrics:
+            self.metrics.observe("detector_inference_ms", latency_ms, labels={"model": self.settings.model.value})
+
+    def describe(self) -> dict:
+        return {
+            "backend": "onnxruntime",
+            "loaded": self._loaded,
+            "session_pool_size": self.pool_size,
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+            "inferences": self.inferences,
+            "last_latency_ms": round(self.last_latency_ms, 3),
+            "avg_latency_ms": round(self.total_latency_ms / self.inferences, 3) if self.inferences else 0.0,
+        }
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-import re
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import asdict, dataclass, field
-from typing import List, Optional
+from typing import Any, Iterable, List, Optional, Tuple
 
 from app.core.config import get_settings
+from app.core.plates import plate_key
+from app.monitoring import MetricsRegistry, metrics_registry
+from app.pipeline.canonical import PlateCanonicalizer
+from app.pipeline.country_matcher import CountryMatcher
+from app.pipeline.dedup import DuplicateIndex
 from app.pipeline.recognition import OcrCandidate
+from app.pipeline.voting import PlateVote, confusion_costs
 
 
 @dataclass
@@ -19,17 +26,24 @@ class CountryTemplate:
 @dataclass
 class PostprocessSettings:
     vote_by_char: bool = True
+    vote_align: bool = True
     min_confidence: float = 0.55
     min_frames_for_event: int = 3
+    # Consecutive reads a track vote must keep its plate for before the track yields an event.
+    settle_reads: int = 3
     anti_duplicate_seconds: int = 5
+    anti_duplicate_max_entries: int = 100_000
     country_templates: List[CountryTemplate] = field(default_factory=list)
 
     def describe(self) -> dict:
         return {
             "vote_by_char": self.vote_by_char,
+            "vote_align": self.vote_align,
             "min_confidence": self.min_confidence,
             "min_frames_for_event": self.min_frames_for_event,
+            "settle_reads": self.settle_reads,
             "anti_duplicate_seconds": self.anti_duplicate_seconds,
+            "anti_duplicate_max_entries": self.anti_duplicate_max_entries,
             "country_templates": [asdict(template) for template in self.country_templates],
         }
 
@@ -41,17 +55,34 @@ class PostprocessResult:
     country: Optional[str]
     is_duplicate: bool
     reason: Optional[str] = None
+    key: Optional[str] = None
 
     def as_dict(self) -> dict:
         return asdict(self)
 
 
+@dataclass
+class _TrackVote:
+    vote: PlateVote
+    # Postprocessor workers can run concurrently; reads of one track are folded one at a time.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    channel_id: Optional[str] = None
+    frames: int = 0
+    # A track yields at most one result with a plate: when its vote settles, or when it closes.
+    emitted: bool = False
+    context: Any = None
+
+
 class Postprocessor:
     """Lightweight post-processing logic for OCR candidates.
 
-    - Normalizes OCR strings and fixes common look-alike characters.
+    - Canonicalizes OCR strings: look-alike characters become letters or digits where the
+      matched country template expects them, and a confusion-class key is derived for lookups.
     - Performs per-character voting (optional) and validates against country templates.
-    - Implements anti-duplicate suppression within a configurable time window.
+      Reads of a track are folded into a streaming :class:`PlateVote` as they arrive,
+      aligned against the consensus when ``vote_align`` is enabled. A track yields its
+      plate once: as soon as the vote settles, otherwise when the tracker closes it.
+    - Implements anti-duplicate suppression per channel within a configurable time window.
     """
 
     _similar_chars_map = {
@@ -67,87 +98,185 @@ class Postprocessor:
         "С": "C",  # Cyrillic to Latin
     }
 
-    def __init__(self, settings: PostprocessSettings) -> None:
+    def __init__(
+        self,
+        settings: PostprocessSettings,
+        *,
+        max_tracks: int = 4096,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
         self.settings = settings
-        self._country_regex = [
-            (template.code.upper(), re.compile(template.pattern, re.IGNORECASE))
-            for template in self.settings.country_templates
-            if template.enabled
-        ]
-        self._recent: dict[str, float] = {}
+        self.max_tracks = max_tracks
+        self._votes: "OrderedDict[str, _TrackVote]" = OrderedDict()
+        self._votes_lock = threading.Lock()
+        # Recently closed tracks, so a read that arrives after the close cannot start a second vote.
+        self._closed: "OrderedDict[str, None]" = OrderedDict()
+        # Look-alike substitutions are cheap when aligning reads against the consensus.
+        self._confusion_costs = confusion_costs(self._similar_chars_map) if settings.vote_align else None
+        self._countries = CountryMatcher(
+            (template.code, template.pattern) for template in self.settings.country_templates if template.enabled
+        )
+        self._canonical = PlateCanonicalizer(self._countries)
+        self._recent = DuplicateIndex(
+            settings.anti_duplicate_seconds, max_entries=settings.anti_duplicate_max_entries, metrics=metrics
+        )
 
     def normalize(self, text: str) -> str:
-        normalized = text.strip().upper().replace(" ", "").replace("-", "")
-        normalized = "".join(self._similar_chars_map.get(ch, ch) for ch in normalized)
-        return normalized
+        return self._canonical.canonicalize(text)[0]
 
     def _vote_by_char(self, candidates: list[OcrCandidate]) -> tuple[str, float]:
-        if not candidates:
-            return "", 0.0
-        max_len = max(len(candidate.text) for candidate in candidates)
-        voted_chars: list[str] = []
-        total_conf = 0.0
-        for idx in range(max_len):
-            counter: dict[str, float] = {}
-            for candidate in candidates:
-                if idx >= len(candidate.text):
-                    continue
-                ch = candidate.text[idx].upper()
-                counter[ch] = counter.get(ch, 0.0) + candidate.confidence
-                total_conf += candidate.confidence / max_len
-            if counter:
-                voted_chars.append(max(counter, key=counter.get))
-        text = "".join(voted_chars)
-        return text, total_conf / max_len if voted_chars else 0.0
+        vote = PlateVote(costs=self._confusion_costs)
+        for candidate in candidates:
+            vote.add(candidate.text, candidate.confidence)
+        return vote.result()
+
+    def _track_vote(self, track_id: str) -> Optional[_TrackVote]:
+        with self._votes_lock:
+            entry = self._votes.get(track_id)
+            if entry is None:
+                if track_id in self._closed:
+                    return None
+                entry = self._votes[track_id] = _TrackVote(PlateVote(costs=self._confusion_costs))
+                # Tracks are normally released on close; the cap only guards against missed releases.
+                while len(self._votes) > self.max_tracks:
+                    self._votes.popitem(last=False)
+            else:
+                self._votes.move_to_end(track_id)
+            return entry
+
+    def _settled(self, vote: PlateVote, min_confidence: float = 0.0) -> bool:
+        return vote.settled(self.settings.settle_reads, max(self.settings.min_confidence, min_confidence))
+
+    def track_settled(self, track_id: str, min_confidence: float = 0.0) -> bool:
+        """Whether the vote of ``track_id`` has settled; unknown tracks are not.
+
+        ``min_confidence`` can only raise the postprocessing threshold (the OCR
+        scheduler passes ``OCR_MIN_CONFIDENCE``).
+        """
+
+        entry = self._votes.get(track_id)
+        if entry is None:
+            return False
+        with entry.lock:
+            return self._settled(entry.vote, min_confidence)
+
+    def _pop_track(self, track_id: str) -> Optional[_TrackVote]:
+        with self._votes_lock:
+            self._closed[track_id] = None
+            while len(self._closed) > self.max_tracks:
+                self._closed.popitem(last=False)
+            return self._votes.pop(track_id, None)
+
+    def release_tracks(self, track_ids: Iterable[str]) -> None:
+        """Drop the accumulated votes of closed tracks without emitting them."""
+
+        for track_id in track_ids:
+            self._pop_track(track_id)
+
+    def release_channel(self, channel_id: str) -> None:
+        """Drop the votes of every track of a removed channel."""
+
+        with self._votes_lock:
+            track_ids = [track_id for track_id, entry in self._votes.items() if entry.channel_id == channel_id]
+        self.release_tracks(track_ids)
 
     def _best_candidate(self, candidates: list[OcrCandidate]) -> tuple[str, float]:
         best = max(candidates, key=lambda c: c.confidence)
         return best.text.upper(), best.confidence
 
-    def _match_country(self, plate: str) -> Optional[str]:
-        for code, pattern in self._country_regex:
-            if pattern.match(plate):
-                return code
-        return None
-
-    def _is_duplicate(self, plate: str, now: float) -> bool:
-        last_seen = self._recent.get(plate)
-        if last_seen is None:
-            self._recent[plate] = now
-            return False
-        if now - last_seen <= self.settings.anti_duplicate_seconds:
-            return True
-        self._recent[plate] = now
-        return False
+    def _is_duplicate(self, plate: str, now: float, channel_id: Optional[str] = None) -> bool:
+        return self._recent.check(channel_id, plate, now)
 
     def process_candidates(
         self,
         candidates: list[OcrCandidate],
         *,
         frames_with_plate: int,
+        track_id: Optional[str] = None,
+        channel_id: Optional[str] = None,
+        context: Any = None,
     ) -> PostprocessResult:
+        """Vote over ``candidates``; with ``track_id`` they are folded into that track's running vote.
+
+        ``frames_with_plate`` is the number of frames the track has been detected in. ``context``
+        is kept with the track vote and handed back by :meth:`close_track`.
+        """
+
         eligible = [c for c in candidates if c.confidence >= self.settings.min_confidence]
-        if frames_with_plate < self.settings.min_frames_for_event:
-            return PostprocessResult(None, 0.0, None, False, reason="not_enough_frames")
-        if not eligible:
-            return PostprocessResult(None, 0.0, None, False, reason="low_confidence")
-
-        if self.settings.vote_by_char:
-            text, confidence = self._vote_by_char(eligible)
-        else:
-            text, confidence = self._best_candidate(eligible)
-
-        normalized = self.normalize(text)
-        country = self._match_country(normalized)
+        if track_id is None:
+            if frames_with_plate < self.settings.min_frames_for_event:
+                return PostprocessResult(None, 0.0, None, False, reason="not_enough_frames")
+            if not eligible:
+                return PostprocessResult(None, 0.0, None, False, reason="low_confidence")
+            text, confidence = (
+                self._vote_by_char(eligible) if self.settings.vote_by_char else self._best_candidate(eligible)
+            )
+            return self._finish(text, confidence, channel_id)
+
+        entry = self._track_vote(track_id)
+        if entry is None:
+            return PostprocessResult(None, 0.0, None, False, reason="track_closed")
+        with entry.lock:
+            vote = entry.vote
+            for candidate in eligible:
+                vote.add(candidate.text, candidate.confidence)
+            entry.channel_id = channel_id
+            entry.frames = max(entry.frames, frames_with_plate)
+            if context is not None:
+                entry.context = context
+            if entry.emitted:
+                return PostprocessResult(None, 0.0, None, False, reason="emitted")
+            if entry.frames < self.settings.min_frames_for_event:
+                return PostprocessResult(None, 0.0, None, False, reason="not_enough_frames")
+            if not vote.count:
+                return PostprocessResult(None, 0.0, None, False, reason="low_confidence")
+            if not self._settled(vote):
+                return PostprocessResult(None, 0.0, None, False, reason="not_settled")
+            entry.emitted = True
+            text, confidence = self._track_result(vote)
+        return self._finish(text, confidence, channel_id)
+
+    def close_track(
+        self, track_id: str, *, frames_with_plate: int = 0, channel_id: Optional[str] = None
+    ) -> Tuple[PostprocessResult, Any]:
+        """Release a closed track; its vote becomes a result if it has not yielded one yet.
+
+        Returns the result together with the ``context`` last passed for the track.
+        """
+
+        entry = self._pop_track(track_id)
+        if entry is None:
+            return PostprocessResult(None, 0.0, None, False, reason="no_reads"), None
+        with entry.lock:
+            vote = entry.vote
+            frames = max(entry.frames, frames_with_plate)
+            channel_id = channel_id if channel_id is not None else entry.channel_id
+            if entry.emitted:
+                return PostprocessResult(None, 0.0, None, False, reason="emitted"), entry.context
+            if frames < self.settings.min_frames_for_event:
+                return PostprocessResult(None, 0.0, None, False, reason="not_enough_frames"), entry.context
+            if not vote.count or vote.confidence < self.settings.min_confidence:
+                return PostprocessResult(None, 0.0, None, False, reason="low_confidence"), entry.context
+            entry.emitted = True
+            text, confidence = self._track_result(vote)
+        return self._finish(text, confidence, channel_id), entry.context
+
+    def _track_result(self, vote: PlateVote) -> tuple[str, float]:
+        return vote.result() if self.settings.vote_by_char else vote.best_read
+
+    def _finish(self, text: str, confidence: float, channel_id: Optional[str]) -> PostprocessResult:
+        normalized, country = self._canonical.canonicalize(text)
+        key = plate_key(normalized)
         now = time.time()
-        duplicate = self._is_duplicate(normalized, now)
+        # Keyed by confusion class: "A123BC77" and "AI23BC77" on one channel are the same car.
+        duplicate = self._is_duplicate(key, now, channel_id)
 
-        return PostprocessResult(normalized, confidence, country, duplicate)
+        return PostprocessResult(normalized, confidence, country, duplicate, key=key)
 
 
 _default_country_patterns = {
-    "ru": r"^[ABCEHKMOPTXУABCEHKMOPTXУ]{1}\d{3}[ABCEHKMOPTXУ]{2}\d{2,3}$",
-    "by": r"^\d{4}[ABCEHKMOPTXУ]{2}-\d$",
+    "ru": r"^[ABCEHKMOPTXУ]\d{3}[ABCEHKMOPTXУ]{2}\d{2,3}$",
+    "by": r"^\d{4}[ABCEHKMOPTXУ]{2}\d$",
     "kz": r"^[ABCEHKMOPTXУ]{3}\d{3}[ABCEHKMOPTXУ]{2}$",
     "ua": r"^[ABCEHIKMOPTX]{2}\d{4}[ABCEHIKMOPTX]{2}$",
     "eu": r"^[A-Z0-9]{6,8}$",
@@ -157,13 +286,16 @@ _settings = get_settings()
 
 postprocess_settings = PostprocessSettings(
     vote_by_char=_settings.postprocess_vote_by_char,
+    vote_align=_settings.postprocess_vote_align,
     min_confidence=_settings.postprocess_min_confidence,
     min_frames_for_event=_settings.postprocess_min_frames_for_event,
+    settle_reads=_settings.ocr_vote_frames,
     anti_duplicate_seconds=_settings.postprocess_anti_duplicate_seconds,
+    anti_duplicate_max_entries=_settings.postprocess_anti_duplicate_max_entries,
     country_templates=[
         CountryTemplate(code=code, pattern=_default_country_patterns[code], enabled=code in _settings.postprocess_country_templates)
         for code in _default_country_patterns
     ],
 )
 
-postprocessor = Postprocessor(postprocess_settings)
+postprocessor = Postprocessor(postprocess_settings, metrics=metrics_registry)
@@ -1,11 +1,27 @@
 from __future__ import annotations
 
+import json
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import List
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
 
 from app.core.config import get_settings
-from app.pipeline.ingest_manager import ChannelDirection
+from app.monitoring import metrics_registry
+from app.pipeline.arena import FrameArena, frame_arena
+from app.pipeline.crop_store import TrackCropStore
+from app.pipeline.detector_skip import DetectionSkipper
+from app.pipeline.geometry import as_boxes, centers, crop_view
+from app.pipeline.ingest_manager import ChannelDirection, ingest_manager
+from app.pipeline.multires import FrameDownscaler
+from app.pipeline.ocr_batching import OcrBatcher
+from app.pipeline.ocr_scheduler import OcrScheduler, crop_quality
+from app.pipeline.roi import CompiledRoi, RoiRegistry, roi_registry
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from app.pipeline.tracker import Tracker
 
 
 class DetectorModel(str, Enum):
@@ -37,6 +53,15 @@ class DetectorSettings:
     iou_threshold: float = 0.45
     max_detections: int = 10
     require_roi: bool = False
+    model_path: Optional[str] = None
+    input_size: int = 640
+    session_pool_size: int = 1
+    intra_op_threads: int = 0
+    inter_op_threads: int = 1
+    skip_max_interval: int = 1
+    skip_max_drift: float = 0.3
+    skip_min_track_confidence: float = 0.3
+    frame_max_side: int = 0
 
 
 @dataclass
@@ -45,6 +70,9 @@ class TrackerSettings:
     max_age: int = 30
     min_hits: int = 3
     match_iou_threshold: float = 0.5
+    capacity: int = 64
+    direction_window: int = 10
+    direction_min_displacement: float = 0.5
 
 
 @dataclass
@@ -53,15 +81,58 @@ class OcrSettings:
     vote_frames: int = 3
     min_confidence: float = 0.6
     languages: List[str] = field(default_factory=lambda: ["en", "ru"])
-
-
-@dataclass
+    min_quality_gain: float = 0.1
+    max_calls_per_track: int = 10
+    input_height: int = 48
+    input_width: int = 192
+    batch_size: int = 32
+    batch_max_wait_ms: float = 15.0
+    crop_top_k: int = 3
+    crop_max_track_bytes: int = 512 * 1024
+    crop_max_total_bytes: int = 64 * 1024 * 1024
+    result_timeout_seconds: float = 5.0
+
+
+@dataclass(slots=True)
 class Detection:
     bbox: List[float]
     confidence: float
 
 
 @dataclass
+class DetectionArray:
+    """Detections of one frame as contiguous ``float32`` arrays (``boxes`` is ``(N, 4)``)."""
+
+    boxes: np.ndarray
+    scores: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "DetectionArray":
+        return cls(np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32))
+
+    @classmethod
+    def from_detections(cls, detections: Sequence[Detection]) -> "DetectionArray":
+        if not detections:
+            return cls.empty()
+        return cls(
+            as_boxes([det.bbox for det in detections]),
+            np.asarray([det.confidence for det in detections], dtype=np.float32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def select(self, index: Any) -> "DetectionArray":
+        return DetectionArray(np.ascontiguousarray(self.boxes[index]), np.ascontiguousarray(self.scores[index]))
+
+    def to_detections(self) -> List[Detection]:
+        return [Detection(bbox=box, confidence=score) for box, score in zip(self.boxes.tolist(), self.scores.tolist())]
+
+    def columns(self) -> dict:
+        return {"boxes": self.boxes.tolist(), "scores": self.scores.tolist()}
+
+
+@dataclass(slots=True)
 class Track:
     track_id: str
     bbox: List[float]
@@ -70,36 +141,205 @@ class Track:
 
 
 @dataclass
+class TrackArray:
+    """Visible tracks of one frame as columns; iterating yields :class:`Track` rows."""
+
+    track_ids: List[str]
+    boxes: np.ndarray
+    directions: List[ChannelDirection]
+    scores: np.ndarray
+    # Frames each track has been detected in so far (the tracker's hit count).
+    hits: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+
+    @classmethod
+    def empty(cls) -> "TrackArray":
+        return cls([], np.zeros((0, 4), dtype=np.float32), [], np.zeros(0, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def __iter__(self) -> Iterator[Track]:
+        for track_id, box, direction, score in zip(
+            self.track_ids, self.boxes.tolist(), self.directions, self.scores.tolist()
+        ):
+            yield Track(track_id=track_id, bbox=box, direction=direction, confidence=score)
+
+    def select(self, index: Any) -> "TrackArray":
+        positions = np.arange(len(self))[index]
+        return TrackArray(
+            [self.track_ids[pos] for pos in positions],
+            np.ascontiguousarray(self.boxes[positions]),
+            [self.directions[pos] for pos in positions],
+            np.ascontiguousarray(self.scores[positions]),
+            np.ascontiguousarray(self.hits[positions]) if len(self.hits) else self.hits,
+        )
+
+    def columns(self) -> dict:
+        return {
+            "track_ids": self.track_ids,
+            "boxes": self.boxes.tolist(),
+            "directions": [direction.value for direction in self.directions],
+            "scores": self.scores.tolist(),
+            "hits": self.hits.tolist(),
+        }
+
+
+@dataclass(slots=True)
 class OcrCandidate:
     text: str
     confidence: float
+    track_id: Optional[str] = None
 
 
 @dataclass
+class FrameInput:
+    frame_id: str
+    image: Any = None
+    channel_id: Optional[str] = None
+    roi_applied: bool = False
+
+
+@dataclass(slots=True)
 class FrameRecognition:
+    """Result of one frame; detections and tracks are columnar arrays.
+
+    ``as_dict`` keeps the row-per-object shape for API responses. ``to_json`` and
+    ``to_msgpack`` write the columnar shape straight from the arrays.
+    """
+
     frame_id: str
-    detections: List[Detection] = field(default_factory=list)
-    tracks: List[Track] = field(default_factory=list)
+    detections: DetectionArray = field(default_factory=DetectionArray.empty)
+    tracks: TrackArray = field(default_factory=TrackArray.empty)
     ocr: List[OcrCandidate] = field(default_factory=list)
+    channel_id: Optional[str] = None
+    # Tracks the tracker closed while processing this frame, with the number of frames each was detected in.
+    closed_tracks: Dict[str, int] = field(default_factory=dict)
 
     def as_dict(self) -> dict:
-        def dict_factory(items: list[tuple[str, object]]) -> dict:
-            return {key: (value.value if isinstance(value, Enum) else value) for key, value in items}
+        return {
+            "frame_id": self.frame_id,
+            "channel_id": self.channel_id,
+            "detections": [
+                {"bbox": box, "confidence": score}
+                for box, score in zip(self.detections.boxes.tolist(), self.detections.scores.tolist())
+            ],
+            "tracks": [
+                {"track_id": track_id, "bbox": box, "direction": direction.value, "confidence": score}
+                for track_id, box, direction, score in zip(
+                    self.tracks.track_ids, self.tracks.boxes.tolist(), self.tracks.directions, self.tracks.scores.tolist()
+                )
+            ],
+            "ocr": [
+                {"text": item.text, "confidence": item.confidence, "track_id": item.track_id} for item in self.ocr
+            ],
+            "closed_tracks": self.closed_tracks,
+        }
 
+    def to_json(self) -> bytes:
+        """Columnar JSON; uses orjson's native dataclass/NumPy support when it is installed."""
+
+        try:
+            import orjson
+        except ImportError:
+            return json.dumps(self._columns(), separators=(",", ":")).encode()
+        return orjson.dumps(self, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def to_msgpack(self) -> bytes:
+        """Columnar msgpack with box and score columns as raw little-endian ``float32`` bytes."""
+
+        try:
+            import msgpack
+        except ImportError as exc:  # pragma: no cover - listed in requirements.txt
+            raise RuntimeError("to_msgpack requires the msgpack package") from exc
+
+        return msgpack.packb(
+            {
+                "frame_id": self.frame_id,
+                "channel_id": self.channel_id,
+                "detections": {
+                    "boxes": self.detections.boxes.astype("<f4", copy=False).tobytes(),
+                    "scores": self.detections.scores.astype("<f4", copy=False).tobytes(),
+                },
+                "tracks": {
+                    "track_ids": self.tracks.track_ids,
+                    "boxes": self.tracks.boxes.astype("<f4", copy=False).tobytes(),
+                    "directions": [direction.value for direction in self.tracks.directions],
+                    "scores": self.tracks.scores.astype("<f4", copy=False).tobytes(),
+                    "hits": self.tracks.hits.astype("<i4", copy=False).tobytes(),
+                },
+                "ocr": [(item.text, item.confidence, item.track_id) for item in self.ocr],
+                "closed_tracks": self.closed_tracks,
+            }
+        )
+
+    def _columns(self) -> dict:
         return {
             "frame_id": self.frame_id,
-            "detections": [asdict(det, dict_factory=dict_factory) for det in self.detections],
-            "tracks": [asdict(track, dict_factory=dict_factory) for track in self.tracks],
-            "ocr": [asdict(candidate, dict_factory=dict_factory) for candidate in self.ocr],
+            "detections": self.detections.columns(),
+            "tracks": self.tracks.columns(),
+            "ocr": [{"text": item.text, "confidence": item.confidence, "track_id": item.track_id} for item in self.ocr],
+            "channel_id": self.channel_id,
+            "closed_tracks": self.closed_tracks,
         }
 
 
+@dataclass
+class StagedFrame:
+    """A frame between the detector, tracker and OCR steps of :class:`RecognitionPipeline`."""
+
+    frame: FrameInput
+    result: FrameRecognition
+    detected: bool = False
+    # The detector skipper chose to propagate the tracks on motion alone for this frame.
+    coast: bool = False
+    # (track id, crop) pairs waiting for OCR; crops are views into ``frame.image``.
+    ocr_jobs: List[tuple[str, Any]] = field(default_factory=list)
+
+
+class Detector:
+    """Detector backend interface: one call per batch of frames."""
+
+    def load(self) -> None:
+        return None
+
+    def detect_batch(self, images: Sequence[Any]) -> List[DetectionArray]:
+        return [DetectionArray.empty() for _ in images]
+
+    def describe(self) -> dict:
+        return {"backend": "none"}
+
+
+class OcrBackend:
+    """OCR backend interface: recognizes a ``(N, H, W, 3)`` uint8 batch of padded plate crops."""
+
+    enabled = False
+
+    def load(self) -> None:
+        return None
+
+    def recognize_batch(self, crops: np.ndarray) -> List[OcrCandidate]:
+        return [OcrCandidate(text="", confidence=0.0) for _ in crops]
+
+    def describe(self) -> dict:
+        return {"backend": "none"}
+
+
+def build_detector(settings: DetectorSettings) -> Detector:
+    if not settings.model_path:
+        return Detector()
+    from app.pipeline.onnx_detector import OnnxDetector
+
+    return OnnxDetector(settings, arena=frame_arena, metrics=metrics_registry)
+
+
 class RecognitionPipeline:
     """Container for detector, tracker and OCR runtime settings.
 
-    The actual ML models will be wired in future steps. For now, the pipeline
-    exposes configuration and placeholder processing compatible with the
-    roadmap. This keeps API contracts stable while models are integrated.
+    Frames are processed in batches through a pluggable :class:`Detector`
+    backend; the default backend returns no detections until a model is
+    configured. Detections of each channel feed that channel's tracker; with
+    detector skipping enabled, frames between detector runs are tracked on
+    motion prediction alone.
     """
 
     def __init__(
@@ -107,54 +347,297 @@ class RecognitionPipeline:
         detector_settings: DetectorSettings,
         tracker_settings: TrackerSettings,
         ocr_settings: OcrSettings,
+        detector: Optional[Detector] = None,
+        ocr: Optional[OcrBackend] = None,
+        rois: Optional[RoiRegistry] = None,
+        directions: Optional[Callable[[str], ChannelDirection]] = None,
+        arena: Optional[FrameArena] = None,
     ) -> None:
         self.detector_settings = detector_settings
         self.tracker_settings = tracker_settings
         self.ocr_settings = ocr_settings
+        self.detector = detector or Detector()
+        self.trackers: Dict[str, "Tracker"] = {}
+        self.rois = rois or RoiRegistry()
+        self.directions = directions or (lambda channel_id: ChannelDirection.any)
+        self.ocr = ocr or OcrBackend()
+        self.arena = arena
+        self.downscaler = FrameDownscaler(detector_settings.frame_max_side, arena=arena, metrics=metrics_registry)
+        self.skipper = DetectionSkipper(
+            max_interval=detector_settings.skip_max_interval,
+            max_drift=detector_settings.skip_max_drift,
+            min_track_confidence=detector_settings.skip_min_track_confidence,
+            metrics=metrics_registry,
+        )
+        self.ocr_scheduler = OcrScheduler(ocr_settings, metrics=metrics_registry)
+        self.crop_store = TrackCropStore(
+            top_k=ocr_settings.crop_top_k,
+            max_track_bytes=ocr_settings.crop_max_track_bytes,
+            max_total_bytes=ocr_settings.crop_max_total_bytes,
+            metrics=metrics_registry,
+        )
+        # Called with the ids of tracks the tracker closed (or a removed channel's tracks) to release per-track state.
+        self.track_close_hooks: List[Callable[[List[str]], None]] = [self.ocr_scheduler.close, self.crop_store.release]
+        self.ocr_batcher = OcrBatcher(
+            lambda crops: self.ocr.recognize_batch(crops),
+            arena=arena,
+            input_height=ocr_settings.input_height,
+            input_width=ocr_settings.input_width,
+            max_batch_size=ocr_settings.batch_size,
+            max_wait_ms=ocr_settings.batch_max_wait_ms,
+            metrics=metrics_registry,
+        )
 
     def describe(self) -> dict:
         def dict_factory(items: list[tuple[str, object]]) -> dict:
             return {key: (value.value if isinstance(value, Enum) else value) for key, value in items}
 
         return {
-            "detector": asdict(self.detector_settings, dict_factory=dict_factory),
+            "detector": {**asdict(self.detector_settings, dict_factory=dict_factory), "runtime": self.detector.describe()},
             "tracker": asdict(self.tracker_settings, dict_factory=dict_factory),
             "ocr": asdict(self.ocr_settings, dict_factory=dict_factory),
+            "trackers": {channel_id: tracker.describe() for channel_id, tracker in self.trackers.items()},
+            "detector_skip": self.skipper.describe(),
+            "downscale": self.downscaler.describe(),
+            "ocr_scheduler": self.ocr_scheduler.describe(),
+            "ocr_batching": self.ocr_batcher.describe(),
+            "crop_store": self.crop_store.describe(),
+            "roi": self.rois.describe(),
+            "arena": self.arena.describe() if self.arena else None,
         }
 
-    def process_frame(self, frame_id: str, *, roi_applied: bool = False) -> FrameRecognition:
-        detections: List[Detection] = []
-        tracks: List[Track] = []
-        ocr: List[OcrCandidate] = []
+    def tracker_for(self, channel_id: str) -> "Tracker":
+        tracker = self.trackers.get(channel_id)
+        if tracker is None:
+            from app.pipeline.tracker import build_tracker
+
+            tracker = self.trackers.setdefault(
+                channel_id, build_tracker(self.tracker_settings, channel_id, self.tracker_settings.capacity)
+            )
+        return tracker
 
-        if self.detector_settings.require_roi and not roi_applied:
-            return FrameRecognition(frame_id=frame_id)
+    def remove_channel(self, channel_id: str) -> None:
+        """Drop the channel's tracker and skipper state and close its tracks like the tracker would."""
 
-        # Placeholder: actual inference and tracking will be implemented later.
-        return FrameRecognition(frame_id=frame_id, detections=detections, tracks=tracks, ocr=ocr)
+        tracker = self.trackers.pop(channel_id, None)
+        self.skipper.remove(channel_id)
+        if tracker is not None:
+            self._close_tracks(tracker.close_all())
+
+    def _close_tracks(self, closed: Dict[str, int]) -> Dict[str, int]:
+        if closed:
+            for hook in self.track_close_hooks:
+                hook(list(closed))
+        return closed
+
+    def process_frame(
+        self,
+        frame_id: str,
+        *,
+        image: Any = None,
+        channel_id: Optional[str] = None,
+        roi_applied: bool = False,
+    ) -> FrameRecognition:
+        return self.process_batch(
+            [FrameInput(frame_id=frame_id, image=image, channel_id=channel_id, roi_applied=roi_applied)]
+        )[0]
+
+    def process_batch(self, frames: Sequence[FrameInput]) -> List[FrameRecognition]:
+        """Run the detector once over a batch of frames, then track, crop and OCR every frame."""
+
+        return self.recognize([self.track(staged) for staged in self.detect_batch(frames)])
+
+    def detect_batch(self, frames: Sequence[FrameInput], *, skip: bool = True) -> List[StagedFrame]:
+        """Detector step: one detector call for every frame of the batch that is not coasted.
+
+        With ``skip`` the detection skipper may mark frames to be coasted instead;
+        :meth:`track` re-checks that choice against the up-to-date tracker.
+        """
+
+        staged = [
+            StagedFrame(frame, FrameRecognition(frame_id=frame.frame_id, channel_id=frame.channel_id))
+            for frame in frames
+        ]
+        runnable, views, rois = [], [], []
+        detecting: set = set()
+        for idx, frame in enumerate(frames):
+            if frame.image is None:
+                continue
+            # A channel with a frame already queued for detection in this batch is not coasted past it.
+            if skip and frame.channel_id is not None and self.skipper.enabled and frame.channel_id not in detecting:
+                if not self.skipper.should_detect(frame.channel_id, self.tracker_for(frame.channel_id)):
+                    staged[idx].coast = True
+                    continue
+            # ROI cropping is skipped when the caller already applied the ROI to the image.
+            roi = None if frame.roi_applied else self.rois.get(frame.channel_id, frame.image.shape[:2])
+            if roi is None and not frame.roi_applied and self.detector_settings.require_roi:
+                continue
+            runnable.append(idx)
+            detecting.add(frame.channel_id)
+            # The detector sees a downscaled copy; tracks and OCR crops stay in original pixels.
+            views.append(self.downscaler.prepare(frame.image if roi is None else roi.crop(frame.image)))
+            rois.append(roi)
+        try:
+            detections = self.detector.detect_batch([view.image for view in views]) if runnable else []
+        finally:
+            # Detectors do not keep their inputs, so pooled detector copies go back right away.
+            for view in views:
+                view.release()
+        for idx, frame_detections, view, roi in zip(runnable, detections, views, rois):
+            view.to_original(frame_detections.boxes)
+            if roi is not None:
+                frame_detections = self._apply_roi(roi, frame_detections)
+            staged[idx].result.detections = frame_detections
+            staged[idx].detected = True
+        return staged
+
+    def track(self, staged: StagedFrame) -> StagedFrame:
+        """Tracker and cropper step: update (or coast) the channel tracker and pick crops worth an OCR call.
+
+        Frames of one channel must reach this step in capture order.
+        """
+
+        channel_id = staged.frame.channel_id
+        if channel_id is None or not (staged.detected or staged.coast):
+            return staged
+        tracker = self.tracker_for(channel_id)
+        if staged.coast and self.skipper.should_detect(channel_id, tracker):
+            # The skip was chosen while earlier frames of the channel were still in flight; the tracker now disagrees.
+            metrics_registry.inc("detector_coast_revoked", labels={"channel": channel_id})
+            staged = self.detect_batch([staged.frame], skip=False)[0]
+            if not staged.detected:
+                return staged
+        result = staged.result
+        if staged.coast:
+            result.tracks = self._filter_direction(channel_id, tracker.coast())
+        else:
+            result.tracks = self._filter_direction(channel_id, tracker.update(result.detections))
+            result.closed_tracks = self._close_tracks(tracker.drain_closed())
+        self.skipper.record(channel_id, tracker, detected=staged.detected)
+        if self.ocr.enabled:
+            staged.ocr_jobs = self._schedule_ocr(staged.frame.image, result.tracks)
+        return staged
+
+    def recognize(self, staged: Sequence[StagedFrame]) -> List[FrameRecognition]:
+        """OCR step: crops of every given frame go to the shared OCR batcher together."""
+
+        # Crops go through the shared OCR batcher, so tracks of concurrent callers share one inference.
+        futures = [
+            (item.result, track_id, self.ocr_batcher.submit(track_id, crop))
+            for item in staged
+            for track_id, crop in item.ocr_jobs
+        ]
+        for result, track_id, future in futures:
+            try:
+                candidate = future.result(timeout=self.ocr_settings.result_timeout_seconds)
+            except FutureTimeoutError:
+                # The read is dropped for this frame; the track stays eligible for the next crop.
+                metrics_registry.inc("ocr_result_timeouts")
+                continue
+            except Exception:  # noqa: BLE001 - backend error, stopped batcher or short batch result
+                # Only this crop is lost: the frame keeps its detections, tracks and closed tracks.
+                metrics_registry.inc("ocr_failures")
+                continue
+            result.ocr.append(candidate)
+        for item in staged:
+            item.ocr_jobs = []
+        return [item.result for item in staged]
+
+    @staticmethod
+    def _apply_roi(roi: CompiledRoi, detections: DetectionArray) -> DetectionArray:
+        """Shift crop-relative boxes back to frame coordinates and drop those centred outside the polygon."""
+
+        if not len(detections):
+            return detections
+        x1, y1 = roi.offset
+        detections.boxes += np.array([x1, y1, x1, y1], dtype=np.float32)
+        inside = roi.contains(centers(detections.boxes))
+        if inside.all():
+            return detections
+        metrics_registry.inc("roi_detections_dropped", float((~inside).sum()))
+        return detections.select(inside)
+
+    def _filter_direction(self, channel_id: str, tracks: TrackArray) -> TrackArray:
+        """Drop tracks heading against the channel direction before they are cropped and sent to OCR.
+
+        Tracks without an established heading yet are kept.
+        """
+
+        expected = self.directions(channel_id)
+        if expected == ChannelDirection.any or not len(tracks):
+            return tracks
+        opposite = ChannelDirection.down if expected == ChannelDirection.up else ChannelDirection.up
+        keep = np.fromiter((direction != opposite for direction in tracks.directions), dtype=bool, count=len(tracks))
+        if keep.all():
+            return tracks
+        metrics_registry.inc("direction_tracks_dropped", float((~keep).sum()), labels={"channel": channel_id})
+        return tracks.select(keep)
+
+    def _schedule_ocr(self, image: Any, tracks: TrackArray) -> List[tuple[str, Any]]:
+        jobs = []
+        for track_id, box in zip(tracks.track_ids, tracks.boxes):
+            crop = crop_view(image, box)
+            if crop is None:
+                continue
+            quality = crop_quality(crop)
+            self.crop_store.offer(track_id, crop, quality)
+            if self.ocr_scheduler.should_run(track_id, quality):
+                jobs.append((track_id, crop))
+        return jobs
 
 
 _settings = get_settings()
 
+_detector_settings = DetectorSettings(
+    model=DetectorModel(_settings.detector_model),
+    device=Device(_settings.detector_device),
+    confidence_threshold=_settings.detector_confidence_threshold,
+    iou_threshold=_settings.detector_iou_threshold,
+    max_detections=_settings.detector_max_detections,
+    require_roi=_settings.detector_require_roi,
+    model_path=_settings.detector_model_path,
+    input_size=_settings.detector_input_size,
+    session_pool_size=_settings.detector_session_pool_size,
+    intra_op_threads=_settings.detector_intra_op_threads,
+    inter_op_threads=_settings.detector_inter_op_threads,
+    skip_max_interval=_settings.detector_skip_max_interval,
+    skip_max_drift=_settings.detector_skip_max_drift,
+    skip_min_track_confidence=_settings.detector_skip_min_track_confidence,
+    frame_max_side=_settings.detector_frame_max_side,
+)
+
 recognition_pipeline = RecognitionPipeline(
-    detector_settings=DetectorSettings(
-        model=DetectorModel(_settings.detector_model),
-        device=Device(_settings.detector_device),
-        confidence_threshold=_settings.detector_confidence_threshold,
-        iou_threshold=_settings.detector_iou_threshold,
-        max_detections=_settings.detector_max_detections,
-        require_roi=_settings.detector_require_roi,
-    ),
+    detector_settings=_detector_settings,
     tracker_settings=TrackerSettings(
         tracker=TrackerType(_settings.tracker_type),
         max_age=_settings.tracker_max_age,
         min_hits=_settings.tracker_min_hits,
         match_iou_threshold=_settings.tracker_match_iou_threshold,
+        capacity=_settings.tracker_capacity,
+        direction_window=_settings.tracker_direction_window,
+        direction_min_displacement=_settings.tracker_direction_min_displacement,
     ),
     ocr_settings=OcrSettings(
         engine=OcrEngine(_settings.ocr_engine),
         vote_frames=_settings.ocr_vote_frames,
         min_confidence=_settings.ocr_min_confidence,
         languages=_settings.ocr_languages,
+        min_quality_gain=_settings.ocr_min_quality_gain,
+        max_calls_per_track=_settings.ocr_max_calls_per_track,
+        input_height=_settings.ocr_input_height,
+        input_width=_settings.ocr_input_width,
+        batch_size=_settings.ocr_batch_size,
+        batch_max_wait_ms=_settings.ocr_batch_max_wait_ms,
+        crop_top_k=_settings.ocr_crop_top_k,
+        crop_max_track_bytes=_settings.ocr_crop_max_track_bytes,
+        crop_max_total_bytes=_settings.ocr_crop_max_total_bytes,
+        result_timeout_seconds=_settings.ocr_result_timeout_seconds,
     ),
+    detector=build_detector(_detector_settings),
+    rois=roi_registry,
+    directions=ingest_manager.direction,
+    arena=frame_arena,
 )
+
+# Removing an ingest channel drops its tracker and closes its tracks.
+ingest_manager.channel_removed_hooks.append(recognition_pipeline.remove_channel)
@@ -0,0 +1,166 @@
+"""Per-channel ROI polygons compiled into crop rectangles and bitmasks.
+
+A channel ROI is parsed once, when the channel is registered or updated. For
+every frame shape seen on the channel it is compiled, once, into the tight
+bounding rectangle of the polygon and a boolean mask over that rectangle.
+Frames are cropped to the rectangle (a view, no copy) before detection, and
+detections whose centre falls outside the polygon are dropped with a single
+mask lookup.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def roi_points(roi: Optional[dict]) -> Optional[np.ndarray]:
+    """Extract polygon vertices from a channel ROI payload.
+
+    Accepts ``{"points": [[x, y], ...]}`` (or ``"polygon"``). Coordinates in the
+    ``0..1`` range are treated as normalized to the frame size.
+    """
+
+    if not roi:
+        return None
+    points = roi.get("points") or roi.get("polygon")
+    if not points or len(points) < 3:
+        return None
+    return np.asarray(points, dtype=np.float32).reshape(-1, 2)
+
+
+def to_pixels(points: np.ndarray, frame_size: Tuple[int, int]) -> np.ndarray:
+    """Polygon in frame pixel coordinates (normalized points are scaled by the frame size)."""
+
+    if float(points.max()) <= 1.0:
+        frame_h, frame_w = frame_size
+        return points * np.array([frame_w, frame_h], dtype=np.float32)
+    return points
+
+
+def rasterize_polygon(points: np.ndarray, height: int, width: int, frame_size: Tuple[int, int]) -> np.ndarray:
+    """Even-odd point-in-polygon test over pixel centres of a ``height x width`` grid."""
+
+    frame_h, frame_w = frame_size
+    poly = to_pixels(points, frame_size) * np.array([width / frame_w, height / frame_h], dtype=np.float32)
+    return _even_odd_mask(poly, 0.0, 0.0, height, width)
+
+
+def _even_odd_mask(poly: np.ndarray, x0: float, y0: float, height: int, width: int) -> np.ndarray:
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32) + 0.5
+    ys += y0
+    xs += x0
+    inside = np.zeros((height, width), dtype=bool)
+    x1, y1 = poly[:, 0], poly[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    for ax, ay, bx, by in zip(x1, y1, x2, y2):
+        if ay == by:
+            continue
+        crosses = (ay > ys) != (by > ys)
+        x_cross = ax + (ys - ay) * (bx - ax) / (by - ay)
+        inside ^= crosses & (xs < x_cross)
+    return inside
+
+
+@dataclass
+class CompiledRoi:
+    """ROI compiled for one frame shape: crop rectangle ``(x1, y1, x2, y2)`` and a mask over it."""
+
+    rect: Tuple[int, int, int, int]
+    mask: np.ndarray
+    frame_size: Tuple[int, int]
+
+    @classmethod
+    def compile(cls, points: np.ndarray, frame_size: Tuple[int, int]) -> "CompiledRoi":
+        frame_h, frame_w = frame_size
+        poly = to_pixels(points, frame_size)
+        x1 = int(np.clip(np.floor(poly[:, 0].min()), 0, frame_w))
+        y1 = int(np.clip(np.floor(poly[:, 1].min()), 0, frame_h))
+        x2 = int(np.clip(np.ceil(poly[:, 0].max()), 0, frame_w))
+        y2 = int(np.clip(np.ceil(poly[:, 1].max()), 0, frame_h))
+        mask = _even_odd_mask(poly, float(x1), float(y1), max(y2 - y1, 0), max(x2 - x1, 0))
+        return cls(rect=(x1, y1, x2, y2), mask=mask, frame_size=frame_size)
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        return self.rect[0], self.rect[1]
+
+    @property
+    def area_ratio(self) -> float:
+        x1, y1, x2, y2 = self.rect
+        return (x2 - x1) * (y2 - y1) / max(self.frame_size[0] * self.frame_size[1], 1)
+
+    def crop(self, image: np.ndarray) -> np.ndarray:
+        x1, y1, x2, y2 = self.rect
+        return image[y1:y2, x1:x2]
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """Vectorized polygon test for ``(N, 2)`` frame-pixel points via the rectangle mask."""
+
+        if not len(points) or not self.mask.size:
+            return np.zeros(len(points), dtype=bool)
+        x1, y1, x2, y2 = self.rect
+        xs = np.floor(points[:, 0]).astype(np.intp) - x1
+        ys = np.floor(points[:, 1]).astype(np.intp) - y1
+        valid = (xs >= 0) & (ys >= 0) & (xs < x2 - x1) & (ys < y2 - y1)
+        inside = np.zeros(len(points), dtype=bool)
+        inside[valid] = self.mask[ys[valid], xs[valid]]
+        return inside
+
+
+@dataclass
+class ChannelRoi:
+    points: np.ndarray
+    compiled: Dict[Tuple[int, int], CompiledRoi] = field(default_factory=dict)
+
+
+class RoiRegistry:
+    """Parsed ROI polygons per channel with compiled masks cached per frame shape."""
+
+    def __init__(self) -> None:
+        self._channels: Dict[str, ChannelRoi] = {}
+        self._lock = threading.Lock()
+
+    def register(self, channel_id: str, roi: Optional[dict], frame_size: Optional[Tuple[int, int]] = None) -> None:
+        """(Re)compile a channel ROI; ``None`` or an empty polygon removes it."""
+
+        points = roi_points(roi)
+        with self._lock:
+            if points is None:
+                self._channels.pop(channel_id, None)
+                return
+            entry = ChannelRoi(points=points)
+            if frame_size is not None:
+                entry.compiled[frame_size] = CompiledRoi.compile(points, frame_size)
+            self._channels[channel_id] = entry
+
+    def remove(self, channel_id: str) -> None:
+        with self._lock:
+            self._channels.pop(channel_id, None)
+
+    def get(self, channel_id: Optional[str], frame_size: Tuple[int, int]) -> Optional[CompiledRoi]:
+        entry = self._channels.get(channel_id) if channel_id is not None else None
+        if entry is None:
+            return None
+        compiled = entry.compiled.get(frame_size)
+        if compiled is None:
+            compiled = entry.compiled.setdefault(frame_size, CompiledRoi.compile(entry.points, frame_size))
+        return compiled
+
+    def __contains__(self, channel_id: object) -> bool:
+        return channel_id in self._channels
+
+    def describe(self) -> dict:
+        return {
+            channel_id: [
+                {"frame_size": list(size), "rect": list(compiled.rect), "area_ratio": round(compiled.area_ratio, 4)}
+                for size, compiled in entry.compiled.items()
+            ]
+            for channel_id, entry in self._channels.items()
+        }
+
+
+roi_registry = RoiRegistry()
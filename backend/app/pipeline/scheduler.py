@@ -0,0 +1,188 @@
+"""FPS scheduling across ingest channels.
+
+Two gates are applied to every decoded frame:
+
+1. *Decimation* keeps each channel at or below its own ``target_fps``.
+2. *Node budget* caps the total frames per second handed to inference. The
+   budget is split with weighted max-min fairness (water-filling) over the
+   measured demand of each channel, so a busy camera can only take the capacity
+   that quieter channels leave unused.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Optional
+
+
+class SchedulerPolicy(str, Enum):
+    fair = "fair"
+    priority = "priority"
+
+
+@dataclass
+class ChannelSchedule:
+    channel_id: str
+    target_fps: float
+    priority: int = 1
+    demand_fps: float = 0.0
+    allocated_fps: float = 0.0
+    next_due: float = 0.0
+    tokens: float = 1.0
+    last_refill: float = 0.0
+    last_arrival: float = 0.0
+    admitted: int = 0
+    decimated: int = 0
+    throttled: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "target_fps": self.target_fps,
+            "priority": self.priority,
+            "demand_fps": round(self.demand_fps, 2),
+            "allocated_fps": round(self.allocated_fps, 2),
+            "admitted": self.admitted,
+            "decimated": self.decimated,
+            "throttled": self.throttled,
+        }
+
+
+class FpsScheduler:
+    """Per-channel decimation plus a node-wide inference budget in frames per second.
+
+    ``node_budget_fps <= 0`` disables the node budget; channels are then only
+    decimated to their ``target_fps``.
+    """
+
+    def __init__(
+        self,
+        node_budget_fps: float = 0.0,
+        policy: SchedulerPolicy = SchedulerPolicy.fair,
+        rebalance_seconds: float = 1.0,
+        demand_smoothing: float = 0.2,
+    ) -> None:
+        self.node_budget_fps = node_budget_fps
+        self.policy = policy
+        self.rebalance_seconds = rebalance_seconds
+        self.demand_smoothing = demand_smoothing
+        self._channels: Dict[str, ChannelSchedule] = {}
+        self._lock = threading.Lock()
+        self._last_rebalance = 0.0
+
+    def register(self, channel_id: str, target_fps: float, priority: int = 1) -> ChannelSchedule:
+        with self._lock:
+            schedule = ChannelSchedule(
+                channel_id=channel_id,
+                target_fps=float(target_fps),
+                priority=max(1, priority),
+                demand_fps=float(target_fps),
+            )
+            self._channels[channel_id] = schedule
+            self._rebalance()
+        return schedule
+
+    def remove(self, channel_id: str) -> None:
+        with self._lock:
+            self._channels.pop(channel_id, None)
+            self._rebalance()
+
+    def decimate(self, channel_id: str, now: Optional[float] = None) -> bool:
+        """Return ``True`` when the frame fits into the channel's ``target_fps``."""
+
+        schedule = self._channels.get(channel_id)
+        if schedule is None:
+            return False
+        if schedule.target_fps <= 0:
+            return True
+        now = time.monotonic() if now is None else now
+        if now < schedule.next_due:
+            schedule.decimated += 1
+            return False
+        period = 1.0 / schedule.target_fps
+        # Keep the cadence aligned, but never accumulate a backlog after a stall.
+        if now - schedule.next_due < period:
+            schedule.next_due += period
+        else:
+            schedule.next_due = now + period
+        return True
+
+    def acquire(self, channel_id: str, now: Optional[float] = None) -> bool:
+        """Take one frame from the node budget on behalf of ``channel_id``."""
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            schedule = self._channels.get(channel_id)
+            if schedule is None:
+                return False
+            self._observe_arrival(schedule, now)
+            if now - self._last_rebalance >= self.rebalance_seconds:
+                self._rebalance(now)
+            if self.node_budget_fps <= 0:
+                schedule.admitted += 1
+                return True
+            elapsed = now - schedule.last_refill if schedule.last_refill else 0.0
+            schedule.last_refill = now
+            # A burst of two frames absorbs arrival jitter without overshooting the allocation.
+            schedule.tokens = min(2.0, schedule.tokens + elapsed * schedule.allocated_fps)
+            if schedule.tokens < 1.0 - 1e-6:
+                schedule.throttled += 1
+                return False
+            schedule.tokens -= 1.0
+            schedule.admitted += 1
+            return True
+
+    def _observe_arrival(self, schedule: ChannelSchedule, now: float) -> None:
+        if schedule.last_arrival:
+            interval = max(now - schedule.last_arrival, 1e-3)
+            rate = min(1.0 / interval, schedule.target_fps or 1.0 / interval)
+            schedule.demand_fps += self.demand_smoothing * (rate - schedule.demand_fps)
+        schedule.last_arrival = now
+
+    def _rebalance(self, now: Optional[float] = None) -> None:
+        self._last_rebalance = time.monotonic() if now is None else now
+        channels = list(self._channels.values())
+        if now is not None:
+            # Channels that stopped sending frames (motion gate, disconnect) release their share.
+            for schedule in channels:
+                idle = now - schedule.last_arrival if schedule.last_arrival else 0.0
+                if idle > 1.0 / max(schedule.demand_fps, 1e-3):
+                    schedule.demand_fps = min(schedule.demand_fps, 1.0 / idle)
+        if self.node_budget_fps <= 0:
+            for schedule in channels:
+                schedule.allocated_fps = schedule.target_fps
+            return
+
+        remaining = self.node_budget_fps
+        pending = channels
+        while pending and remaining > 1e-9:
+            weight_total = sum(self._weight(schedule) for schedule in pending)
+            unit = remaining / weight_total
+            satisfied = [s for s in pending if s.demand_fps <= unit * self._weight(s)]
+            if not satisfied:
+                for schedule in pending:
+                    schedule.allocated_fps = unit * self._weight(schedule)
+                return
+            for schedule in satisfied:
+                schedule.allocated_fps = schedule.demand_fps
+                remaining -= schedule.demand_fps
+            pending = [s for s in pending if s not in satisfied]
+        for schedule in pending:
+            schedule.allocated_fps = 0.0
+
+    def _weight(self, schedule: ChannelSchedule) -> float:
+        return float(schedule.priority) if self.policy == SchedulerPolicy.priority else 1.0
+
+    def channel_stats(self, channel_id: str) -> Optional[dict]:
+        schedule = self._channels.get(channel_id)
+        return schedule.as_dict() if schedule else None
+
+    def describe(self) -> dict:
+        return {
+            "node_budget_fps": self.node_budget_fps,
+            "policy": self.policy.value,
+            "allocated_fps": round(sum(s.allocated_fps for s in self._channels.values()), 2),
+            "channels": {channel_id: s.as_dict() for channel_id, s in self._channels.items()},
+        }
@@ -0,0 +1,496 @@
+"""Zero-copy frame transport over ``multiprocessing.shared_memory``.
+
+Capture workers write decoded frames into preallocated slots of a
+:class:`SharedFramePool`; only a small :class:`SlotHandle` travels through the
+queues. Inference processes attach to the same pool and read frames as NumPy
+views without pickling or copying, then release the slot for reuse.
+
+Each slot carries a generation counter so a stale handle (released or reaped
+slot) is detected instead of silently reading another frame. Slots that stay
+leased longer than the lease timeout are reclaimed by :meth:`SharedFramePool.reap`
+and counted as leaks. The pool counters live in the shared segment too, so
+every attached process reports the same totals.
+
+:class:`SharedFrameBridge` routes handles to inference processes, one queue
+per process; a channel always goes to the same process so its tracker sees
+the frames in order. Whatever the frame handler returns is sent back on the
+bridge's result queue. Channel configuration and other per-channel state the
+main process owns reach the process that handles the channel as
+:class:`WorkerMessage` items on the same queue, ahead of later frames, and
+``report`` output (e.g. metrics) goes back with the results. A frame the handler fails on is counted (``errors``)
+and logged, and the process goes on with the next one; a process that dies
+anyway is replaced by the bridge.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_HEADER_FIELDS = 3  # state, generation, leased_at_ns
+_COUNTERS = ("exhausted", "oversize", "leaks", "stale", "errors")
+_STATE_FREE = 0
+_STATE_LEASED = 1
+_ALIGN = 64
+
+
+class StaleSlotError(RuntimeError):
+    """Raised when a handle refers to a slot that was released or reused."""
+
+
+@dataclass(frozen=True)
+class SlotHandle:
+    slot: int
+    generation: int
+    shape: Tuple[int, ...]
+    dtype: str
+    channel_id: str
+    frame_id: str
+    captured_at: float
+
+
+class SharedFramePool:
+    """Fixed set of equally sized shared-memory frame slots."""
+
+    def __init__(
+        self,
+        slots: int,
+        slot_bytes: int,
+        *,
+        name: Optional[str] = None,
+        create: bool = True,
+        lock: Any = None,
+        inherited: bool = False,
+    ) -> None:
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._header_bytes = -(-(slots * _HEADER_FIELDS + len(_COUNTERS)) * 8 // _ALIGN) * _ALIGN
+        self._stride = -(-slot_bytes // _ALIGN) * _ALIGN
+        size = self._header_bytes + self._stride * slots
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self._owner = create
+        if not create and not inherited:
+            # Only the creating process owns the segment; attached readers must not unlink it on exit.
+            # Child processes (``inherited``) share the creator's resource tracker and must leave it alone.
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._lock = lock if lock is not None else multiprocessing.Lock()
+        self._header = np.ndarray((slots, _HEADER_FIELDS), dtype=np.int64, buffer=self._shm.buf)
+        self._counters = np.ndarray(
+            len(_COUNTERS), dtype=np.int64, buffer=self._shm.buf, offset=slots * _HEADER_FIELDS * 8
+        )
+        if create:
+            self._header[:] = 0
+            self._counters[:] = 0
+        self._cursor = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def exhausted(self) -> int:
+        return int(self._counters[0])
+
+    @property
+    def oversize(self) -> int:
+        return int(self._counters[1])
+
+    @property
+    def leaks(self) -> int:
+        return int(self._counters[2])
+
+    @property
+    def stale(self) -> int:
+        return int(self._counters[3])
+
+    @property
+    def errors(self) -> int:
+        return int(self._counters[4])
+
+    def record_error(self) -> None:
+        """Count a frame an inference process failed on."""
+
+        with self._lock:
+            self._count("errors")
+
+    def _count(self, name: str, value: int = 1) -> None:
+        # Caller holds the lock: counters are shared by every attached process.
+        self._counters[_COUNTERS.index(name)] += value
+
+    def __getstate__(self) -> dict:
+        return {"slots": self.slots, "slot_bytes": self.slot_bytes, "name": self.name, "lock": self._lock}
+
+    def __setstate__(self, state: dict) -> None:
+        # The lock only pickles while a process is being started, so this runs in a child of the creator.
+        self.__init__(
+            state["slots"], state["slot_bytes"], name=state["name"], create=False, lock=state["lock"], inherited=True
+        )
+
+    def _data(self, slot: int, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        offset = self._header_bytes + slot * self._stride
+        return np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
+
+    def write(self, image: np.ndarray, *, channel_id: str, frame_id: str, captured_at: float) -> Optional[SlotHandle]:
+        """Copy a decoded frame into a free slot; ``None`` if the pool is full or the frame too large."""
+
+        if image.nbytes > self.slot_bytes:
+            with self._lock:
+                self._count("oversize")
+            return None
+        with self._lock:
+            for step in range(self.slots):
+                slot = (self._cursor + step) % self.slots
+                if self._header[slot, 0] == _STATE_FREE:
+                    break
+            else:
+                self._count("exhausted")
+                return None
+            self._cursor = (slot + 1) % self.slots
+            self._header[slot, 0] = _STATE_LEASED
+            self._header[slot, 2] = time.monotonic_ns()
+            generation = int(self._header[slot, 1])
+        np.copyto(self._data(slot, image.shape, image.dtype), image)
+        return SlotHandle(
+            slot=slot,
+            generation=generation,
+            shape=tuple(image.shape),
+            dtype=image.dtype.str,
+            channel_id=channel_id,
+            frame_id=frame_id,
+            captured_at=captured_at,
+        )
+
+    def view(self, handle: SlotHandle) -> np.ndarray:
+        """Return a zero-copy view of the frame referenced by ``handle``."""
+
+        if self._header[handle.slot, 0] != _STATE_LEASED or self._header[handle.slot, 1] != handle.generation:
+            with self._lock:
+                self._count("stale")
+            raise StaleSlotError(f"Slot {handle.slot} no longer holds frame {handle.frame_id}")
+        return self._data(handle.slot, handle.shape, np.dtype(handle.dtype))
+
+    def release(self, handle: SlotHandle) -> bool:
+        with self._lock:
+            if self._header[handle.slot, 0] != _STATE_LEASED or self._header[handle.slot, 1] != handle.generation:
+                return False
+            self._free(handle.slot)
+        return True
+
+    def _free(self, slot: int) -> None:
+        self._header[slot, 0] = _STATE_FREE
+        self._header[slot, 1] += 1
+        self._header[slot, 2] = 0
+
+    def reap(self, lease_seconds: float) -> int:
+        """Reclaim slots leased for longer than ``lease_seconds``; returns the number of leaks."""
+
+        deadline = time.monotonic_ns() - int(lease_seconds * 1e9)
+        with self._lock:
+            leaked = np.flatnonzero((self._header[:, 0] == _STATE_LEASED) & (self._header[:, 2] < deadline))
+            for slot in leaked:
+                self._free(int(slot))
+            self._count("leaks", len(leaked))
+        return len(leaked)
+
+    def stats(self) -> dict:
+        leased = int(np.count_nonzero(self._header[:, 0] == _STATE_LEASED))
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "slot_bytes": self.slot_bytes,
+            "leased": leased,
+            "free": self.slots - leased,
+            "exhausted": self.exhausted,
+            "oversize": self.oversize,
+            "leaks": self.leaks,
+            "stale": self.stale,
+            "errors": self.errors,
+        }
+
+    def close(self) -> None:
+        self._header = None
+        self._counters = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# Returns the result sent back to the main process, or ``None``.
+FrameHandler = Callable[[SlotHandle, np.ndarray], Any]
+
+
+@dataclass(frozen=True)
+class InferenceEntryPoints:
+    """Picklable top-level callables an inference process runs.
+
+    ``setup`` runs once when the process starts (e.g. to load models);
+    ``channel_configured`` gets the configuration of a channel registered in
+    ingest, ``channel_removed`` the id of a removed one and ``track_settled``
+    the id of a track whose plate vote settled in the main process.
+    ``report`` is called every ``report_seconds``; what it returns (unless
+    ``None``) is sent back with the results.
+    """
+
+    handler: FrameHandler
+    setup: Optional[Callable[[], None]] = None
+    channel_configured: Optional[Callable[[Any], None]] = None
+    channel_removed: Optional[Callable[[str], None]] = None
+    track_settled: Optional[Callable[[str], None]] = None
+    report: Optional[Callable[[], Any]] = None
+    report_seconds: float = 1.0
+
+
+@dataclass(frozen=True)
+class WorkerMessage:
+    """Control item on a handle queue: call the ``kind`` entry point with ``args``."""
+
+    kind: str
+    args: Tuple[Any, ...] = ()
+
+
+def _dispatch(entry: InferenceEntryPoints, message: WorkerMessage) -> None:
+    callback = getattr(entry, message.kind, None)
+    if callback is None:
+        return
+    try:
+        callback(*message.args)
+    except Exception:
+        logger.exception("Inference process failed to handle %s", message.kind)
+
+
+def _report(entry: InferenceEntryPoints, results: Any) -> None:
+    try:
+        report = entry.report()
+    except Exception:
+        logger.exception("Inference process failed to build its report")
+        return
+    if report is not None:
+        results.put(report)
+
+
+def inference_worker_loop(pool: SharedFramePool, handles: Any, results: Any, entry: InferenceEntryPoints) -> None:
+    """Entry point for inference processes: read handles, process views, release slots.
+
+    A ``None`` item on the queue stops the loop; :class:`WorkerMessage` items
+    go to the matching entry point.
+    """
+
+    if entry.setup is not None:
+        entry.setup()
+    last_report = time.monotonic()
+    while True:
+        if entry.report is not None and time.monotonic() - last_report >= entry.report_seconds:
+            last_report = time.monotonic()
+            _report(entry, results)
+        try:
+            handle = handles.get(timeout=entry.report_seconds)
+        except queue.Empty:
+            continue
+        if handle is None:
+            if entry.report is not None:
+                _report(entry, results)
+            break
+        if isinstance(handle, WorkerMessage):
+            _dispatch(entry, handle)
+            continue
+        try:
+            image = pool.view(handle)
+        except StaleSlotError:
+            continue
+        try:
+            output = entry.handler(handle, image)
+        except Exception:
+            # One bad frame must not take the channels of this process down with it.
+            pool.record_error()
+            logger.exception("Inference failed on frame %s of channel %s", handle.frame_id, handle.channel_id)
+            continue
+        finally:
+            pool.release(handle)
+        if output is not None:
+            results.put(output)
+
+
+class SharedFrameBridge(threading.Thread):
+    """Moves slot handles from ingest ring buffers to the inference processes.
+
+    Once per second the bridge also reaps leaked slots, so a crashed inference
+    process cannot exhaust the pool, and replaces inference processes that
+    died (with a fresh handle queue: the old one may be left locked); the
+    replacement gets the configuration of its channels again. Queues and
+    processes come from ``context`` (the pool lock must be created in the same
+    one).
+    """
+
+    def __init__(
+        self,
+        pool: SharedFramePool,
+        pop_frames: Callable[[], Iterable[Any]],
+        *,
+        queue_size: int = 64,
+        lease_seconds: float = 5.0,
+        context: Any = None,
+        join_seconds: float = 5.0,
+    ) -> None:
+        super().__init__(name="shm-bridge", daemon=True)
+        self.pool = pool
+        self.pop_frames = pop_frames
+        self.queue_size = queue_size
+        self.lease_seconds = lease_seconds
+        self.join_seconds = join_seconds
+        self.context = context or multiprocessing.get_context()
+        self.queues: List[Any] = []
+        self.results = self.context.Queue(maxsize=queue_size)
+        self.forwarded = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.workers: List[Any] = []
+        self.entry: Optional[InferenceEntryPoints] = None
+        # Last ``channel_configured`` message per channel, replayed to a replaced process.
+        self.channels: Dict[str, WorkerMessage] = {}
+        self._stop_event = threading.Event()
+
+    def _spawn(self, index: int) -> Tuple[Any, Any]:
+        handles = self.context.Queue(maxsize=self.queue_size)
+        process = self.context.Process(
+            target=inference_worker_loop,
+            args=(self.pool, handles, self.results, self.entry),
+            name=f"inference-{index}",
+            daemon=True,
+        )
+        process.start()
+        return handles, process
+
+    def spawn_workers(self, entry: InferenceEntryPoints, count: int) -> List[Any]:
+        """Start ``count`` inference processes, each with its own handle queue."""
+
+        self.entry = entry
+        for index in range(len(self.workers), len(self.workers) + count):
+            handles, process = self._spawn(index)
+            self.queues.append(handles)
+            self.workers.append(process)
+        return self.workers
+
+    def _respawn_dead(self) -> int:
+        restarted = 0
+        for index, process in enumerate(self.workers):
+            if process.is_alive():
+                continue
+            logger.warning("Inference process %s exited with code %s, restarting", process.name, process.exitcode)
+            stale = self.queues[index]
+            # Handles still queued are reclaimed by the lease reaper.
+            stale.cancel_join_thread()
+            stale.close()
+            process.join(timeout=0)
+            self.queues[index], self.workers[index] = self._spawn(index)
+            for channel_id, message in list(self.channels.items()):
+                if self._index(channel_id) == index:
+                    self.send(channel_id, message)
+            restarted += 1
+        self.restarts += restarted
+        return restarted
+
+    def _index(self, channel_id: str) -> int:
+        return zlib.crc32(channel_id.encode("utf-8")) % len(self.queues)
+
+    def _queue(self, channel_id: str) -> Any:
+        return self.queues[self._index(channel_id)]
+
+    def send(self, channel_id: str, message: WorkerMessage, timeout: float = 1.0) -> bool:
+        """Queue ``message`` for the process that owns ``channel_id``; ``False`` if its queue stayed full."""
+
+        if not self.queues:
+            return False
+        try:
+            self._queue(channel_id).put(message, timeout=timeout)
+        except queue.Full:
+            return False
+        return True
+
+    def configure_channel(self, channel_id: str, config: Any, timeout: float = 1.0) -> bool:
+        """Send ``config`` to the process that owns ``channel_id`` (and to any process replacing it)."""
+
+        message = WorkerMessage("channel_configured", (config,))
+        self.channels[channel_id] = message
+        return self.send(channel_id, message, timeout)
+
+    def remove_channel(self, channel_id: str, timeout: float = 1.0) -> bool:
+        """Tell the process that owns ``channel_id`` to drop its state; ``False`` if its queue stayed full."""
+
+        self.channels.pop(channel_id, None)
+        return self.send(channel_id, WorkerMessage("channel_removed", (channel_id,)), timeout)
+
+    def drain_results(self, limit: int = 64) -> List[Any]:
+        """Results the inference processes sent back, without blocking."""
+
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=self.join_seconds)
+        for handles in self.queues:
+            try:
+                handles.put(None, timeout=self.join_seconds)
+            except queue.Full:
+                pass
+        deadline = time.monotonic() + self.join_seconds
+        for process in self.workers:
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                # Blocked on a full result queue or a stuck model call.
+                process.terminate()
+                process.join(timeout=1.0)
+        for handles in [*self.queues, self.results]:
+            handles.cancel_join_thread()
+            handles.close()
+        self.workers.clear()
+        self.queues.clear()
+
+    def run(self) -> None:
+        last_reap = time.monotonic()
+        while not self._stop_event.is_set():
+            moved = False
+            for frame in self.pop_frames():
+                moved = True
+                try:
+                    if not self.queues:
+                        raise queue.Full
+                    self._queue(frame.channel_id).put_nowait(frame.image)
+                    self.forwarded += 1
+                except queue.Full:
+                    self.pool.release(frame.image)
+                    self.rejected += 1
+            now = time.monotonic()
+            if now - last_reap >= 1.0:
+                self.pool.reap(self.lease_seconds)
+                self._respawn_dead()
+                last_reap = now
+            if not moved:
+                self._stop_event.wait(0.005)
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self.workers),
+            "alive_workers": sum(process.is_alive() for process in self.workers),
+            "forwarded": self.forwarded,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "pool": self.pool.stats(),
+        }
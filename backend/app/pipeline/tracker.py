@@ -0,0 +1,353 @@
+"""SORT / ByteTrack multi-object tracker with array-backed Kalman state.
+
+Every channel gets one :class:`Tracker` with a fixed ``capacity``. All track
+state (Kalman mean and covariance, hit counters, ages, ids) lives in
+preallocated NumPy arrays, so memory does not grow with traffic. Prediction and
+correction are batched over all live tracks; association uses a ``1 - IoU``
+cost matrix solved with optimal (Hungarian) assignment. Track direction comes
+from the displacement of box centres over a short ring buffer of positions.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.pipeline.geometry import paired_iou, pairwise_iou
+from app.pipeline.ingest_manager import ChannelDirection
+from app.pipeline.recognition import DetectionArray, TrackArray, TrackerSettings, TrackerType
+
+_INFEASIBLE = 1e5
+# Heading codes (-1 up, 0 unknown, +1 down) indexed by ``heading + 1``.
+_HEADINGS = (ChannelDirection.up, ChannelDirection.any, ChannelDirection.down)
+
+
+def _hungarian(cost: np.ndarray) -> np.ndarray:
+    """Shortest augmenting path assignment for ``n <= m``; returns the column of each row."""
+
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.intp)
+    way = np.zeros(m + 1, dtype=np.intp)
+    for row in range(1, n + 1):
+        p[0] = row
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    assignment = np.full(n, -1, dtype=np.intp)
+    cols = np.flatnonzero(p[1:])
+    assignment[p[cols + 1] - 1] = cols
+    return assignment
+
+
+def linear_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum-cost assignment; uses SciPy when installed, otherwise a NumPy Hungarian solver."""
+
+    if cost.size == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        transposed = cost.shape[0] > cost.shape[1]
+        matrix = cost.T if transposed else cost
+        cols = _hungarian(np.asarray(matrix, dtype=np.float64))
+        rows = np.arange(len(cols))
+        return (cols, rows) if transposed else (rows, cols)
+    rows, cols = linear_sum_assignment(cost)
+    return rows.astype(np.intp), cols.astype(np.intp)
+
+
+def _to_measurement(boxes: np.ndarray) -> np.ndarray:
+    w = boxes[:, 2] - boxes[:, 0]
+    h = boxes[:, 3] - boxes[:, 1]
+    return np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w, h], axis=1).astype(np.float64)
+
+
+def _to_boxes(state: np.ndarray) -> np.ndarray:
+    cx, cy, w, h = state[:, 0], state[:, 1], np.abs(state[:, 2]), np.abs(state[:, 3])
+    return np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1).astype(np.float32)
+
+
+class Tracker:
+    """Constant-velocity Kalman tracker over ``cx, cy, w, h`` with SORT or ByteTrack association."""
+
+    _F = np.eye(8)
+    _F[:4, 4:] = np.eye(4)
+    _H = np.eye(4, 8)
+    _std_position = 1.0 / 20
+    _std_velocity = 1.0 / 160
+
+    def __init__(
+        self,
+        settings: TrackerSettings,
+        *,
+        capacity: int = 64,
+        prefix: str = "",
+        high_threshold: float = 0.5,
+        low_threshold: float = 0.1,
+        coast_decay: float = 0.9,
+    ) -> None:
+        self.settings = settings
+        self.capacity = capacity
+        self.prefix = prefix
+        self.high_threshold = high_threshold
+        self.low_threshold = low_threshold
+        self.coast_decay = coast_decay
+        self.mean = np.zeros((capacity, 8))
+        self.covariance = np.zeros((capacity, 8, 8))
+        self.active = np.zeros(capacity, dtype=bool)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.hits = np.zeros(capacity, dtype=np.int32)
+        self.misses = np.zeros(capacity, dtype=np.int32)
+        self.scores = np.zeros(capacity, dtype=np.float32)
+        # Frames a track has been propagated by prediction alone since its last detector update.
+        self.coasted = np.zeros(capacity, dtype=np.int32)
+        # Ring buffer of recent box centres per slot; one column per tracker frame.
+        self.window = max(2, settings.direction_window)
+        self.history = np.zeros((capacity, self.window, 2), dtype=np.float32)
+        self.history_len = np.zeros(capacity, dtype=np.int32)
+        self.heading = np.zeros(capacity, dtype=np.int8)
+        self._next_id = itertools.count(1)
+        # (track id, hits) of tracks closed since the last drain.
+        self._closed: List[Tuple[str, int]] = []
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.evicted = 0
+        self.overflow = 0
+        self.last_drift: Optional[float] = None
+        self.last_spawned = 0
+
+    @property
+    def live_count(self) -> int:
+        return int(self.active.sum())
+
+    def _noise(self, heights: np.ndarray, position: float, velocity: float) -> np.ndarray:
+        std = np.stack(
+            [heights * position, heights * position, heights * position, heights * position,
+             heights * velocity, heights * velocity, heights * velocity, heights * velocity],
+            axis=1,
+        )
+        return np.einsum("ni,ij->nij", std**2, np.eye(8))
+
+    def _predict(self, slots: np.ndarray) -> None:
+        if not len(slots):
+            return
+        mean = self.mean[slots] @ self._F.T
+        q = self._noise(np.maximum(mean[:, 3], 1.0), self._std_position, self._std_velocity)
+        self.mean[slots] = mean
+        self.covariance[slots] = self._F @ self.covariance[slots] @ self._F.T + q
+
+    def _correct(self, slots: np.ndarray, measurements: np.ndarray) -> None:
+        if not len(slots):
+            return
+        mean, cov = self.mean[slots], self.covariance[slots]
+        r = self._noise(np.maximum(measurements[:, 3], 1.0), self._std_position, 0.0)[:, :4, :4]
+        projected = self._H @ cov @ self._H.T + r
+        gain = cov @ self._H.T @ np.linalg.inv(projected)
+        innovation = measurements - mean[:, :4]
+        self.mean[slots] = mean + np.einsum("nij,nj->ni", gain, innovation)
+        self.covariance[slots] = cov - gain @ self._H @ cov
+
+    def _associate(self, slots: np.ndarray, boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(slots) or not len(boxes):
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        cost = 1.0 - pairwise_iou(_to_boxes(self.mean[slots]), boxes)
+        cost[cost > 1.0 - self.settings.match_iou_threshold] = _INFEASIBLE
+        rows, cols = linear_assignment(cost)
+        valid = cost[rows, cols] < _INFEASIBLE
+        return rows[valid], cols[valid]
+
+    def _spawn(self, measurements: np.ndarray, scores: np.ndarray) -> None:
+        for measurement, score in zip(measurements, scores):
+            free = np.flatnonzero(~self.active)
+            if not len(free):
+                # Reuse the slot of the longest-missing track, if any track is currently lost.
+                candidate = int(np.argmax(np.where(self.active, self.misses, -1)))
+                if self.misses[candidate] == 0:
+                    self.overflow += 1
+                    continue
+                slot = candidate
+                self.evicted += 1
+                self._closed.append(self._closed_track(slot))
+            else:
+                slot = int(free[0])
+            self.active[slot] = True
+            self.ids[slot] = next(self._next_id)
+            self.hits[slot] = 1
+            self.misses[slot] = 0
+            self.coasted[slot] = 0
+            self.history_len[slot] = 0
+            self.heading[slot] = 0
+            self.scores[slot] = score
+            self.mean[slot] = 0.0
+            self.mean[slot, :4] = measurement
+            height = max(measurement[3], 1.0)
+            std = np.array([2, 2, 2, 2, 10, 10, 10, 10]) * self._std_position * height
+            self.covariance[slot] = np.diag(std**2)
+
+    def update(self, detections: DetectionArray) -> TrackArray:
+        """Advance all tracks by one frame and fold in this frame's detections."""
+
+        with self._lock:
+            self.frames += 1
+            slots = np.flatnonzero(self.active)
+            self._predict(slots)
+
+            boxes, scores = detections.boxes, detections.scores
+            if self.settings.tracker == TrackerType.bytetrack:
+                first = np.flatnonzero(scores >= self.high_threshold)
+                second = np.flatnonzero((scores >= self.low_threshold) & (scores < self.high_threshold))
+            else:
+                first = np.arange(len(scores))
+                second = np.zeros(0, dtype=np.intp)
+
+            rows, cols = self._associate(slots, boxes[first])
+            matched_slots = slots[rows]
+            matched_dets = first[cols]
+            remaining = np.setdiff1d(slots, matched_slots, assume_unique=True)
+            if len(second) and len(remaining):
+                rows2, cols2 = self._associate(remaining, boxes[second])
+                matched_slots = np.concatenate([matched_slots, remaining[rows2]])
+                matched_dets = np.concatenate([matched_dets, second[cols2]])
+
+            self._measure_drift(matched_slots, boxes[matched_dets])
+            self._correct(matched_slots, _to_measurement(boxes[matched_dets]))
+            self.hits[matched_slots] += 1
+            self.misses[slots] += 1
+            self.misses[matched_slots] = 0
+            self.scores[matched_slots] = scores[matched_dets]
+
+            expired = slots[self.misses[slots] > self.settings.max_age]
+            self.active[expired] = False
+            self.evicted += len(expired)
+            self._closed.extend(self._closed_track(slot) for slot in expired)
+
+            self.coasted[slots] = 0
+            unmatched = np.setdiff1d(first, matched_dets, assume_unique=True)
+            live = self.live_count
+            self._spawn(_to_measurement(boxes[unmatched]), scores[unmatched])
+            self.last_spawned = self.live_count - live
+            self._record_history(np.flatnonzero(self.active))
+            return self._emit()
+
+    def coast(self) -> TrackArray:
+        """Advance all tracks by one frame on motion prediction alone (no detector run).
+
+        Track confidence decays by ``coast_decay`` per coasted frame, which lets
+        callers schedule the next detector run once predictions get unreliable.
+        """
+
+        with self._lock:
+            self.frames += 1
+            slots = np.flatnonzero(self.active)
+            self._predict(slots)
+            self.coasted[slots] += 1
+            self.scores[slots] *= self.coast_decay
+            self._record_history(slots)
+            return self._emit()
+
+    def _record_history(self, slots: np.ndarray) -> None:
+        """Append current centres and re-derive headings from the trajectory displacement.
+
+        The displacement between the newest and oldest centre in the window is
+        normalized by box height; a heading is kept until the track clearly
+        moves the other way, so a vehicle stopped at a barrier keeps it.
+        """
+
+        if not len(slots):
+            return
+        col = self.frames % self.window
+        self.history[slots, col] = self.mean[slots, :2]
+        self.history_len[slots] = np.minimum(self.history_len[slots] + 1, self.window)
+        oldest = (col - self.history_len[slots] + 1) % self.window
+        dy = self.history[slots, col, 1] - self.history[slots, oldest, 1]
+        moved = dy / np.maximum(np.abs(self.mean[slots, 3]), 1.0)
+        threshold = self.settings.direction_min_displacement
+        self.heading[slots] = np.where(moved < -threshold, -1, np.where(moved > threshold, 1, self.heading[slots]))
+
+    def _measure_drift(self, slots: np.ndarray, boxes: np.ndarray) -> None:
+        # Drift of the motion model: 1 - IoU between the predicted box of a coasted track and its new detection.
+        coasted = self.coasted[slots] > 0
+        if not coasted.any():
+            self.last_drift = None
+            return
+        iou = paired_iou(_to_boxes(self.mean[slots[coasted]]), boxes[coasted])
+        self.last_drift = float(1.0 - iou.mean())
+
+    def min_visible_score(self) -> float:
+        visible = self.active & (self.misses == 0)
+        return float(self.scores[visible].min()) if visible.any() else 1.0
+
+    def _track_id(self, slot: int) -> str:
+        return f"{self.prefix}{self.ids[slot]}"
+
+    def _closed_track(self, slot: int) -> Tuple[str, int]:
+        return self._track_id(slot), int(self.hits[slot])
+
+    def drain_closed(self) -> Dict[str, int]:
+        """Return ids of tracks evicted since the previous call with the number of frames each was detected in."""
+
+        with self._lock:
+            closed, self._closed = self._closed, []
+        return dict(closed)
+
+    def close_all(self) -> Dict[str, int]:
+        """Close every live track; returns them together with tracks closed since the last drain."""
+
+        with self._lock:
+            slots = np.flatnonzero(self.active)
+            self.active[slots] = False
+            closed, self._closed = self._closed + [self._closed_track(slot) for slot in slots], []
+        return dict(closed)
+
+    def _emit(self) -> TrackArray:
+        visible = self.active & (self.misses == 0)
+        visible &= (self.hits >= self.settings.min_hits) | (self.frames <= self.settings.min_hits)
+        slots = np.flatnonzero(visible)
+        return TrackArray(
+            track_ids=[self._track_id(slot) for slot in slots],
+            boxes=_to_boxes(self.mean[slots]),
+            directions=[_HEADINGS[code + 1] for code in self.heading[slots].tolist()],
+            scores=self.scores[slots],
+            hits=self.hits[slots],
+        )
+
+    def describe(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "live": self.live_count,
+            "frames": self.frames,
+            "evicted": self.evicted,
+            "overflow": self.overflow,
+            "last_drift": round(self.last_drift, 4) if self.last_drift is not None else None,
+        }
+
+
+def build_tracker(settings: TrackerSettings, channel_id: Optional[str], capacity: int) -> Tracker:
+    prefix = f"{channel_id}-" if channel_id else ""
+    return Tracker(settings, capacity=capacity, prefix=prefix)
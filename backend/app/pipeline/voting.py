@@ -0,0 +1,222 @@
+"""Streaming per-track plate voting.
+
+Each OCR read of a track is folded into a :class:`PlateVote` once, in
+O(plate length): per-position score tables accumulate the read confidence of
+every character, and the leading character of a position is updated in place
+(scores only grow, so only the character just incremented can take the lead).
+The voted plate and its confidence are cached after each fold and read in O(1).
+
+Confidence is the mean, over the voted positions, of the winning character's
+score divided by the number of reads: unanimous reads at confidence ``c`` give
+``c``, and disagreement lowers it in proportion to the dissenting confidence.
+
+With a confusion cost table the vote is alignment-aware: each read is first
+aligned to the current consensus by weighted edit distance (look-alike
+substitutions such as ``0``/``O`` are cheap), so one dropped or extra
+character no longer shifts every later position. A consensus position the
+read skips gets a vote for "no character"; a character the read inserts is
+scored per gap and becomes a new position once, from the third read on, most
+of the read confidence supports it.
+
+A vote is settled once the voted plate survived ``reads`` consecutive folds
+(``streak``) at sufficient confidence; callers use it to stop OCR on a track
+and to emit its event.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+ConfusionCosts = Dict[Tuple[str, str], float]
+
+_GAP = ""
+
+
+def confusion_costs(similar: Mapping[str, str], cost: float = 0.25) -> ConfusionCosts:
+    """Symmetric substitution costs for look-alike pairs; any other substitution costs 1."""
+
+    costs: ConfusionCosts = {}
+    for a, b in similar.items():
+        costs[(a, b)] = costs[(b, a)] = cost
+    return costs
+
+
+def align(
+    reference: str,
+    read: str,
+    costs: ConfusionCosts,
+    indel: float = 1.0,
+    weak: Optional[Sequence[bool]] = None,
+) -> List[Tuple[Optional[int], Optional[int]]]:
+    """Minimum-cost alignment as ``(reference_idx, read_idx)`` pairs; ``None`` marks a gap.
+
+    Skipping a ``weak`` reference position (one the vote currently considers
+    absent) costs half an indel, so ambiguous reads do not vote characters into it.
+    """
+
+    n, m = len(reference), len(read)
+    skip = [indel * 0.5 if weak and weak[i] else indel for i in range(n)]
+    dist = [[j * indel for j in range(m + 1)]]
+    for i in range(1, n + 1):
+        prev, a, drop = dist[i - 1], reference[i - 1], skip[i - 1]
+        row = [prev[0] + drop]
+        for j in range(1, m + 1):
+            b = read[j - 1]
+            sub = prev[j - 1] + (0.0 if a == b else costs.get((a, b), 1.0))
+            row.append(min(sub, prev[j] + drop, row[j - 1] + indel))
+        dist.append(row)
+    pairs: List[Tuple[Optional[int], Optional[int]]] = []
+    i, j = n, m
+    while i or j:
+        if i and j:
+            a, b = reference[i - 1], read[j - 1]
+            if dist[i][j] == dist[i - 1][j - 1] + (0.0 if a == b else costs.get((a, b), 1.0)):
+                pairs.append((i - 1, j - 1))
+                i, j = i - 1, j - 1
+                continue
+        if i and dist[i][j] == dist[i - 1][j] + skip[i - 1]:
+            pairs.append((i - 1, None))
+            i -= 1
+        else:
+            pairs.append((None, j - 1))
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+
+class PlateVote:
+    """Per-position character scores over all reads of one track."""
+
+    __slots__ = (
+        "max_length",
+        "scores",
+        "best_chars",
+        "best_scores",
+        "lengths",
+        "count",
+        "best_read",
+        "costs",
+        "weight",
+        "inserts",
+        "streak",
+        "_text",
+        "_confidence",
+    )
+
+    def __init__(self, max_length: int = 12, costs: Optional[ConfusionCosts] = None) -> None:
+        self.max_length = max_length
+        self.costs = costs
+        self.weight = 0.0
+        # Aligned mode: per gap (number of consensus positions before it), scores of inserted characters.
+        self.inserts: Dict[int, Dict[str, float]] = {}
+        self.scores: List[Dict[str, float]] = []
+        self.best_chars: List[str] = []
+        self.best_scores: List[float] = []
+        self.lengths: Dict[int, float] = {}
+        self.count = 0
+        self.best_read: Tuple[str, float] = ("", 0.0)
+        # Consecutive folds, including the one that produced it, after which the voted plate was unchanged.
+        self.streak = 0
+        self._text = ""
+        self._confidence = 0.0
+
+    def add(self, text: str, confidence: float) -> None:
+        text = text.upper()[: self.max_length]
+        if not text:
+            return
+        if confidence > self.best_read[1]:
+            self.best_read = (text, confidence)
+        if self.costs is not None and self.count:
+            self._add_aligned(text, confidence)
+        else:
+            self.lengths[len(text)] = self.lengths.get(len(text), 0.0) + confidence
+            for idx, ch in enumerate(text):
+                self._vote(idx, ch, confidence)
+        self.count += 1
+        self.weight += confidence
+        if self.costs is not None:
+            self._promote_inserts()
+        previous = self._text
+        self._refresh()
+        self.streak = self.streak + 1 if self._text == previous else 1
+
+    def _vote(self, idx: int, ch: str, confidence: float) -> None:
+        while len(self.scores) <= idx:
+            self.scores.append({})
+            self.best_chars.append("")
+            self.best_scores.append(0.0)
+        table = self.scores[idx]
+        score = table.get(ch, 0.0) + confidence
+        table[ch] = score
+        if score > self.best_scores[idx]:
+            self.best_scores[idx] = score
+            self.best_chars[idx] = ch
+
+    def _reference(self) -> str:
+        # Positions currently voted empty align on their strongest character so they can be re-voted.
+        return "".join(
+            ch or max((key for key in table if key), key=table.get)
+            for ch, table in zip(self.best_chars, self.scores)
+        )
+
+    def _add_aligned(self, text: str, confidence: float) -> None:
+        if text == self._text and len(text) == len(self.best_chars):
+            # Read agrees with a consensus that has no empty positions: nothing to align.
+            for idx, ch in enumerate(text):
+                self._vote(idx, ch, confidence)
+            return
+        gap = 0
+        inserted = set()
+        weak = [not ch for ch in self.best_chars]
+        for ref_idx, read_idx in align(self._reference(), text, self.costs, weak=weak):
+            if ref_idx is None:
+                # Only the first character a read inserts into a gap is scored.
+                if gap not in inserted:
+                    inserted.add(gap)
+                    table = self.inserts.setdefault(gap, {})
+                    table[text[read_idx]] = table.get(text[read_idx], 0.0) + confidence
+                continue
+            self._vote(ref_idx, _GAP if read_idx is None else text[read_idx], confidence)
+            gap = ref_idx + 1
+
+    def _promote_inserts(self) -> None:
+        # A single read never creates a position on its own: wait for a third read before promoting.
+        if self.count < 3:
+            return
+        for gap in sorted(self.inserts):
+            table = self.inserts[gap]
+            supported = sum(table.values())
+            if supported <= self.weight - supported:
+                continue
+            # Earlier reads that did not insert here implicitly voted "no character".
+            del self.inserts[gap]
+            self.scores.insert(gap, {**table, _GAP: self.weight - supported})
+            best = max(self.scores[gap], key=self.scores[gap].get)
+            self.best_chars.insert(gap, best)
+            self.best_scores.insert(gap, self.scores[gap][best])
+            self.inserts = {(key + 1 if key > gap else key): value for key, value in self.inserts.items()}
+            return
+
+    def _refresh(self) -> None:
+        if self.costs is None:
+            length = max(self.lengths, key=self.lengths.get)
+            voted = [idx for idx in range(length) if self.best_chars[idx]]
+        else:
+            voted = [idx for idx, ch in enumerate(self.best_chars) if ch]
+        self._text = "".join(self.best_chars[idx] for idx in voted)
+        total = sum(self.best_scores[idx] for idx in voted)
+        self._confidence = total / (len(voted) * self.count) if voted else 0.0
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def confidence(self) -> float:
+        return self._confidence
+
+    def result(self) -> Tuple[str, float]:
+        return self._text, self._confidence
+
+    def settled(self, reads: int, min_confidence: float = 0.0) -> bool:
+        return bool(self._text) and self.streak >= reads and self._confidence >= min_confidence
@@ -6,6 +6,7 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from app.core.plates import plate_key
 from app.db.models import PlateListType
 
 
@@ -53,17 +54,42 @@ class RulesEngine:
     default_actions: RuleAction
     lists: dict[str, PlateListPayload] = field(default_factory=dict)
     rules: list[RuleDefinition] = field(default_factory=list)
+    # Confusion-class key of an item pattern -> list id -> items with that key.
+    plate_index: dict[str, dict[str, list[dict[str, Any]]]] = field(default_factory=dict)
 
     def register_list(self, payload: PlateListPayload) -> PlateListPayload:
+        if payload.id in self.lists:
+            self._unindex_list(payload.id)
         self.lists[payload.id] = payload
+        for item in payload.items:
+            self._index_item(payload.id, item)
         return payload
 
     def add_item(self, list_id: str, item: dict[str, Any]) -> PlateListPayload:
         if list_id not in self.lists:
             raise KeyError(f"List {list_id} not found")
         self.lists[list_id].items.append(item)
+        self._index_item(list_id, item)
         return self.lists[list_id]
 
+    def _index_item(self, list_id: str, item: dict[str, Any]) -> None:
+        key = plate_key(item.get("pattern"))
+        if key:
+            self.plate_index.setdefault(key, {}).setdefault(list_id, []).append(item)
+
+    def _unindex_list(self, list_id: str) -> None:
+        for item in self.lists[list_id].items:
+            entries = self.plate_index.get(plate_key(item.get("pattern")))
+            if entries is not None:
+                entries.pop(list_id, None)
+
+    def match_lists(self, plate: str) -> list[tuple[PlateListPayload, list[dict[str, Any]]]]:
+        """Lists holding ``plate`` up to look-alike characters, by priority, with the matching items."""
+
+        entries = self.plate_index.get(plate_key(plate), {})
+        matched = [(self.lists[list_id], items) for list_id, items in entries.items() if items]
+        return sorted(matched, key=lambda entry: entry[0].priority)
+
     def register_rule(self, rule: RuleDefinition) -> RuleDefinition:
         self.rules.append(rule)
         return rule
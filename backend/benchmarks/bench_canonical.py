@@ -0,0 +1,104 @@
+"""Microbenchmarks: template-aware canonicalization vs. the blind look-alike swap.
+
+The legacy path is the old ``Postprocessor.normalize`` (per-character dict
+swap in both directions) followed by the country match. Before timing, every
+``match`` plate of :mod:`benchmarks.country_corpus` for the strict templates
+(``eu`` allows letters and digits anywhere) must canonicalize to itself, and
+every spelling of it with look-alike characters must share its confusion key
+and canonicalize to a plate of some template. The script reports how many
+spellings recover the original plate; the rest are genuinely ambiguous (for
+example ``HEOOOOTT`` fits ``kz`` as ``HEO000TT`` with fewer changes).
+Run from ``backend/``::
+
+    python -m benchmarks.bench_canonical
+"""
+
+from __future__ import annotations
+
+import itertools
+import time
+
+import numpy as np
+
+from app.core.plates import LOOKALIKE_DIGITS, plate_key
+from app.pipeline.canonical import PlateCanonicalizer
+from app.pipeline.country_matcher import CountryMatcher
+from app.pipeline.postprocess import Postprocessor, _default_country_patterns
+from benchmarks.country_corpus import CORPUS
+
+SWAPS = {**LOOKALIKE_DIGITS, **{digit: letter for letter, digit in LOOKALIKE_DIGITS.items()}}
+
+
+def legacy_normalizer(matcher: CountryMatcher):
+    similar = Postprocessor._similar_chars_map
+
+    def normalize(text: str):
+        normalized = text.strip().upper().replace(" ", "").replace("-", "")
+        normalized = "".join(similar.get(ch, ch) for ch in normalized)
+        return normalized, matcher.match(normalized)
+
+    return normalize
+
+
+def spellings(plate: str) -> list[str]:
+    """Every spelling of ``plate`` with look-alike characters swapped."""
+
+    options = [(ch, SWAPS[ch]) if ch in SWAPS else (ch,) for ch in plate]
+    return ["".join(chars) for chars in itertools.product(*options)]
+
+
+def check_corpus(canonicalizer: PlateCanonicalizer) -> tuple[int, int, int]:
+    checked = recovered = legacy_ok = 0
+    legacy = legacy_normalizer(canonicalizer.matcher)
+    for code in ("ru", "by", "kz", "ua"):
+        for plate in CORPUS[code]["match"]:
+            assert canonicalizer.canonicalize(plate) == (plate, code.upper()), plate
+            for spelling in spellings(plate):
+                canonical, country = canonicalizer.canonicalize(spelling)
+                assert country is not None, (spelling, plate)
+                assert plate_key(spelling) == plate_key(plate) == plate_key(canonical), (spelling, plate)
+                recovered += (canonical, country) == (plate, code.upper())
+                legacy_ok += legacy(spelling) == (plate, code.upper())
+                checked += 1
+    return checked, recovered, legacy_ok
+
+
+def bench(label: str, func, plates: list[str], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for plate in plates:
+            func(plate)
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<30} {best / len(plates) * 1e9:8.0f} ns per read")
+    return best
+
+
+def main() -> None:
+    matcher = CountryMatcher((code, pattern) for code, pattern in _default_country_patterns.items())
+    checked, recovered, legacy_ok = check_corpus(PlateCanonicalizer(matcher, max_plates=0))
+    print(f"corpus: {checked} look-alike spellings, original plate recovered for {recovered} (legacy {legacy_ok})")
+
+    rng = np.random.default_rng(0)
+    plates = [plate for code in ("ru", "by", "kz", "ua") for plate in CORPUS[code]["match"]]
+    reads = []
+    for _ in range(20_000):
+        options = spellings(plates[rng.integers(len(plates))])
+        reads.append(options[rng.integers(len(options))])
+    legacy = legacy_normalizer(CountryMatcher(matcher_templates(matcher), max_plates=0))
+    print("unique reads (memo disabled)")
+    bench("normalize + match (legacy)", legacy, reads)
+    bench("PlateCanonicalizer", PlateCanonicalizer(matcher, max_plates=0).canonicalize, reads)
+    bench("plate_key", plate_key, reads)
+    print("track stream (20 reads per spelling)")
+    stream = [read for read in reads[:1_000] for _ in range(20)]
+    bench("normalize + match (legacy)", legacy_normalizer(matcher), stream)
+    bench("PlateCanonicalizer", PlateCanonicalizer(matcher).canonicalize, stream)
+
+
+def matcher_templates(matcher: CountryMatcher) -> list[tuple[str, str]]:
+    return [(template.code, template.pattern) for template in matcher.templates]
+
+
+if __name__ == "__main__":
+    main()
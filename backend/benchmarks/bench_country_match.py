@@ -0,0 +1,103 @@
+"""Microbenchmarks: compiled country matcher vs. trying every template regex in order.
+
+The legacy path is the old ``Postprocessor._match_country`` loop. Before
+timing, the script checks every country of :mod:`benchmarks.country_corpus`
+against a single-template matcher and checks that the combined matcher agrees
+with the loop on the corpus and on random plates. Unique plates measure the
+signature buckets alone (memo disabled); the track stream re-submits each plate
+as every read of a track does. Run from ``backend/``::
+
+    python -m benchmarks.bench_country_match
+"""
+
+from __future__ import annotations
+
+import re
+import time
+
+import numpy as np
+
+from app.pipeline.country_matcher import CountryMatcher
+from app.pipeline.postprocess import _default_country_patterns
+from benchmarks.country_corpus import CORPUS
+
+LETTERS = "ABCEHKMOPTXУ"
+DIGITS = "0123456789"
+
+
+def legacy_matcher(patterns: dict[str, str]):
+    compiled = [(code.upper(), re.compile(pattern, re.IGNORECASE)) for code, pattern in patterns.items()]
+
+    def match(plate: str):
+        for code, pattern in compiled:
+            if pattern.match(plate):
+                return code
+        return None
+
+    return match
+
+
+def random_plates(count: int, rng: np.random.Generator) -> list[str]:
+    layouts = ["LDDDLLDD", "LDDDLLDDD", "DDDDLLD", "LLLDDDLL", "LLDDDDLL", "LLLDDDD", "LLDD", "DDLLDDLL", "LLLLLLLLL"]
+    plates = []
+    for _ in range(count):
+        layout = layouts[rng.integers(len(layouts))]
+        alphabets = [LETTERS if kind == "L" else DIGITS for kind in layout]
+        plates.append("".join(alphabet[rng.integers(len(alphabet))] for alphabet in alphabets))
+    return plates
+
+
+def check_corpus() -> None:
+    for code, cases in CORPUS.items():
+        single = CountryMatcher([(code, _default_country_patterns[code])])
+        for plate in cases["match"]:
+            assert single.match(plate) == code.upper(), (code, plate)
+        for plate in cases["reject"]:
+            assert single.match(plate) is None, (code, plate)
+    print(f"corpus: {sum(len(c['match']) + len(c['reject']) for c in CORPUS.values())} plates, {len(CORPUS)} countries ok")
+
+
+def bench(label: str, func, plates: list[str], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for plate in plates:
+            func(plate)
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<28} {best / len(plates) * 1e9:8.0f} ns per plate")
+    return best
+
+
+def main() -> None:
+    check_corpus()
+    rng = np.random.default_rng(0)
+    plates = random_plates(50_000, rng)
+    corpus_plates = [plate for cases in CORPUS.values() for group in cases.values() for plate in group]
+    # Extra letters-digits-letters layouts stand in for a larger set of regional templates.
+    extra = {
+        f"x{lead}{digits}{tail}": rf"^[A-Z]{{{lead}}}\d{{{digits}}}[A-Z]{{{tail}}}$"
+        for lead in (1, 2, 3)
+        for digits in (2, 4, 5)
+        for tail in (1, 3)
+    }
+    for codes in (["ru", "by", "kz", "ua", "eu"], ["ru", "by", "kz", "ua"], ["ru", "by", "kz", "ua", *extra, "eu"]):
+        patterns = {code: _default_country_patterns.get(code) or extra[code] for code in codes}
+        legacy = legacy_matcher(patterns)
+        matcher = CountryMatcher(patterns.items(), max_plates=0)
+        for plate in corpus_plates + plates:
+            assert matcher.match(plate) == legacy(plate), plate
+        candidates = [len(matcher.candidates(plate)) for plate in plates]
+        print(f"{len(codes)} templates ({','.join(codes[:4])}...): mean candidates per plate {np.mean(candidates):.2f} (legacy {len(codes)})")
+        print(" unique plates")
+        baseline = bench("regex loop (legacy)", legacy, plates)
+        fast = bench("CountryMatcher.match", matcher.match, plates)
+        print(f"  speedup x{baseline / fast:.1f}")
+        print(" track stream (20 reads per plate)")
+        stream = [plate for plate in plates[:2_500] for _ in range(20)]
+        baseline = bench("regex loop (legacy)", legacy, stream)
+        fast = bench("CountryMatcher.match", CountryMatcher(patterns.items()).match, stream)
+        print(f"  speedup x{baseline / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Microbenchmarks: vectorized geometry kernels vs. naive Python loops.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_geometry
+"""
+
+from __future__ import annotations
+
+import timeit
+
+import numpy as np
+
+from app.pipeline.geometry import nms, pairwise_iou
+
+
+def naive_iou(a: list[float], b: list[float]) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def naive_pairwise_iou(a: list[list[float]], b: list[list[float]]) -> list[list[float]]:
+    return [[naive_iou(box_a, box_b) for box_b in b] for box_a in a]
+
+
+def naive_nms(boxes: list[list[float]], scores: list[float], iou_threshold: float, top_k: int) -> list[int]:
+    order = sorted(range(len(boxes)), key=lambda idx: -scores[idx])
+    keep: list[int] = []
+    for idx in order:
+        if all(naive_iou(boxes[idx], boxes[kept]) <= iou_threshold for kept in keep):
+            keep.append(idx)
+            if len(keep) >= top_k:
+                break
+    return keep
+
+
+def random_boxes(count: int, rng: np.random.Generator) -> np.ndarray:
+    xy = rng.uniform(0, 1800, size=(count, 2))
+    wh = rng.uniform(40, 160, size=(count, 2))
+    return np.ascontiguousarray(np.hstack([xy, xy + wh]), dtype=np.float32)
+
+
+def bench(label: str, func, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<28} {seconds * 1e6:10.1f} us")
+    return seconds
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for count in (10, 50, 200):
+        boxes = random_boxes(count, rng)
+        tracks = random_boxes(count, rng)
+        scores = rng.uniform(0.2, 1.0, size=count).astype(np.float32)
+        boxes_list, tracks_list, scores_list = boxes.tolist(), tracks.tolist(), scores.tolist()
+
+        assert np.allclose(pairwise_iou(boxes, tracks), naive_pairwise_iou(boxes_list, tracks_list), atol=1e-5)
+        assert sorted(nms(boxes, scores, 0.45, count).tolist()) == sorted(naive_nms(boxes_list, scores_list, 0.45, count))
+
+        number = max(10, 20000 // (count * count))
+        print(f"{count} boxes x {count} tracks")
+        naive = bench("pairwise IoU (python)", lambda: naive_pairwise_iou(boxes_list, tracks_list), number)
+        fast = bench("pairwise IoU (numpy)", lambda: pairwise_iou(boxes, tracks), number)
+        print(f"  speedup x{naive / fast:.1f}")
+        naive = bench("NMS (python)", lambda: naive_nms(boxes_list, scores_list, 0.45, count), number)
+        fast = bench("NMS (numpy)", lambda: nms(boxes, scores, 0.45, count), number)
+        print(f"  speedup x{naive / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
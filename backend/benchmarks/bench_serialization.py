@@ -0,0 +1,124 @@
+"""Microbenchmarks: columnar ``FrameRecognition`` serialization vs. the ``asdict`` path.
+
+The legacy path is reproduced here as it was: lists of per-object dataclasses
+converted with ``dataclasses.asdict`` and an enum-unwrapping ``dict_factory``,
+then ``json.dumps``. Run from ``backend/``::
+
+    python -m benchmarks.bench_serialization
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import List, Optional
+
+import numpy as np
+
+from app.pipeline.ingest_manager import ChannelDirection
+from app.pipeline.recognition import DetectionArray, FrameRecognition, OcrCandidate, TrackArray
+
+
+@dataclass
+class LegacyDetection:
+    bbox: List[float]
+    confidence: float
+
+
+@dataclass
+class LegacyTrack:
+    track_id: str
+    bbox: List[float]
+    direction: ChannelDirection
+    confidence: float
+
+
+@dataclass
+class LegacyOcrCandidate:
+    text: str
+    confidence: float
+    track_id: Optional[str] = None
+
+
+@dataclass
+class LegacyFrameRecognition:
+    frame_id: str
+    detections: List[LegacyDetection] = field(default_factory=list)
+    tracks: List[LegacyTrack] = field(default_factory=list)
+    ocr: List[LegacyOcrCandidate] = field(default_factory=list)
+    channel_id: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        def dict_factory(items: list[tuple[str, object]]) -> dict:
+            return {key: (value.value if isinstance(value, Enum) else value) for key, value in items}
+
+        return {
+            "frame_id": self.frame_id,
+            "channel_id": self.channel_id,
+            "detections": [asdict(det, dict_factory=dict_factory) for det in self.detections],
+            "tracks": [asdict(track, dict_factory=dict_factory) for track in self.tracks],
+            "ocr": [asdict(candidate, dict_factory=dict_factory) for candidate in self.ocr],
+        }
+
+
+def build_frames(count: int, rng: np.random.Generator) -> tuple[LegacyFrameRecognition, FrameRecognition]:
+    xy = rng.uniform(0, 1800, size=(count, 2))
+    boxes = np.ascontiguousarray(np.hstack([xy, xy + rng.uniform(40, 160, size=(count, 2))]), dtype=np.float32)
+    scores = rng.uniform(0.2, 1.0, size=count).astype(np.float32)
+    track_ids = [f"cam-1-{idx}" for idx in range(count)]
+    directions = [ChannelDirection.up] * count
+    ocr = [OcrCandidate(text="A123BC77", confidence=0.9, track_id=track_id) for track_id in track_ids[: count // 4]]
+
+    legacy = LegacyFrameRecognition(
+        frame_id="42",
+        channel_id="cam-1",
+        detections=[LegacyDetection(bbox=box, confidence=score) for box, score in zip(boxes.tolist(), scores.tolist())],
+        tracks=[
+            LegacyTrack(track_id=track_id, bbox=box, direction=direction, confidence=score)
+            for track_id, box, direction, score in zip(track_ids, boxes.tolist(), directions, scores.tolist())
+        ],
+        ocr=[LegacyOcrCandidate(text=item.text, confidence=item.confidence, track_id=item.track_id) for item in ocr],
+    )
+    columnar = FrameRecognition(
+        frame_id="42",
+        channel_id="cam-1",
+        detections=DetectionArray(boxes, scores),
+        tracks=TrackArray(track_ids, boxes.copy(), directions, scores.copy()),
+        ocr=ocr,
+    )
+    return legacy, columnar
+
+
+def bench(label: str, func, number: int) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<32} {seconds * 1e6:10.1f} us  {len(func())} bytes")
+    return seconds
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        msgpack = None
+    for count in (4, 16, 64):
+        legacy, columnar = build_frames(count, rng)
+        # Both paths must describe the same frame.
+        assert json.loads(json.dumps(legacy.as_dict())) == json.loads(json.dumps(columnar.as_dict()))
+
+        number = max(200, 20000 // count)
+        print(f"{count} detections / tracks per frame")
+        baseline = bench("asdict + json.dumps (legacy)", lambda: json.dumps(legacy.as_dict()).encode(), number)
+        fast = bench("as_dict + json.dumps", lambda: json.dumps(columnar.as_dict()).encode(), number)
+        print(f"  speedup x{baseline / fast:.1f}")
+        fast = bench("to_json (columnar)", columnar.to_json, number)
+        print(f"  speedup x{baseline / fast:.1f}")
+        if msgpack is not None:
+            fast = bench("to_msgpack (columnar)", columnar.to_msgpack, number)
+            print(f"  speedup x{baseline / fast:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Microbenchmarks: streaming per-track plate voting vs. re-voting the full history.
+
+The legacy path re-filters and re-votes every candidate of the track on each
+new read, as ``Postprocessor.process_candidates`` did. The streaming path folds
+each read into a :class:`PlateVote` once. A second section compares index and
+alignment-aware voting on reads with dropped and extra characters: how many
+reads a track needs before the vote settles on the true plate. Run from
+``backend/``::
+
+    python -m benchmarks.bench_voting
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from app.pipeline.postprocess import Postprocessor
+from app.pipeline.recognition import OcrCandidate
+from app.pipeline.voting import PlateVote, confusion_costs
+
+PLATE = "A123BC777"
+ALPHABET = "0123456789ABCEHKMOPTXY"
+
+
+def legacy_vote_by_char(candidates: list[OcrCandidate]) -> tuple[str, float]:
+    if not candidates:
+        return "", 0.0
+    max_len = max(len(candidate.text) for candidate in candidates)
+    voted_chars: list[str] = []
+    total_conf = 0.0
+    for idx in range(max_len):
+        counter: dict[str, float] = {}
+        for candidate in candidates:
+            if idx >= len(candidate.text):
+                continue
+            ch = candidate.text[idx].upper()
+            counter[ch] = counter.get(ch, 0.0) + candidate.confidence
+            total_conf += candidate.confidence / max_len
+        if counter:
+            voted_chars.append(max(counter, key=counter.get))
+    text = "".join(voted_chars)
+    return text, total_conf / max_len if voted_chars else 0.0
+
+
+def noisy_reads(count: int, rng: np.random.Generator) -> list[OcrCandidate]:
+    reads = []
+    for _ in range(count):
+        chars = list(PLATE)
+        for pos in np.flatnonzero(rng.random(len(chars)) < 0.1):
+            chars[pos] = ALPHABET[rng.integers(len(ALPHABET))]
+        reads.append(OcrCandidate(text="".join(chars), confidence=float(rng.uniform(0.6, 0.95))))
+    return reads
+
+
+def indel_reads(count: int, rng: np.random.Generator, rate: float = 0.15) -> list[OcrCandidate]:
+    reads = []
+    for _ in range(count):
+        chars = list(PLATE)
+        roll = rng.random()
+        pos = int(rng.integers(len(chars)))
+        if roll < rate:
+            del chars[pos]
+        elif roll < 2 * rate:
+            chars.insert(pos, ALPHABET[rng.integers(len(ALPHABET))])
+        reads.append(OcrCandidate(text="".join(chars), confidence=float(rng.uniform(0.6, 0.95))))
+    return reads
+
+
+def reads_until_settled(reads: list[OcrCandidate], vote: PlateVote) -> int:
+    """Reads after which the vote equals the true plate and stays there."""
+
+    settled = len(reads) + 1
+    for idx, read in enumerate(reads, start=1):
+        vote.add(read.text, read.confidence)
+        if vote.text != PLATE:
+            settled = len(reads) + 1
+        elif settled > len(reads):
+            settled = idx
+    return settled
+
+
+def legacy_track(reads: list[OcrCandidate]) -> tuple[str, float]:
+    history: list[OcrCandidate] = []
+    result = ("", 0.0)
+    for read in reads:
+        history.append(read)
+        eligible = [c for c in history if c.confidence >= 0.55]
+        result = legacy_vote_by_char(eligible)
+    return result
+
+
+def streaming_track(reads: list[OcrCandidate]) -> tuple[str, float]:
+    vote = PlateVote()
+    for read in reads:
+        if read.confidence >= 0.55:
+            vote.add(read.text, read.confidence)
+    return vote.result()
+
+
+def bench(label: str, func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<32} {best * 1e3:10.2f} ms per track")
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for count in (10, 100, 500):
+        reads = noisy_reads(count, rng)
+        legacy_text, legacy_conf = legacy_track(reads)
+        text, confidence = streaming_track(reads)
+        assert text == legacy_text == PLATE
+        print(f"{count} reads per track (confidence legacy {legacy_conf:.3f}, streaming {confidence:.3f})")
+        baseline = bench("re-vote full history (legacy)", lambda: legacy_track(reads))
+        fast = bench("PlateVote.add (streaming)", lambda: streaming_track(reads))
+        print(f"  speedup x{baseline / fast:.1f}")
+
+    costs = confusion_costs(Postprocessor._similar_chars_map)
+    tracks = [indel_reads(30, rng) for _ in range(500)]
+    index = [reads_until_settled(reads, PlateVote()) for reads in tracks]
+    aligned = [reads_until_settled(reads, PlateVote(costs=costs)) for reads in tracks]
+    print("reads until the vote settles on the plate (15% dropped + 15% extra characters)")
+    for label, counts in (("index voting", index), ("aligned voting", aligned)):
+        counts_arr = np.array(counts)
+        settled = counts_arr[counts_arr <= 30]
+        print(
+            f"  {label:<16} mean {settled.mean():5.2f}  p95 {np.percentile(settled, 95):5.1f}"
+            f"  unsettled after 30 reads {int((counts_arr > 30).sum())}/{len(counts)}"
+        )
+    reads = indel_reads(100, rng)
+    bench("aligned PlateVote.add", lambda: reads_until_settled(reads, PlateVote(costs=costs)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Per-country correctness corpus for the default plate templates.
+
+Plates are already normalized (upper case, no spaces or dashes). ``match``
+plates must fit the country's template on its own; ``reject`` plates must not.
+``bench_country_match`` checks both with a single-template matcher and checks
+that the combined matcher agrees with trying the templates in order.
+"""
+
+from __future__ import annotations
+
+CORPUS: dict[str, dict[str, list[str]]] = {
+    "ru": {
+        "match": ["A123BC77", "A123BC777", "X999XX99", "M001OP750", "E777KX197", "У123AB77", "K005TH01"],
+        "reject": ["A123BC7", "A123BC7777", "1234BC77", "A12BC777", "A123BCD77", "D123BC77", "AA123BC77"],
+    },
+    "by": {
+        "match": ["1234AB5", "0001MK7", "9876XE1", "5555УУ3"],
+        "reject": ["1234AB-5", "123AB5", "1234AB56", "1234DB5", "1234A5", "A234AB5"],
+    },
+    "kz": {
+        "match": ["ABC123KM", "XXX001OO", "MOT777HE", "УУУ123AA"],
+        "reject": ["AB123KM", "ABC12KM", "ABC123K", "ABC123KMO", "ABD123KM", "123ABC01"],
+    },
+    "ua": {
+        "match": ["AA1234BC", "KI0001XX", "BI7777IB", "HE0000TT"],
+        "reject": ["AA123BC", "AY1234BC", "AA12345BC", "A1234BC", "AA1234B1", "ZZ1234ZZ"],
+    },
+    "eu": {
+        "match": ["ABC123", "WOB1234", "12AB34CD", "B1234XY", "000000"],
+        "reject": ["AB12", "ABCDEFGHI", "AB-123", "ABC12!", "ABC 123", "A123ВC77"],
+    },
+}
@@ -0,0 +1,12 @@
+"""Test configuration: settings come from ``.env.example`` unless the environment overrides them."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+for _key, _value in dotenv_values(Path(__file__).resolve().parents[2] / ".env.example").items():
+    if _value is not None:
+        os.environ.setdefault(_key, _value)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.pipeline.arena import FrameArena
+
+
+def test_released_buffers_are_reused_per_shape_and_dtype():
+    arena = FrameArena()
+    first = arena.acquire((4, 8), np.uint8, owner="resize")
+    first.release()
+
+    again = arena.acquire((4, 8), np.uint8)
+    other_dtype = arena.acquire((4, 8), np.float32)
+
+    assert again.array is first.array
+    assert other_dtype.array is not first.array
+    assert (arena.hits, arena.misses) == (1, 2)
+
+
+def test_buffer_returns_to_the_pool_after_its_last_holder():
+    arena = FrameArena()
+    buffer = arena.acquire((16,), owner="ocr")
+    buffer.retain()
+    buffer.release()
+    assert arena.describe()["outstanding"] == {"ocr": 1}
+
+    buffer.release()
+
+    assert arena.describe()["outstanding"] == {}
+    assert arena.free_bytes == 16
+    with pytest.raises(ValueError):
+        buffer.release()
+    with pytest.raises(ValueError):
+        buffer.retain()
+
+
+def test_free_buffers_of_the_least_recently_used_shape_are_trimmed_first():
+    arena = FrameArena(max_bytes=250)
+    old, recent = arena.acquire((100,)), arena.acquire((120,))
+    old.release()
+    recent.release()
+    assert arena.resident_bytes == 220
+
+    arena.acquire((50,)).release()
+
+    assert arena.trimmed == 1
+    assert arena.resident_bytes == 170
+    assert arena.acquire((120,)).array is recent.array
+    assert arena.acquire((100,)).array is not old.array
+
+
+def test_buffers_held_past_leak_seconds_are_reported_once():
+    arena = FrameArena(leak_seconds=0.0)
+    held = arena.acquire((8,), owner="detector")
+    arena.acquire((8,)).release()
+
+    leaks = arena.check_leaks()
+
+    assert [(leak["serial"], leak["owner"]) for leak in leaks] == [(held.serial, "detector")]
+    assert arena.check_leaks() == []
+    assert arena.leaked == 1
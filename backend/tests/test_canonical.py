@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.plates import plate_key
+from app.pipeline.canonical import PlateCanonicalizer
+from app.pipeline.country_matcher import CountryMatcher
+from app.pipeline.postprocess import _default_country_patterns
+
+
+@pytest.fixture
+def canonicalizer() -> PlateCanonicalizer:
+    return PlateCanonicalizer(CountryMatcher(_default_country_patterns.items()), max_plates=0)
+
+
+@pytest.mark.parametrize(
+    "read, expected",
+    [
+        ("A123BC777", ("A123BC777", "RU")),
+        ("AI23BC777", ("A123BC777", "RU")),
+        ("A 1Z3 вс-77", ("A123BC77", "RU")),
+        ("O123OO77", ("O123OO77", "RU")),
+        # Fewest changes wins over template priority: ``ua`` as spelled, ``kz`` needs one change.
+        ("HE0000TT", ("HE0000TT", "UA")),
+        ("HEOOOOTT", ("HEO000TT", "KZ")),
+        ("ZZZ", ("ZZZ", None)),
+    ],
+)
+def test_canonicalize_resolves_lookalikes_per_position(canonicalizer, read, expected):
+    assert canonicalizer.canonicalize(read) == expected
+
+
+def test_unpinned_template_takes_the_read_as_spelled(canonicalizer):
+    assert canonicalizer.canonicalize("Z8O1ZZ") == ("Z8O1ZZ", "EU")
+
+
+def test_templates_sharing_a_plan_keep_their_priority():
+    matcher = CountryMatcher([("aa", r"^[AB]\d{3}$"), ("bb", r"^[AC]\d{3}$")])
+    canonicalizer = PlateCanonicalizer(matcher, max_plates=0)
+
+    assert canonicalizer.canonicalize("AIOZ") == ("A102", "AA")
+    assert canonicalizer.canonicalize("CIO2") == ("C102", "BB")
+    assert canonicalizer.canonicalize("DIO2") == ("DIO2", None)
+    # Both templates coerce the same way, so the bucket holds one group.
+    assert len(canonicalizer._bucket("LAAA")) == 1
+
+
+@pytest.mark.parametrize("spelling", ["A123BC77", "AI23BC77", "a 1z3 bc-77", "А123ВС77", "A1Z3B C77"])
+def test_plate_key_is_shared_by_confusable_spellings(spelling):
+    assert plate_key(spelling) == plate_key("A123BC77")
+
+
+def test_plate_key_keeps_distinct_plates_apart():
+    assert plate_key("A123BC77") != plate_key("A123BC78")
+    assert plate_key("A123BC77") != plate_key("A123BK77")
+    assert plate_key(None) == plate_key("") == ""
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.pipeline.capture import CapturedFrame, CaptureWorker, FrameRingBuffer
+from app.pipeline.ingest_manager import ChannelConfig
+from app.pipeline.shm import SharedFramePool
+
+
+def frame(idx: int) -> CapturedFrame:
+    return CapturedFrame("cam", f"f{idx}", None, 0.0)
+
+
+def test_ring_buffer_drops_the_oldest_frame():
+    buffer = FrameRingBuffer(3)
+    evicted = [buffer.push(frame(idx)) for idx in range(5)]
+
+    assert [item.frame_id if item else None for item in evicted] == [None, None, None, "f0", "f1"]
+    assert [buffer.pop(timeout=0).frame_id for _ in range(3)] == ["f2", "f3", "f4"]
+    assert buffer.pop(timeout=0) is None
+    stats = buffer.stats()
+    assert (stats["depth"], stats["pushed"], stats["dropped"]) == (0, 5, 2)
+
+
+def test_capture_worker_releases_the_slots_of_evicted_frames():
+    pool = SharedFramePool(8, 64)
+    buffer = FrameRingBuffer(2)
+
+    def source(config, stats):
+        return iter([np.full(16, idx, dtype=np.uint8) for idx in range(6)])
+
+    worker = CaptureWorker(
+        ChannelConfig(channel_id="cam", name="cam", source="rtsp://camera"),
+        buffer,
+        source=source,
+        reconnect_seconds=0,
+        on_connected=lambda channel_id: None,
+        on_error=lambda channel_id, error: worker.stop(),
+        transport=pool,
+    )
+    try:
+        worker.start()
+        worker.join(timeout=5)
+        frames = buffer.clear()
+        assert [item.frame_id for item in frames] == ["cam:5", "cam:6"]
+        assert [int(pool.view(item.image)[0]) for item in frames] == [4, 5]
+        assert pool.stats()["leased"] == 2
+    finally:
+        pool.close()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.pipeline.country_matcher import CountryMatcher
+from app.pipeline.postprocess import _default_country_patterns
+from benchmarks.bench_country_match import legacy_matcher, random_plates
+from benchmarks.country_corpus import CORPUS
+
+
+@pytest.mark.parametrize("code", sorted(CORPUS))
+def test_corpus_plates_fit_their_country_template(code):
+    single = CountryMatcher([(code, _default_country_patterns[code])])
+
+    assert [plate for plate in CORPUS[code]["match"] if single.match(plate) != code.upper()] == []
+    assert [plate for plate in CORPUS[code]["reject"] if single.match(plate) is not None] == []
+
+
+def test_combined_matcher_agrees_with_the_template_loop():
+    plates = [plate for cases in CORPUS.values() for group in cases.values() for plate in group]
+    plates += random_plates(2_000, np.random.default_rng(0))
+    legacy = legacy_matcher(_default_country_patterns)
+    matcher = CountryMatcher(_default_country_patterns.items(), max_plates=0)
+
+    assert [plate for plate in plates if matcher.match(plate) != legacy(plate)] == []
+
+
+def test_memoized_answers_match_fresh_ones():
+    matcher = CountryMatcher(_default_country_patterns.items(), max_plates=4)
+    plates = [plate for cases in CORPUS.values() for plate in cases["match"]]
+    first = [matcher.match(plate) for plate in plates]
+
+    assert [matcher.match(plate) for plate in plates] == first
+    assert matcher.describe()["cached_plates"] == 4
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.pipeline.crop_store import TrackCropStore
+
+
+def crop(nbytes: int, value: int = 0) -> np.ndarray:
+    return np.full(nbytes, value, dtype=np.uint8)
+
+
+def test_keeps_the_top_k_crops_by_quality():
+    store = TrackCropStore(top_k=2)
+    offered = [store.offer("t1", crop(10, idx), quality) for idx, quality in enumerate([0.3, 0.5, 0.1, 0.9])]
+
+    assert offered == [True, True, False, True]
+    assert [item.quality for item in store.crops("t1")] == [0.9, 0.5]
+    assert store.summary("t1") == (0.9, [10])
+    assert (store.stored, store.rejected, store.evicted) == (3, 1, 1)
+
+
+def test_kept_crops_are_copies():
+    store = TrackCropStore()
+    frame = crop(10, 7)
+    store.offer("t1", frame, 0.5)
+    frame[:] = 0
+
+    assert int(store.best("t1").crop[0]) == 7
+
+
+def test_track_byte_cap_evicts_the_worst_crops():
+    store = TrackCropStore(top_k=5, max_track_bytes=100)
+    assert not store.offer("t1", crop(101), 1.0)
+    for quality in (0.2, 0.4, 0.6):
+        store.offer("t1", crop(40), quality)
+
+    assert [item.quality for item in store.crops("t1")] == [0.6, 0.4]
+    assert store.total_bytes == 80
+
+
+def test_node_byte_cap_evicts_from_the_largest_track():
+    store = TrackCropStore(top_k=5, max_total_bytes=100)
+    store.offer("big", crop(30), 0.2)
+    store.offer("big", crop(30), 0.8)
+    store.offer("small", crop(20), 0.1)
+    store.offer("small", crop(30), 0.5)
+
+    assert [item.quality for item in store.crops("big")] == [0.8]
+    assert [item.quality for item in store.crops("small")] == [0.5, 0.1]
+    assert store.total_bytes == 80
+
+
+def test_release_drops_the_track_and_its_bytes():
+    store = TrackCropStore()
+    store.offer("t1", crop(10), 0.5)
+    store.offer("t2", crop(20), 0.5)
+
+    store.release(["t1", "unknown"])
+
+    assert store.best("t1") is None and store.summary("t1") is None
+    assert store.total_bytes == 20
+    assert store.describe()["tracks"] == 1
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from app.monitoring import MetricsRegistry
+from app.pipeline.dedup import DuplicateIndex
+
+
+def test_duplicates_inside_the_window_do_not_extend_it():
+    index = DuplicateIndex(5.0)
+
+    assert not index.check("cam", "A123BC77", 0.0)
+    assert index.check("cam", "A123BC77", 3.0)
+    assert index.check("cam", "A123BC77", 5.0)
+    # The window opened at t=0, so the read at t=5 did not keep the plate suppressed.
+    assert not index.check("cam", "A123BC77", 5.5)
+    assert index.check("cam", "A123BC77", 6.0)
+
+
+def test_plates_are_suppressed_per_channel():
+    index = DuplicateIndex(5.0)
+
+    assert not index.check("cam1", "A123BC77", 0.0)
+    assert not index.check("cam2", "A123BC77", 1.0)
+    assert index.check("cam1", "A123BC77", 2.0)
+    assert index.check("cam2", "A123BC77", 2.0)
+    assert len(index) == 2
+
+
+def test_expired_entries_are_dropped_as_plates_arrive():
+    metrics = MetricsRegistry("test")
+    index = DuplicateIndex(5.0, metrics=metrics)
+    for idx in range(3):
+        index.check("cam", f"P{idx}", float(idx))
+
+    index.check("cam", "NEW", 6.5)
+
+    # P0 (t=0) and P1 (t=1) are past the TTL at t=6.5; P2 (t=2) is still inside it.
+    assert index.describe() == {"ttl_seconds": 5.0, "max_entries": 100_000, "entries": 2, "expired": 2, "evicted": 0}
+    assert metrics.counters[("anti_duplicate_evictions", (("reason", "expired"),))] == 2
+    assert metrics.gauges[("anti_duplicate_entries", ())] == 2
+
+
+def test_capacity_cap_evicts_the_oldest_entries():
+    index = DuplicateIndex(60.0, max_entries=3)
+    for idx in range(5):
+        assert not index.check("cam", f"P{idx}", float(idx))
+
+    assert len(index) == 3 and index.evicted == 2 and index.expired == 0
+    # P0 was evicted before its TTL ran out, so it is reported again; P4 is still suppressed.
+    assert not index.check("cam", "P0", 5.0)
+    assert index.check("cam", "P4", 5.0)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.pipeline.detector_skip import DetectionSkipper
+from app.pipeline.recognition import DetectorSettings, OcrSettings, RecognitionPipeline, TrackerSettings
+from app.pipeline.tracker import Tracker
+from tests.test_executor import PlateDetector
+from tests.test_tracker import box, detections
+
+
+def run(skipper: DetectionSkipper, tracker: Tracker, frames: list[list[list[float]]]) -> list[bool]:
+    """Detect or coast each frame as the skipper decides; returns which frames ran the detector."""
+
+    ran = []
+    for boxes in frames:
+        detect = skipper.should_detect("cam", tracker)
+        if detect:
+            tracker.update(detections(boxes))
+        else:
+            tracker.coast()
+        skipper.record("cam", tracker, detected=detect)
+        ran.append(detect)
+    return ran
+
+
+def test_interval_grows_while_the_motion_model_holds():
+    skipper = DetectionSkipper(max_interval=4, min_track_confidence=0.1)
+    tracker = Tracker(TrackerSettings(min_hits=1))
+
+    ran = run(skipper, tracker, [[box(50 + 2 * idx, 80)] for idx in range(40)])
+
+    stats = skipper.describe()["channels"]["cam"]
+    assert stats["interval"] == 4
+    assert stats["predicted"] > 0 and stats["call_rate"] < 0.5
+    # Once the interval settled, the detector runs on every fourth frame.
+    assert ran[-8:].count(True) == 2
+
+
+def test_new_tracks_halve_the_interval():
+    skipper = DetectionSkipper(max_interval=8, min_track_confidence=0.1)
+    tracker = Tracker(TrackerSettings(min_hits=1))
+    run(skipper, tracker, [[box(50, 80)] for _ in range(40)])
+    assert skipper.describe()["channels"]["cam"]["interval"] == 8
+
+    tracker.update(detections([box(50, 80), box(300, 200)]))
+    skipper.record("cam", tracker, detected=True)
+
+    assert skipper.describe()["channels"]["cam"]["interval"] == 4
+
+
+def test_decayed_track_confidence_forces_a_detector_run():
+    skipper = DetectionSkipper(max_interval=8, min_track_confidence=0.8)
+    tracker = Tracker(TrackerSettings(min_hits=1), coast_decay=0.9)
+    ran = run(skipper, tracker, [[box(50, 80)] for _ in range(20)])
+
+    # Scores start at 0.9: after two coasted frames (0.81, 0.729) the track is below the floor, so the
+    # next frame is detected although the interval alone would allow up to seven coasted frames.
+    assert "False, False, False" not in str(ran) and ran.count(False) > 5
+    assert skipper.describe()["channels"]["cam"]["forced"] > 0
+
+
+def test_disabled_skipper_always_detects():
+    skipper = DetectionSkipper(max_interval=1)
+    tracker = Tracker(TrackerSettings(min_hits=1))
+
+    assert run(skipper, tracker, [[box(50, 80)] for _ in range(5)]) == [True] * 5
+    assert skipper.describe()["channels"] == {}
+
+
+class CountingDetector(PlateDetector):
+    def __init__(self) -> None:
+        self.frames = 0
+
+    def detect_batch(self, images):
+        self.frames += len(images)
+        return super().detect_batch(images)
+
+
+def test_coasted_frames_keep_reporting_the_track():
+    detector = CountingDetector()
+    pipeline = RecognitionPipeline(
+        DetectorSettings(skip_max_interval=4, skip_min_track_confidence=0.1),
+        TrackerSettings(min_hits=1),
+        OcrSettings(),
+        detector=detector,
+    )
+    plate = np.random.default_rng(0).integers(0, 256, size=(240, 320, 3), dtype=np.uint8)
+    try:
+        results = [pipeline.process_frame(f"f{idx}", image=plate, channel_id="cam") for idx in range(24)]
+    finally:
+        pipeline.ocr_batcher.stop()
+
+    assert detector.frames < 12
+    assert {tuple(result.tracks.track_ids) for result in results} == {("cam-1",)}
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from app.events import EventManager, event_storage
+from app.pipeline.batching import MicroBatcher
+from app.pipeline.capture import CapturedFrame
+from app.pipeline.executor import StagedExecutor, StageSpec, build_recognition_executor
+from app.pipeline.recognition import (
+    DetectionArray,
+    DetectorSettings,
+    Detector,
+    OcrBackend,
+    OcrCandidate,
+    OcrSettings,
+    RecognitionPipeline,
+    TrackerSettings,
+)
+from tests.test_postprocess import PLATE, make_postprocessor
+
+BOX = [40.0, 60.0, 200.0, 100.0]
+
+
+class PlateDetector(Detector):
+    """One plate at a fixed box on every frame that has an image, nothing on blank frames."""
+
+    def detect_batch(self, images):
+        return [
+            DetectionArray(np.asarray([BOX], dtype=np.float32), np.asarray([0.9], dtype=np.float32))
+            if image.any()
+            else DetectionArray.empty()
+            for image in images
+        ]
+
+
+class PlateOcr(OcrBackend):
+    enabled = True
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def recognize_batch(self, crops):
+        self.calls += len(crops)
+        return [OcrCandidate(text=PLATE, confidence=0.9) for _ in crops]
+
+
+def run_frames(executor, frames: list[np.ndarray], timeout: float = 10.0) -> None:
+    executor.start()
+    try:
+        for idx, image in enumerate(frames):
+            executor.submit(CapturedFrame(channel_id="cam", frame_id=f"f{idx}", image=image, captured_at=time.time()))
+        deadline = time.monotonic() + timeout
+        postprocessor = executor.stage("postprocessor")
+        while postprocessor.processed < len(frames) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert postprocessor.processed == len(frames)
+        events = executor.stage("event_manager")
+        while len(events.queue) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+    finally:
+        executor.stop()
+
+
+def test_steady_track_yields_one_event():
+    rng = np.random.default_rng(0)
+    ocr = PlateOcr()
+    pipeline = RecognitionPipeline(
+        DetectorSettings(),
+        TrackerSettings(min_hits=1, max_age=3),
+        OcrSettings(vote_frames=3, min_quality_gain=0.0),
+        detector=PlateDetector(),
+        ocr=ocr,
+    )
+    events = EventManager(storage=event_storage)
+    executor = build_recognition_executor(
+        batcher=MicroBatcher(pipeline, max_batch_size=1, max_wait_ms=1.0),
+        pipeline=pipeline,
+        post=make_postprocessor(),
+        workers={"detector": 1, "ocr_engine": 1},
+        queue_size=64,
+        events=events,
+    )
+    # The plate gets sharper as the car approaches, so every frame passes the OCR quality gate.
+    texture = rng.integers(-1, 2, size=(240, 320, 3))
+    frames = [np.clip(128 + texture * 8 * (idx + 1), 0, 255).astype(np.uint8) for idx in range(12)]
+    # Blank frames let the track age out and close.
+    frames += [np.zeros((240, 320, 3), dtype=np.uint8) for _ in range(6)]
+
+    run_frames(executor, frames)
+    pipeline.ocr_batcher.stop()
+
+    assert ocr.calls >= 3
+    assert [(event.plate, event.track_id) for event in events.events] == [(PLATE, events.events[0].track_id)]
+    assert events.events[0].channel_id == "cam"
+
+
+def test_settled_tracks_are_reported_once():
+    pipeline = RecognitionPipeline(
+        DetectorSettings(),
+        TrackerSettings(min_hits=1, max_age=3),
+        OcrSettings(vote_frames=3, min_quality_gain=0.0),
+        detector=PlateDetector(),
+        ocr=PlateOcr(),
+    )
+    settled = []
+    executor = build_recognition_executor(
+        batcher=MicroBatcher(pipeline, max_batch_size=1, max_wait_ms=1.0),
+        pipeline=pipeline,
+        post=make_postprocessor(settle_reads=3),
+        workers={"ocr_engine": 1},
+        queue_size=64,
+        events=EventManager(storage=event_storage),
+        track_settled=lambda channel_id, track_id: settled.append((channel_id, track_id)),
+    )
+    rng = np.random.default_rng(1)
+    texture = rng.integers(-1, 2, size=(240, 320, 3))
+    frames = [np.clip(128 + texture * 8 * (idx + 1), 0, 255).astype(np.uint8) for idx in range(10)]
+
+    run_frames(executor, frames)
+    pipeline.ocr_batcher.stop()
+
+    assert len(settled) == 1 and settled[0][0] == "cam"
+
+
+def test_frames_reach_the_tracker_in_capture_order():
+    pipeline = RecognitionPipeline(DetectorSettings(), TrackerSettings(), OcrSettings(), detector=PlateDetector())
+    tracked = []
+    track = pipeline.track
+
+    def record(staged):
+        tracked.append((staged.frame.channel_id, int(staged.frame.frame_id)))
+        return track(staged)
+
+    pipeline.track = record
+    executor = build_recognition_executor(
+        batcher=MicroBatcher(pipeline, max_batch_size=8, max_wait_ms=5.0),
+        pipeline=pipeline,
+        post=make_postprocessor(),
+        workers={},
+        queue_size=256,
+        events=EventManager(storage=event_storage),
+    )
+    image = np.full((48, 64, 3), 128, dtype=np.uint8)
+    executor.start()
+    try:
+        for idx in range(120):
+            executor.submit(CapturedFrame(f"cam{idx % 3}", str(idx), image, 0.0))
+        deadline = time.monotonic() + 10
+        while len(tracked) < 120 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        executor.stop()
+        pipeline.ocr_batcher.stop()
+
+    assert len(tracked) == 120
+    for channel in ("cam0", "cam1", "cam2"):
+        frame_ids = [frame_id for channel_id, frame_id in tracked if channel_id == channel]
+        assert frame_ids == sorted(frame_ids)
+
+
+def test_scaling_a_stopped_stage_only_sets_the_target():
+    executor = StagedExecutor([StageSpec("work", lambda item: None, workers=1, queue_size=4)])
+    stage = executor.stage("work")
+
+    described = executor.scale("work", 3)
+    assert (described["workers"], described["target_workers"]) == (0, 3)
+
+    executor.start()
+    try:
+        assert stage.workers == 3
+    finally:
+        executor.stop()
+    assert stage.workers == 0
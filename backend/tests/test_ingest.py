@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.pipeline.capture import CapturedFrame
+from app.pipeline.ingest_manager import ChannelConfig, IngestManager
+from app.pipeline.shm import SharedFramePool
+
+
+def buffer_shared_frames(manager: IngestManager, channel_id: str, count: int) -> None:
+    for idx in range(count):
+        handle = manager.transport.write(
+            np.full(16, idx, dtype=np.uint8), channel_id=channel_id, frame_id=f"f{idx}", captured_at=0.0
+        )
+        manager.buffers[channel_id].push(CapturedFrame(channel_id, f"f{idx}", handle, 0.0))
+
+
+def test_reregistering_a_channel_releases_its_buffered_slots():
+    manager = IngestManager(buffer_size=4)
+    manager.transport = SharedFramePool(8, 64)
+    try:
+        config = ChannelConfig(channel_id="cam", name="cam", source="rtsp://camera")
+        manager.register_channel(config)
+        buffer_shared_frames(manager, "cam", 3)
+        assert manager.transport.stats()["leased"] == 3
+
+        manager.register_channel(config)
+        assert manager.transport.stats()["leased"] == 0
+
+        buffer_shared_frames(manager, "cam", 2)
+        manager.remove_channel("cam")
+        assert manager.transport.stats()["leased"] == 0
+    finally:
+        manager.transport.close()
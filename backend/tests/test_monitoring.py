@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+
+from app.monitoring import MetricsRegistry
+
+
+def test_concurrent_updates_are_not_lost():
+    registry = MetricsRegistry("test")
+
+    def work():
+        for _ in range(20_000):
+            registry.inc("frames", labels={"stage": "detector"})
+            registry.observe("service_ms", 2.0, labels={"stage": "detector"})
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    described = registry.describe()
+    assert described["counters"]["frames:(('stage', 'detector'),)"] == 160_000
+    assert described["histograms"]["service_ms:(('stage', 'detector'),)"] == {"count": 160_000, "avg": 2.0}
+
+
+def test_delta_moves_updates_into_another_registry():
+    worker, main = MetricsRegistry("test"), MetricsRegistry("test")
+    main.inc("frames", 2)
+    worker.inc("frames", 3)
+    worker.observe("service_ms", 4.0)
+    worker.set_gauge("queue_depth", 7)
+
+    main.merge(worker.take_delta())
+    worker.inc("frames")
+    main.merge(worker.take_delta())
+
+    assert worker.take_delta() is None
+    described = main.describe()
+    assert described["counters"]["frames:()"] == 6
+    assert described["histograms"]["service_ms:()"] == {"count": 1, "avg": 4.0}
+    assert described["gauges"]["queue_depth:()"] == 7
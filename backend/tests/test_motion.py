@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.pipeline.motion import MotionTrigger
+
+# Left half of the frame, normalized.
+LEFT_HALF = {"points": [[0.0, 0.0], [0.5, 0.0], [0.5, 1.0], [0.0, 1.0]]}
+
+
+def scene(block: slice | None = None, value: int = 200) -> np.ndarray:
+    image = np.full((120, 160, 3), 50, dtype=np.uint8)
+    if block is not None:
+        image[40:80, block] = value
+    return image
+
+
+def make_trigger(**overrides) -> MotionTrigger:
+    options = dict(downscale_width=80, pixel_threshold=25.0, min_area=0.05, learning_rate=0.05, hold_seconds=0.5)
+    return MotionTrigger(**{**options, **overrides})
+
+
+def test_static_frames_are_gated_after_the_hold():
+    trigger = make_trigger()
+    trigger.register("cam")
+
+    passes = [
+        trigger.check("cam", scene(), now=0.0),  # first frame seeds the background
+        trigger.check("cam", scene(), now=1.0),
+        trigger.check("cam", scene(slice(20, 60)), now=2.0),
+        trigger.check("cam", scene(), now=2.3),  # still within hold_seconds
+        trigger.check("cam", scene(), now=3.0),
+    ]
+
+    assert passes == [True, False, True, True, False]
+    assert trigger.channel_stats("cam")["gated"] == 2
+
+
+def test_changes_below_the_pixel_threshold_are_not_motion():
+    trigger = make_trigger()
+    trigger.register("cam")
+    trigger.check("cam", scene(), now=0.0)
+
+    assert not trigger.check("cam", scene(slice(20, 60), value=70), now=1.0)
+    assert trigger.check("cam", scene(slice(20, 60), value=90), now=2.0)
+
+
+def test_only_motion_inside_the_roi_counts():
+    trigger = make_trigger()
+    trigger.register("cam", LEFT_HALF)
+    trigger.check("cam", scene(), now=0.0)
+
+    assert not trigger.check("cam", scene(slice(100, 150)), now=1.0)
+    assert trigger.check("cam", scene(slice(10, 60)), now=2.0)
+
+
+def test_disabled_trigger_and_unknown_channels_pass_everything():
+    assert MotionTrigger(enabled=False).check("cam", scene(), now=0.0)
+    trigger = make_trigger()
+    assert trigger.check("other", scene(), now=0.0)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from app.pipeline.ocr_scheduler import OcrScheduler
+from app.pipeline.recognition import OcrCandidate, OcrSettings
+from tests.test_postprocess import PLATE, make_postprocessor
+
+
+def test_scheduler_stops_once_track_vote_settles():
+    post = make_postprocessor(settle_reads=3)
+    scheduler = OcrScheduler(OcrSettings(min_quality_gain=0.0, max_calls_per_track=10, min_confidence=0.6))
+    scheduler.settled = post.track_settled
+
+    runs = []
+    for idx in range(6):
+        run = scheduler.should_run("t1", quality=0.1 * (idx + 1))
+        runs.append(run)
+        if run:
+            post.process_candidates([OcrCandidate(text=PLATE, confidence=0.9)], frames_with_plate=idx + 1, track_id="t1")
+
+    assert runs == [True, True, True, False, False, False]
+    assert scheduler.track_stats("t1")["converged"]
+
+
+def test_scheduler_ignores_votes_below_its_confidence():
+    post = make_postprocessor(settle_reads=3, min_confidence=0.5)
+    scheduler = OcrScheduler(OcrSettings(min_quality_gain=0.0, max_calls_per_track=5, min_confidence=0.8))
+    scheduler.settled = post.track_settled
+
+    runs = []
+    for idx in range(7):
+        run = scheduler.should_run("t1", quality=0.1 * (idx + 1))
+        runs.append(run)
+        if run:
+            post.process_candidates([OcrCandidate(text=PLATE, confidence=0.7)], frames_with_plate=idx + 1, track_id="t1")
+
+    # The vote settles for the postprocessor but not at OCR_MIN_CONFIDENCE: only the call cap stops OCR.
+    assert post.track_settled("t1") and not post.track_settled("t1", 0.8)
+    assert runs == [True] * 5 + [False] * 2
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from app.pipeline.postprocess import CountryTemplate, PostprocessSettings, Postprocessor, _default_country_patterns
+from app.pipeline.recognition import OcrCandidate
+
+PLATE = "A123BC777"
+ALPHABET = "0123456789ABCEHKMOPTXY"
+
+
+def make_postprocessor(**overrides) -> Postprocessor:
+    templates = [CountryTemplate(code, pattern) for code, pattern in _default_country_patterns.items()]
+    return Postprocessor(PostprocessSettings(country_templates=templates, **overrides))
+
+
+def indel_reads(count: int, rng: np.random.Generator, rate: float = 0.15) -> list[OcrCandidate]:
+    reads = []
+    for _ in range(count):
+        chars = list(PLATE)
+        roll = rng.random()
+        pos = int(rng.integers(len(chars)))
+        if roll < rate:
+            del chars[pos]
+        elif roll < 2 * rate:
+            chars.insert(pos, ALPHABET[rng.integers(len(ALPHABET))])
+        reads.append(OcrCandidate(text="".join(chars), confidence=float(rng.uniform(0.6, 0.95))))
+    return reads
+
+
+def reads_to_event(post: Postprocessor, track_id: str, reads: list[OcrCandidate]) -> int:
+    for idx, read in enumerate(reads, start=1):
+        outcome = post.process_candidates([read], frames_with_plate=idx, track_id=track_id)
+        if outcome.plate:
+            return idx
+    return len(reads) + 1
+
+
+def test_track_vote_waits_until_settled() -> None:
+    post = make_postprocessor()
+    reasons = [
+        post.process_candidates([OcrCandidate(PLATE, 0.9)], frames_with_plate=10, track_id="t1").reason
+        for _ in range(3)
+    ]
+    assert reasons == ["not_settled", "not_settled", None]
+    assert post.track_settled("t1")
+    assert not post.track_settled("unknown")
+
+
+def test_aligned_vote_reaches_event_in_fewer_frames() -> None:
+    rng = np.random.default_rng(0)
+    tracks = [indel_reads(30, rng) for _ in range(200)]
+    aligned, index = make_postprocessor(vote_align=True), make_postprocessor(vote_align=False)
+    aligned_frames = [reads_to_event(aligned, f"a{n}", reads) for n, reads in enumerate(tracks)]
+    index_frames = [reads_to_event(index, f"i{n}", reads) for n, reads in enumerate(tracks)]
+    assert np.mean(aligned_frames) < np.mean(index_frames)
+    assert np.percentile(aligned_frames, 95) <= np.percentile(index_frames, 95)
+
+
+def test_concurrent_reads_of_one_track_are_all_folded() -> None:
+    post = make_postprocessor()
+
+    def worker() -> None:
+        for _ in range(200):
+            post.process_candidates([OcrCandidate(PLATE, 0.9)], frames_with_plate=10, track_id="t1")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert post._votes["t1"].vote.count == 1600
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.pipeline.recognition import (
+    DetectorSettings,
+    FrameInput,
+    OcrBackend,
+    OcrSettings,
+    RecognitionPipeline,
+    TrackerSettings,
+)
+from tests.test_executor import PlateDetector
+
+
+class FailingOcr(OcrBackend):
+    enabled = True
+
+    def recognize_batch(self, crops):
+        raise RuntimeError("ocr backend down")
+
+
+def test_ocr_failure_keeps_tracks_and_closed_tracks():
+    pipeline = RecognitionPipeline(
+        DetectorSettings(),
+        TrackerSettings(min_hits=1, max_age=1),
+        OcrSettings(min_quality_gain=0.0),
+        detector=PlateDetector(),
+        ocr=FailingOcr(),
+    )
+    rng = np.random.default_rng(0)
+    plate = rng.integers(0, 256, size=(240, 320, 3), dtype=np.uint8)
+    blank = np.zeros_like(plate)
+    try:
+        results = [
+            pipeline.process_frame(f"f{idx}", image=image, channel_id="cam")
+            for idx, image in enumerate([plate, plate, blank, blank, blank])
+        ]
+    finally:
+        pipeline.ocr_batcher.stop()
+
+    assert all(not result.ocr for result in results)
+    assert len(results[1].tracks) == 1
+    track_id = results[1].tracks.track_ids[0]
+    assert any(track_id in result.closed_tracks for result in results[2:])
+    # Released through track_close_hooks.
+    assert pipeline.crop_store.summary(track_id) is None
+    assert pipeline.ocr_scheduler.track_stats(track_id) is None
+
+
+def test_stale_coast_decision_is_revoked_by_the_tracker_step():
+    detector = PlateDetector()
+    pipeline = RecognitionPipeline(
+        DetectorSettings(skip_max_interval=4),
+        TrackerSettings(min_hits=1),
+        OcrSettings(),
+        detector=detector,
+    )
+    plate = np.random.default_rng(0).integers(0, 256, size=(240, 320, 3), dtype=np.uint8)
+    frames = [FrameInput(frame_id=f"f{idx}", image=plate, channel_id="cam") for idx in range(4)]
+    # A new track halves the interval to 1, the next detection without drift raises it to 2.
+    for frame in frames[:2]:
+        pipeline.track(pipeline.detect_batch([frame])[0])
+
+    # Both frames are planned before either is tracked, as in the staged executor.
+    ahead = [pipeline.detect_batch([frame])[0] for frame in frames[2:]]
+    assert [staged.coast for staged in ahead] == [True, True]
+    coasted, revoked = (pipeline.track(staged) for staged in ahead)
+
+    assert coasted.coast and not len(coasted.result.detections)
+    assert revoked.detected and len(revoked.result.detections) == 1
+    assert pipeline.skipper.describe()["channels"]["cam"]["detected"] == 3
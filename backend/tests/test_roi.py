@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.pipeline.recognition import (
+    DetectionArray,
+    Detector,
+    DetectorSettings,
+    FrameInput,
+    OcrSettings,
+    RecognitionPipeline,
+    TrackerSettings,
+)
+from app.pipeline.roi import CompiledRoi, RoiRegistry, roi_points
+
+FRAME = (240, 320)
+# Right half of the frame, normalized.
+RIGHT_HALF = {"points": [[0.5, 0.0], [1.0, 0.0], [1.0, 1.0], [0.5, 1.0]]}
+# Lower-left triangle in pixels.
+TRIANGLE = {"polygon": [[0, 0], [200, 200], [0, 200]]}
+
+
+class CropDetector(Detector):
+    """Records the input shapes and returns two fixed boxes in input coordinates."""
+
+    def __init__(self) -> None:
+        self.shapes = []
+
+    def detect_batch(self, images):
+        self.shapes.extend(image.shape[:2] for image in images)
+        boxes = np.asarray([[10, 40, 50, 60], [130, 10, 150, 30]], dtype=np.float32)
+        return [DetectionArray(boxes.copy(), np.asarray([0.9, 0.9], dtype=np.float32)) for _ in images]
+
+
+def test_normalized_rectangle_compiles_to_a_crop_and_a_full_mask():
+    roi = CompiledRoi.compile(roi_points(RIGHT_HALF), FRAME)
+
+    assert roi.rect == (160, 0, 320, 240)
+    assert roi.mask.shape == (240, 160) and roi.mask.all()
+    assert roi.area_ratio == 0.5
+    assert roi.crop(np.zeros((*FRAME, 3))).shape == (240, 160, 3)
+
+
+def test_polygon_mask_follows_the_outline():
+    roi = CompiledRoi.compile(roi_points(TRIANGLE), FRAME)
+
+    assert roi.rect == (0, 0, 200, 200)
+    # Half of the bounding rectangle, give or take the pixels on the diagonal.
+    assert abs(roi.mask.mean() - 0.5) < 0.01
+    inside = roi.contains(np.asarray([[20, 180], [180, 20], [250, 100], [-5, 100]], dtype=np.float32))
+    assert inside.tolist() == [True, False, False, False]
+
+
+def test_registry_compiles_once_per_frame_size():
+    registry = RoiRegistry()
+    registry.register("cam", RIGHT_HALF)
+
+    first = registry.get("cam", FRAME)
+    assert registry.get("cam", FRAME) is first
+    assert registry.get("cam", (480, 640)).rect == (320, 0, 640, 480)
+    assert registry.get("other", FRAME) is None
+
+    registry.register("cam", None)
+    assert "cam" not in registry
+
+
+def make_pipeline(detector: Detector, rois: RoiRegistry, **detector_settings) -> RecognitionPipeline:
+    return RecognitionPipeline(
+        DetectorSettings(**detector_settings), TrackerSettings(), OcrSettings(), detector=detector, rois=rois
+    )
+
+
+def test_detector_sees_the_crop_and_boxes_come_back_in_frame_coordinates():
+    rois = RoiRegistry()
+    rois.register("cam", RIGHT_HALF)
+    detector = CropDetector()
+    pipeline = make_pipeline(detector, rois)
+    try:
+        result = pipeline.detect_batch([FrameInput("f0", np.zeros((*FRAME, 3), dtype=np.uint8), channel_id="cam")])[0]
+    finally:
+        pipeline.ocr_batcher.stop()
+
+    assert detector.shapes == [(240, 160)]
+    assert result.result.detections.boxes.tolist() == [[170, 40, 210, 60], [290, 10, 310, 30]]
+
+
+def test_detections_centred_outside_the_polygon_are_dropped():
+    rois = RoiRegistry()
+    rois.register("cam", TRIANGLE)
+    pipeline = make_pipeline(CropDetector(), rois)
+    try:
+        result = pipeline.detect_batch([FrameInput("f0", np.zeros((*FRAME, 3), dtype=np.uint8), channel_id="cam")])[0]
+    finally:
+        pipeline.ocr_batcher.stop()
+
+    # Centre (30, 50) is below the diagonal, (140, 20) above it.
+    assert result.result.detections.boxes.tolist() == [[10, 40, 50, 60]]
+
+
+def test_require_roi_skips_channels_without_one():
+    detector = CropDetector()
+    pipeline = make_pipeline(detector, RoiRegistry(), require_roi=True)
+    try:
+        staged = pipeline.detect_batch([FrameInput("f0", np.zeros((*FRAME, 3), dtype=np.uint8), channel_id="cam")])[0]
+    finally:
+        pipeline.ocr_batcher.stop()
+
+    assert detector.shapes == [] and not staged.detected
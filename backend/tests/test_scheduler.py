@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+from app.pipeline.scheduler import FpsScheduler, SchedulerPolicy
+
+
+def simulate(scheduler: FpsScheduler, rates: dict[str, float], seconds: float) -> dict[str, int]:
+    """Feed frames at ``rates`` (fps per channel) through decimation and the node budget; admitted frames per channel."""
+
+    arrivals = sorted(
+        (1.0 + idx / rate, channel_id)
+        for channel_id, rate in rates.items()
+        for idx in range(int(seconds * rate))
+    )
+    admitted = dict.fromkeys(rates, 0)
+    for now, channel_id in arrivals:
+        if scheduler.decimate(channel_id, now) and scheduler.acquire(channel_id, now):
+            admitted[channel_id] += 1
+    return admitted
+
+
+def test_decimation_keeps_a_channel_at_its_target_fps():
+    scheduler = FpsScheduler()
+    scheduler.register("cam", target_fps=10)
+
+    admitted = simulate(scheduler, {"cam": 30}, seconds=10)
+
+    assert admitted["cam"] == pytest.approx(100, abs=2)
+    assert scheduler.channel_stats("cam")["decimated"] == 300 - admitted["cam"]
+
+
+def test_fair_budget_gives_quiet_channels_their_demand_and_splits_the_rest():
+    scheduler = FpsScheduler(node_budget_fps=20)
+    for channel_id in ("quiet", "busy1", "busy2"):
+        scheduler.register(channel_id, target_fps=25)
+
+    admitted = simulate(scheduler, {"quiet": 5, "busy1": 25, "busy2": 25}, seconds=20)
+
+    # Water-filling: 5 fps for the quiet camera, the remaining 15 fps split evenly.
+    assert admitted["quiet"] / 20 == pytest.approx(5, abs=0.5)
+    assert admitted["busy1"] / 20 == pytest.approx(7.5, abs=1)
+    assert admitted["busy2"] / 20 == pytest.approx(7.5, abs=1)
+    assert sum(admitted.values()) / 20 <= 20 * 1.05
+
+
+def test_priority_policy_weights_the_budget():
+    scheduler = FpsScheduler(node_budget_fps=20, policy=SchedulerPolicy.priority)
+    scheduler.register("high", target_fps=25, priority=3)
+    scheduler.register("low", target_fps=25, priority=1)
+
+    admitted = simulate(scheduler, {"high": 25, "low": 25}, seconds=20)
+
+    assert admitted["high"] / 20 == pytest.approx(15, abs=1)
+    assert admitted["low"] / 20 == pytest.approx(5, abs=1)
+
+
+def test_removed_channel_releases_its_share():
+    scheduler = FpsScheduler(node_budget_fps=20)
+    scheduler.register("cam1", target_fps=25)
+    scheduler.register("cam2", target_fps=25)
+    assert scheduler.describe()["channels"]["cam1"]["allocated_fps"] == 10
+
+    scheduler.remove("cam2")
+
+    assert scheduler.channel_stats("cam2") is None
+    assert scheduler.describe()["channels"]["cam1"]["allocated_fps"] == 20
+    assert not scheduler.acquire("cam2")
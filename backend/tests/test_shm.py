@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from app.pipeline.capture import CapturedFrame
+from app.pipeline.shm import InferenceEntryPoints, SharedFrameBridge, SharedFramePool, WorkerMessage
+
+CONTEXT = multiprocessing.get_context("spawn")
+
+
+def frame_sum(handle, image):
+    return handle.channel_id, handle.frame_id, int(image.sum())
+
+
+def frame_sum_or_fail(handle, image):
+    if image[0] % 2:
+        raise ValueError("odd frame")
+    return frame_sum(handle, image)
+
+
+def frame_sum_or_exit(handle, image):
+    if handle.frame_id == "crash":
+        os._exit(1)
+    return frame_sum(handle, image)
+
+
+# Per-process state of the configured-channel handlers below.
+CHANNEL_ROIS: dict = {}
+
+
+def remember_roi(config) -> None:
+    channel_id, roi = config
+    CHANNEL_ROIS[channel_id] = roi
+
+
+def forget_roi(channel_id: str) -> None:
+    CHANNEL_ROIS.pop(channel_id, None)
+
+
+def frame_roi(handle, image):
+    if handle.frame_id == "crash":
+        os._exit(1)
+    return handle.frame_id, CHANNEL_ROIS.get(handle.channel_id)
+
+
+def report_pid():
+    return "report", os.getpid()
+
+
+def write_oversize(pool: SharedFramePool) -> None:
+    pool.write(np.zeros(pool.slot_bytes + 1, dtype=np.uint8), channel_id="cam", frame_id="big", captured_at=0.0)
+
+
+def wait_for(predicate, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_pool_counters_are_shared_across_processes():
+    pool = SharedFramePool(2, 64, lock=CONTEXT.Lock())
+    try:
+        process = CONTEXT.Process(target=write_oversize, args=(pool,))
+        process.start()
+        process.join(timeout=30)
+        assert process.exitcode == 0
+        write_oversize(pool)
+        assert pool.stats()["oversize"] == 2
+    finally:
+        pool.close()
+
+
+def test_bridge_workers_return_results_in_channel_order():
+    pool = SharedFramePool(8, 64, lock=CONTEXT.Lock())
+    pending = []
+    for idx in range(6):
+        channel_id = f"cam{idx % 3}"
+        handle = pool.write(np.full(16, idx, dtype=np.uint8), channel_id=channel_id, frame_id=f"f{idx}", captured_at=0.0)
+        pending.append(CapturedFrame(channel_id, f"f{idx}", handle, 0.0))
+
+    def pop_frames():
+        frames, pending[:] = list(pending), []
+        return frames
+
+    bridge = SharedFrameBridge(pool, pop_frames, context=CONTEXT)
+    try:
+        bridge.spawn_workers(InferenceEntryPoints(handler=frame_sum), 2)
+        bridge.start()
+        results = []
+        wait_for(lambda: results.extend(bridge.drain_results()) or len(results) >= 6)
+    finally:
+        bridge.stop()
+    try:
+        assert sorted(results) == sorted((f"cam{idx % 3}", f"f{idx}", 16 * idx) for idx in range(6))
+        for channel in ("cam0", "cam1", "cam2"):
+            frames = [frame_id for channel_id, frame_id, _ in results if channel_id == channel]
+            assert frames == sorted(frames, key=lambda frame_id: int(frame_id[1:]))
+        assert bridge.workers == []
+        assert pool.stats()["leased"] == 0
+    finally:
+        pool.close()
+
+
+def queue_frames(pool: SharedFramePool, pending: list, values: list[int], channel_id: str = "cam", frame_ids=None) -> None:
+    for idx, value in enumerate(values):
+        frame_id = frame_ids[idx] if frame_ids else f"f{idx}"
+        handle = pool.write(np.full(16, value, dtype=np.uint8), channel_id=channel_id, frame_id=frame_id, captured_at=0.0)
+        pending.append(CapturedFrame(channel_id, frame_id, handle, 0.0))
+
+
+def test_worker_survives_handler_errors():
+    pool = SharedFramePool(8, 64, lock=CONTEXT.Lock())
+    pending: list = []
+    queue_frames(pool, pending, list(range(6)))
+
+    def pop_frames():
+        frames, pending[:] = list(pending), []
+        return frames
+
+    bridge = SharedFrameBridge(pool, pop_frames, context=CONTEXT)
+    try:
+        bridge.spawn_workers(InferenceEntryPoints(handler=frame_sum_or_fail), 1)
+        bridge.start()
+        results = []
+        wait_for(lambda: results.extend(bridge.drain_results()) or len(results) >= 3)
+        wait_for(lambda: pool.stats()["leased"] == 0)
+        stats = bridge.stats()
+    finally:
+        bridge.stop()
+    try:
+        assert results == [("cam", f"f{idx}", 16 * idx) for idx in (0, 2, 4)]
+        assert stats["alive_workers"] == 1 and stats["restarts"] == 0
+        assert stats["pool"]["errors"] == 3
+    finally:
+        pool.close()
+
+
+def test_bridge_replaces_a_dead_worker():
+    pool = SharedFramePool(8, 64, lock=CONTEXT.Lock())
+    pending: list = []
+
+    def pop_frames():
+        frames, pending[:] = list(pending), []
+        return frames
+
+    bridge = SharedFrameBridge(pool, pop_frames, context=CONTEXT)
+    try:
+        bridge.spawn_workers(InferenceEntryPoints(handler=frame_sum_or_exit), 1)
+        bridge.start()
+        queue_frames(pool, pending, [1], frame_ids=["crash"])
+        wait_for(lambda: bridge.restarts >= 1)
+        queue_frames(pool, pending, [2], frame_ids=["after"])
+        results = []
+        wait_for(lambda: results.extend(bridge.drain_results()) or len(results) >= 1)
+        stats = bridge.stats()
+    finally:
+        bridge.stop()
+    try:
+        assert results == [("cam", "after", 32)]
+        assert stats["restarts"] == 1 and stats["alive_workers"] == 1
+    finally:
+        pool.close()
+
+
+def test_channel_config_reaches_the_worker_and_its_replacement():
+    pool = SharedFramePool(8, 64, lock=CONTEXT.Lock())
+    pending: list = []
+
+    def pop_frames():
+        frames, pending[:] = list(pending), []
+        return frames
+
+    entry = InferenceEntryPoints(
+        handler=frame_roi,
+        channel_configured=remember_roi,
+        channel_removed=forget_roi,
+        report=report_pid,
+        report_seconds=0.05,
+    )
+    bridge = SharedFrameBridge(pool, pop_frames, context=CONTEXT)
+    results: list = []
+    reports: list = []
+
+    def next_result():
+        for item in bridge.drain_results():
+            (reports if item[0] == "report" else results).append(item)
+        return results.pop(0) if results else None
+
+    def frame_result(frame_id: str):
+        queue_frames(pool, pending, [0], frame_ids=[frame_id])
+        found: list = []
+        wait_for(lambda: found.append(next_result()) or found[-1] is not None)
+        return found[-1]
+
+    try:
+        bridge.spawn_workers(entry, 1)
+        bridge.start()
+        bridge.configure_channel("cam", ("cam", "roi-a"))
+        assert frame_result("f0") == ("f0", "roi-a")
+        assert bridge.remove_channel("cam")
+        assert frame_result("f1") == ("f1", None)
+
+        bridge.configure_channel("cam", ("cam", "roi-b"))
+        queue_frames(pool, pending, [0], frame_ids=["crash"])
+        wait_for(lambda: bridge.restarts >= 1)
+        # The replacement process is sent the channel's configuration again.
+        assert frame_result("f2") == ("f2", "roi-b")
+        assert bridge.send("cam", WorkerMessage("unknown_kind"))
+        assert frame_result("f3") == ("f3", "roi-b")
+        # The replacement also sends its reports back.
+        wait_for(lambda: next_result() or reports)
+        replacement = bridge.workers[0].pid
+    finally:
+        bridge.stop()
+        pool.close()
+    assert reports and {pid for _, pid in reports} == {replacement}
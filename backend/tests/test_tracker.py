@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+
+from app.pipeline.ingest_manager import ChannelDirection
+from app.pipeline.recognition import DetectionArray, TrackerSettings
+from app.pipeline.tracker import Tracker, _hungarian
+
+
+def detections(boxes: list[list[float]], scores: list[float] | None = None) -> DetectionArray:
+    if not boxes:
+        return DetectionArray.empty()
+    scores = scores if scores is not None else [0.9] * len(boxes)
+    return DetectionArray(np.asarray(boxes, dtype=np.float32), np.asarray(scores, dtype=np.float32))
+
+
+def box(x: float, y: float, w: float = 60.0, h: float = 30.0) -> list[float]:
+    return [x, y, x + w, y + h]
+
+
+def test_tracks_keep_their_ids_while_moving():
+    tracker = Tracker(TrackerSettings(min_hits=1), prefix="cam-")
+    seen = []
+    for frame in range(10):
+        tracks = tracker.update(detections([box(20 + 4 * frame, 40), box(300 - 4 * frame, 200)]))
+        seen.append(dict(zip(tracks.track_ids, tracks.boxes[:, 0].tolist())))
+
+    assert all(set(frame) == {"cam-1", "cam-2"} for frame in seen)
+    # Each id follows its own object.
+    assert seen[-1]["cam-1"] > seen[0]["cam-1"] and seen[-1]["cam-2"] < seen[0]["cam-2"]
+
+
+def test_lost_track_is_closed_after_max_age():
+    tracker = Tracker(TrackerSettings(min_hits=1, max_age=3))
+    for frame in range(4):
+        tracker.update(detections([box(100, 100)]))
+    for _ in range(3):
+        assert tracker.update(detections([])).track_ids == []
+        assert tracker.drain_closed() == {}
+
+    tracker.update(detections([]))
+
+    assert tracker.drain_closed() == {"1": 4}
+    assert tracker.live_count == 0
+    assert tracker.update(detections([box(100, 100)])).track_ids == ["2"]
+
+
+def test_track_needs_min_hits_before_it_is_reported():
+    tracker = Tracker(TrackerSettings(min_hits=3))
+    # The first min_hits frames of a tracker report tracks right away.
+    for _ in range(3):
+        tracker.update(detections([]))
+    reported = [tracker.update(detections([box(100, 100)])).track_ids for _ in range(3)]
+
+    assert reported == [[], [], ["1"]]
+
+
+def test_low_score_detection_keeps_a_bytetrack_track_but_spawns_nothing():
+    tracker = Tracker(TrackerSettings(min_hits=1, max_age=1))
+    tracker.update(detections([box(100, 100)]))
+    for _ in range(3):
+        tracks = tracker.update(detections([box(100, 100), box(400, 300)], scores=[0.2, 0.2]))
+        assert tracks.track_ids == ["1"]
+    assert tracker.live_count == 1
+
+
+def test_full_tracker_counts_overflow_instead_of_evicting_visible_tracks():
+    tracker = Tracker(TrackerSettings(min_hits=1), capacity=2)
+    tracker.update(detections([box(0, 0), box(200, 0), box(400, 0)]))
+
+    assert tracker.live_count == 2
+    assert tracker.describe()["overflow"] == 1
+
+
+def test_heading_follows_the_trajectory():
+    tracker = Tracker(TrackerSettings(min_hits=1, direction_min_displacement=0.5))
+    for frame in range(6):
+        tracks = tracker.update(detections([box(100, 50 + 10 * frame)]))
+
+    assert tracks.directions == [ChannelDirection.down]
+
+
+def test_numpy_hungarian_finds_the_optimal_assignment():
+    rng = np.random.default_rng(0)
+    for rows, cols in [(3, 3), (3, 5), (4, 6)]:
+        cost = rng.random((rows, cols))
+        assignment = _hungarian(cost)
+        best = min(
+            itertools.permutations(range(cols), rows),
+            key=lambda perm: sum(cost[row, col] for row, col in enumerate(perm)),
+        )
+        assert cost[np.arange(rows), assignment].sum() == cost[np.arange(rows), list(best)].sum()
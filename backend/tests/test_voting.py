@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from app.core.plates import LOOKALIKE_DIGITS
+from app.pipeline.voting import PlateVote, confusion_costs
+
+PLATE = "A123BC777"
+
+
+def naive_vote(reads: list[tuple[str, float]]) -> str:
+    """Reference: recount every position over all reads of the most supported length."""
+
+    lengths: dict[int, float] = defaultdict(float)
+    for text, confidence in reads:
+        lengths[len(text)] += confidence
+    length = max(lengths, key=lengths.get)
+    chars = []
+    for idx in range(length):
+        scores: dict[str, float] = defaultdict(float)
+        for text, confidence in reads:
+            if idx < len(text):
+                scores[text[idx]] += confidence
+        chars.append(max(scores, key=scores.get))
+    return "".join(chars)
+
+
+def test_streaming_vote_matches_a_full_recount():
+    rng = np.random.default_rng(0)
+    alphabet = "0123456789ABCEHKMOPTX"
+    for _ in range(200):
+        vote, reads = PlateVote(), []
+        for _ in range(int(rng.integers(1, 12))):
+            chars = [ch if rng.random() > 0.2 else alphabet[rng.integers(len(alphabet))] for ch in PLATE]
+            read = ("".join(chars), float(rng.uniform(0.3, 1.0)))
+            reads.append(read)
+            vote.add(*read)
+            assert vote.text == naive_vote(reads)
+
+
+def test_confidence_drops_with_dissenting_reads():
+    vote = PlateVote()
+    vote.add("A123", 0.9)
+    assert vote.result() == ("A123", pytest.approx(0.9))
+
+    vote.add("A128", 0.6)
+    vote.add("A123", 0.9)
+
+    # Three positions carry every read (2.4 of 2.4), the last one 1.8: (3 * 2.4 + 1.8) / (4 * 3 reads).
+    assert vote.result() == ("A123", pytest.approx(0.75))
+
+
+def test_vote_settles_after_consecutive_unchanged_reads():
+    vote = PlateVote()
+    settled = []
+    for text in ["A128", "A123", "A123", "A123", "A123"]:
+        vote.add(text, 0.9)
+        settled.append(vote.settled(3))
+
+    # "A128" then "A123" tie on the last character; the first read keeps the lead, so "A123" wins on the third read.
+    assert vote.text == "A123"
+    assert settled == [False, False, False, False, True]
+    assert not vote.settled(3, min_confidence=0.95)
+
+
+def test_aligned_vote_is_not_shifted_by_dropped_characters():
+    costs = confusion_costs(LOOKALIKE_DIGITS)
+    aligned, positional = PlateVote(costs=costs), PlateVote()
+    # Most reads miss a character, each a different one.
+    for text in [PLATE, "A23BC777", "A13BC777", PLATE, "A12BC777"]:
+        aligned.add(text, 0.8)
+        positional.add(text, 0.8)
+
+    assert aligned.text == PLATE
+    assert positional.text != PLATE
+
+
+def test_a_single_inserted_character_is_not_promoted():
+    vote = PlateVote(costs=confusion_costs(LOOKALIKE_DIGITS))
+    for text in [PLATE, "A1273BC777", PLATE, PLATE]:
+        vote.add(text, 0.9)
+
+    assert vote.text == PLATE